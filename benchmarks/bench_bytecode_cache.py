@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark for compiling task modules with and without the bytecode cache
+
+Times getting code objects for N synthetic task sources:
+  compile      - compile() every time (the previous behaviour)
+  disk cache   - new cache instance over a warm cache directory (a restart)
+  memory cache - same cache instance again (a reload of unchanged tasks)
+
+Usage:
+    python benchmarks/bench_bytecode_cache.py [--tasks 1000] [--lines 200]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project directory to path
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+
+from task_scheduler.bytecode_cache import BytecodeCache
+
+
+def make_source(n: int, lines: int) -> str:
+    """A task body with ``lines`` lines of helper functions"""
+    body = [f"def helper_{i}(value):\n    return value * {i} + {n}\n" for i in range(lines // 2)]
+    return "".join(body) + f"\ndef start():\n    return helper_0({n})\n"
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(tasks: int, lines: int) -> dict:
+    """Time each way of obtaining code objects for ``tasks`` sources"""
+    sources = [(make_source(n, lines), f"/tasks/task_{n:05d}.py") for n in range(tasks)]
+    with tempfile.TemporaryDirectory() as tmp:
+        compile_sec = timed(lambda: [compile(s, f, 'exec') for s, f in sources])
+
+        warm = BytecodeCache(Path(tmp))
+        for source, filename in sources:
+            warm.get_code(source, filename)
+
+        cache = BytecodeCache(Path(tmp))
+        disk_sec = timed(lambda: [cache.get_code(s, f) for s, f in sources])
+        memory_sec = timed(lambda: [cache.get_code(s, f) for s, f in sources])
+
+    return {"tasks": tasks, "compile_sec": compile_sec, "disk_cache_sec": disk_sec, "memory_cache_sec": memory_sec}
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark the task bytecode cache")
+    parser.add_argument('--tasks', type=int, default=1000, help='Number of task sources')
+    parser.add_argument('--lines', type=int, default=200, help='Lines per task source')
+    args = parser.parse_args()
+
+    results = run(args.tasks, args.lines)
+    print(f"Bytecode cache benchmark ({args.tasks} tasks x {args.lines} lines)")
+    print(f"  compile every load: {results['compile_sec'] * 1000:8.1f}ms")
+    print(f"  disk cache:         {results['disk_cache_sec'] * 1000:8.1f}ms")
+    print(f"  memory cache:       {results['memory_cache_sec'] * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
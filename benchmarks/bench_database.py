@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for DatabaseManager operations
+
+Compares the previous connection-per-operation pattern (connect, apply
+PRAGMAs, execute, commit, close, all under one global lock) with the
+persistent per-thread connections used by DatabaseManager.
+
+Usage:
+    python benchmarks/bench_database.py [--ops 2000] [--threads 4]
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project directory to path
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+
+from task_scheduler.database import DatabaseManager, TaskExecution, TaskSchedule
+
+
+class ConnectionPerOperation:
+    """The access pattern DatabaseManager used before persistent connections"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=10000")
+        return conn
+
+    def _run(self, sql: str, params: tuple, write: bool):
+        with self._lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute(sql, params).fetchall()
+                if write:
+                    conn.commit()
+                return rows
+            finally:
+                conn.close()
+
+    def record_execution(self, execution: TaskExecution):
+        self._run("""
+            INSERT INTO task_executions
+            (task_name, execution_time, next_run_time, status, duration, error_message, retry_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (execution.task_name, execution.execution_time, execution.next_run_time,
+              execution.status, execution.duration, execution.error_message,
+              execution.retry_count), write=True)
+
+    def update_task_schedule(self, schedule: TaskSchedule):
+        self._run("""
+            INSERT OR REPLACE INTO task_schedules
+            (task_name, next_run_time, schedule_config, last_updated, is_active)
+            VALUES (?, ?, ?, ?, ?)
+        """, (schedule.task_name, schedule.next_run_time, schedule.schedule_config,
+              schedule.last_updated, schedule.is_active), write=True)
+
+    def get_overdue_tasks(self, current_time: datetime):
+        return self._run("""
+            SELECT * FROM task_schedules
+            WHERE datetime(next_run_time) <= datetime(?) AND is_active = 1
+            ORDER BY next_run_time
+        """, (current_time.replace(microsecond=0).isoformat(),), write=False)
+
+    def get_task_schedule(self, task_name: str):
+        return self._run("SELECT * FROM task_schedules WHERE task_name = ?", (task_name,), write=False)
+
+
+def run_workload(db, ops: int, thread_index: int = 0):
+    """A tick-like mix: one overdue query and one schedule lookup per run, plus the run's two writes"""
+    now = datetime.now()
+    for i in range(ops // 4):
+        task_name = f"task_{thread_index}_{i % 50}"
+        db.get_overdue_tasks(now)
+        db.get_task_schedule(task_name)
+        db.record_execution(TaskExecution(task_name, now, now + timedelta(minutes=5), "success", 0.01))
+        db.update_task_schedule(TaskSchedule(task_name, (now + timedelta(minutes=5)).replace(microsecond=0),
+                                             "", now))
+
+
+def measure(db, ops: int, threads: int) -> float:
+    """Run the workload on ``threads`` threads and return total ops/sec"""
+    workers = [threading.Thread(target=run_workload, args=(db, ops, n)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return ops * threads / (time.perf_counter() - start)
+
+
+def run(ops: int = 2000, threads: int = 1) -> dict:
+    """Benchmark both access patterns against fresh databases"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # The schema is created by DatabaseManager in both cases
+        before_path = Path(tmp) / "before.db"
+        DatabaseManager(before_path).close()
+        results["connection_per_op_ops_per_sec"] = measure(ConnectionPerOperation(before_path), ops, threads)
+
+        manager = DatabaseManager(Path(tmp) / "after.db")
+        results["persistent_ops_per_sec"] = measure(manager, ops, threads)
+        manager.close()
+
+    results["speedup"] = results["persistent_ops_per_sec"] / results["connection_per_op_ops_per_sec"]
+    return results
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark DatabaseManager operations")
+    parser.add_argument('--ops', type=int, default=2000, help='Operations per thread')
+    parser.add_argument('--threads', type=int, default=1, help='Concurrent threads')
+    args = parser.parse_args()
+
+    results = run(args.ops, args.threads)
+    print(f"Database micro-benchmark ({args.ops} ops x {args.threads} thread(s))")
+    print(f"  connection per operation: {results['connection_per_op_ops_per_sec']:10.0f} ops/sec")
+    print(f"  persistent connections:   {results['persistent_ops_per_sec']:10.0f} ops/sec")
+    print(f"  speedup:                  {results['speedup']:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Scale benchmark for the whole scheduler
+
+Generates a project with N synthetic task files (mixed every() schedules)
+for each requested size and measures:
+  cold start       - new interpreter: import, construct TaskScheduler, load every task
+  scan             - TaskParser scan of the tasks directory without a parse cache
+  tick p50/p95     - main loop iterations with every task loaded (from the tick profiler)
+  dispatch         - runs per second when every job is due at once (worker pool, tracking, journal)
+  wrapper overhead - cost of the tracking wrapper per run over calling the task body directly
+plus DatabaseManager ops/sec on the bench_database.py workload.
+
+Each size runs in its own interpreter so the global schedule and module
+state of one size cannot affect the next. Results are written as JSON and
+compared against a baseline; a metric that is worse than the baseline by
+more than the tolerance is reported as a regression (exit status 1).
+
+Usage:
+    python benchmarks/bench_scale.py [--tasks 100 1000 10000] [--output results.json]
+                                     [--baseline baseline.json] [--save-baseline] [--tolerance 0.25]
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project directory to path
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+
+benchmarks_dir = Path(__file__).parent
+DEFAULT_OUTPUT = benchmarks_dir / "results.json"
+DEFAULT_BASELINE = benchmarks_dir / "baseline.json"
+
+TASK_TEMPLATE = '''"""
+---
+title: "Synthetic task {n}"
+description: "Generated for the scale benchmark"
+dependencies: []
+enabled: true
+---
+"""
+
+from task_scheduler.decorators import repeat, every
+
+
+@repeat({schedule})
+def start():
+    return {n}
+'''
+
+CONFIG_TEMPLATE = """
+scheduler:
+  max_workers: 4
+  max_memory_usage: 4096
+  control_socket: false
+  status_publish_interval: 60
+database:
+  path: "scheduler.db"
+virtual_env:
+  path: "venv"
+  python_executable: "python3"
+tasks:
+  directory: "tasks"
+  include_example_tasks: true
+  watch_mode: "off"
+"""
+
+# Metric name -> (better direction, smallest difference that counts, unit)
+METRICS = {
+    "cold_start_sec": ("lower", 0.05, "s"),
+    "scan_sec": ("lower", 0.01, "s"),
+    "tick_p50_ms": ("lower", 0.05, "ms"),
+    "tick_p95_ms": ("lower", 0.1, "ms"),
+    "dispatch_runs_per_sec": ("higher", 50, "runs/s"),
+    "wrapper_overhead_us": ("lower", 5, "us"),
+    "database_ops_per_sec": ("higher", 100, "ops/s"),
+}
+
+
+def make_schedule(n: int) -> str:
+    """A repeat() interval for task ``n``, cycling through the supported kinds"""
+    kind = n % 5
+    if kind == 0:
+        return f"every({n % 30 + 1}).minutes"
+    if kind == 1:
+        return f"every({n % 12 + 1}).hours"
+    if kind == 2:
+        return f"every({n % 50 + 10}).seconds"
+    if kind == 3:
+        return f'every().day.at("{n % 24:02d}:{n % 60:02d}")'
+    return f'every().hour.at(":{n % 60:02d}")'
+
+
+def generate_project(root: Path, count: int) -> Path:
+    """Write a config and ``count`` task files under ``root``; returns the config path"""
+    (root / "config").mkdir(parents=True)
+    tasks_dir = root / "tasks"
+    tasks_dir.mkdir()
+    for n in range(count):
+        (tasks_dir / f"task_{n:05d}.py").write_text(TASK_TEMPLATE.format(n=n, schedule=make_schedule(n)))
+    config_path = root / "config" / "config.yaml"
+    config_path.write_text(CONFIG_TEMPLATE)
+    return config_path
+
+
+def quiet_logging():
+    """Keep per-task log lines out of the measurements"""
+    from loguru import logger
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+
+def load_scheduler(config_path: Path):
+    """Construct a scheduler and load every task, as start() does before the main loop"""
+    from task_scheduler.scheduler import TaskScheduler
+    scheduler = TaskScheduler(config_path)
+    scheduler._scan_and_load_tasks()
+    return scheduler
+
+
+def measure_ticks(scheduler, seconds: float = 1.0) -> dict:
+    """Run the main loop, waking it every millisecond, and read the tick profile"""
+    scheduler.running = True
+    loop = threading.Thread(target=scheduler._main_loop, daemon=True)
+    loop.start()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        scheduler.timer_queue.wake()
+        time.sleep(0.001)
+    scheduler.running = False
+    scheduler.timer_queue.wake()
+    loop.join()
+    tick = scheduler.tick_profiler.get_stats()["tick"]
+    return {"tick_p50_ms": tick["p50_ms"], "tick_p95_ms": tick["p95_ms"]}
+
+
+def measure_dispatch(scheduler) -> float:
+    """Make every job due at once and return runs per second until the pool drains"""
+    jobs = scheduler._get_all_jobs()
+    due = datetime.now() - timedelta(seconds=1)
+    for job in jobs:
+        job.next_run = due
+    scheduler.timer_queue.sync_jobs(jobs)
+
+    start = time.perf_counter()
+    dispatched = scheduler._run_due_jobs()
+    while True:
+        stats = scheduler.executor.get_stats()
+        if not stats["active"] and not stats["queued"]:
+            break
+        time.sleep(0.001)
+    return dispatched / (time.perf_counter() - start)
+
+
+def measure_wrapper(scheduler, calls: int = 2000) -> float:
+    """Microseconds the tracking wrapper adds to each run of a task"""
+    job = scheduler._get_all_jobs()[0]
+    wrapper = getattr(job.job_func, 'func', job.job_func)
+    body = wrapper._original_func
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        body()
+    direct = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        wrapper()
+    wrapped = time.perf_counter() - start
+    return (wrapped - direct) / calls * 1e6
+
+
+def measure_size(config_path: Path) -> dict:
+    """Everything but the cold start, for the project at ``config_path``"""
+    from task_scheduler.task_parser import TaskParser
+
+    quiet_logging()
+    tasks_dir = config_path.parent.parent / "tasks"
+    start = time.perf_counter()
+    TaskParser().scan_tasks_directory(tasks_dir)
+    scan = time.perf_counter() - start
+
+    scheduler = load_scheduler(config_path)
+    try:
+        results = {"scan_sec": scan, "jobs": len(scheduler._get_all_jobs())}
+        results.update(measure_ticks(scheduler))
+        results["dispatch_runs_per_sec"] = measure_dispatch(scheduler)
+        results["wrapper_overhead_us"] = measure_wrapper(scheduler)
+    finally:
+        scheduler.executor.shutdown(wait=True)
+        scheduler.timeout_supervisor.stop()
+        scheduler.journal.close()
+        scheduler.db_manager.close()
+    return results
+
+
+def run_size(count: int) -> dict:
+    """Benchmark a fresh project of ``count`` tasks in child interpreters"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = generate_project(Path(tmp), count)
+        script = str(Path(__file__).resolve())
+
+        # Run from the project, which has no helpers directory to install from
+        start = time.perf_counter()
+        subprocess.run([sys.executable, script, "--startup", str(config_path)], check=True, cwd=tmp)
+        cold_start = time.perf_counter() - start
+
+        output = subprocess.run([sys.executable, script, "--measure", str(config_path)],
+                                check=True, capture_output=True, text=True, cwd=tmp).stdout
+    return {"tasks": count, "cold_start_sec": cold_start, **json.loads(output)}
+
+
+def measure_database() -> float:
+    """DatabaseManager ops/sec on the bench_database.py workload"""
+    from bench_database import measure
+    from task_scheduler.database import DatabaseManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = DatabaseManager(Path(tmp) / "bench.db")
+        try:
+            return measure(manager, ops=2000, threads=1)
+        finally:
+            manager.close()
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Metrics worse than the baseline by more than ``tolerance`` (a fraction)"""
+    pairs = [("database", results, baseline)]
+    pairs += [(f"{size} tasks", results["sizes"][size], baseline.get("sizes", {}).get(size, {}))
+              for size in results["sizes"]]
+
+    regressions = []
+    for label, current, previous in pairs:
+        for name, (direction, floor, unit) in METRICS.items():
+            if name not in current or name not in previous:
+                continue
+            new, old = current[name], previous[name]
+            worse = new - old if direction == "lower" else old - new
+            if worse > floor and worse > tolerance * old:
+                regressions.append(f"{label}: {name} {old:.4g} -> {new:.4g} {unit} "
+                                   f"({worse / old:.0%} worse)")
+    return regressions
+
+
+def print_results(results: dict):
+    """Print the results as a table"""
+    print(f"{'tasks':>7} {'cold start':>11} {'scan':>9} {'tick p50':>9} {'tick p95':>9} "
+          f"{'dispatch':>12} {'wrapper':>9}")
+    for size in results["sizes"].values():
+        print(f"{size['tasks']:>7} {size['cold_start_sec']:>10.2f}s {size['scan_sec'] * 1000:>7.0f}ms "
+              f"{size['tick_p50_ms']:>7.3f}ms {size['tick_p95_ms']:>7.3f}ms "
+              f"{size['dispatch_runs_per_sec']:>7.0f} run/s {size['wrapper_overhead_us']:>7.1f}us")
+    print(f"DatabaseManager: {results['database_ops_per_sec']:.0f} ops/sec")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark the scheduler with many synthetic tasks")
+    parser.add_argument('--tasks', type=int, nargs='+', default=[100, 1000, 10000], help='Numbers of tasks')
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT, help='Where to write the JSON results')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='Results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Fraction by which a metric may be worse than the baseline')
+    parser.add_argument('--startup', type=Path, help=argparse.SUPPRESS)
+    parser.add_argument('--measure', type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Child modes, run in a fresh interpreter by run_size()
+    if args.startup:
+        quiet_logging()
+        load_scheduler(args.startup)
+        return 0
+    if args.measure:
+        print(json.dumps(measure_size(args.measure)))
+        return 0
+
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database_ops_per_sec": measure_database(),
+        "sizes": {}
+    }
+    for count in args.tasks:
+        print(f"Benchmarking {count} tasks...", file=sys.stderr)
+        results["sizes"][str(count)] = run_size(count)
+
+    print_results(results)
+    args.output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline} (store one with --save-baseline)")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"Regressions against {args.baseline} (created {baseline.get('created', '?')}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
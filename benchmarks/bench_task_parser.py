@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark for scanning a tasks directory with TaskParser
+
+Generates synthetic task files and times four scans:
+  cold        - new parser, no parse cache on disk (every file read, hashed, YAML parsed)
+  disk cache  - new parser, parse cache from the cold scan (read and hashed, no YAML)
+  hash only   - rescan with the stat fast path disabled (the previous behaviour)
+  stat only   - rescan of unchanged files (one stat per file)
+
+Usage:
+    python benchmarks/bench_task_parser.py [--files 1000 10000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project directory to path
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+
+from task_scheduler.task_parser import TaskParser
+
+
+TASK_TEMPLATE = '''"""
+---
+title: "Synthetic task {n}"
+description: "Generated for the task parser benchmark"
+dependencies:
+  - requests
+enabled: true
+timeout: 120
+retry_count: 2
+---
+"""
+
+from task_scheduler.decorators import repeat, every
+
+
+@repeat(every({interval}).minutes)
+def start():
+    return {n}
+'''
+
+
+def generate_tasks(tasks_dir: Path, count: int):
+    """Write ``count`` task files with varied schedules"""
+    for n in range(count):
+        (tasks_dir / f"task_{n:05d}.py").write_text(TASK_TEMPLATE.format(n=n, interval=n % 60 + 1))
+
+
+def timed_scan(parser: TaskParser, tasks_dir: Path) -> float:
+    """Scan the directory and return the elapsed seconds"""
+    start = time.perf_counter()
+    task_files = parser.scan_tasks_directory(tasks_dir)
+    elapsed = time.perf_counter() - start
+    assert task_files, "benchmark tasks failed to parse"
+    return elapsed
+
+
+def run(files: int) -> dict:
+    """Time each kind of scan over ``files`` synthetic tasks"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tasks_dir = Path(tmp) / "tasks"
+        tasks_dir.mkdir()
+        generate_tasks(tasks_dir, files)
+        cache_path = Path(tmp) / "parse_cache.json"
+
+        cold_parser = TaskParser(cache_path=cache_path)
+        cold = timed_scan(cold_parser, tasks_dir)
+        cold_parser.save_cache()
+
+        parser = TaskParser(cache_path=cache_path)
+        disk_cache = timed_scan(parser, tasks_dir)
+
+        parser._stat_keys.clear()
+        hash_only = timed_scan(parser, tasks_dir)
+
+        stat_only = timed_scan(parser, tasks_dir)
+
+    return {
+        "files": files,
+        "cold_sec": cold,
+        "disk_cache_sec": disk_cache,
+        "hash_only_sec": hash_only,
+        "stat_only_sec": stat_only,
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark TaskParser directory scans")
+    parser.add_argument('--files', type=int, nargs='+', default=[1000, 10000], help='Numbers of task files')
+    args = parser.parse_args()
+
+    print(f"{'files':>8} {'cold':>10} {'disk cache':>12} {'hash only':>11} {'stat only':>11}")
+    for files in args.files:
+        results = run(files)
+        print(f"{files:>8} {results['cold_sec'] * 1000:>8.1f}ms {results['disk_cache_sec'] * 1000:>10.1f}ms "
+              f"{results['hash_only_sec'] * 1000:>9.1f}ms {results['stat_only_sec'] * 1000:>9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,13 +8,60 @@ timeout: 120
 ---
 """
 
+import functools
 import subprocess
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union
 import shlex
 
+# How often a running command checks whether its task was cancelled
+CANCEL_POLL_INTERVAL = 0.1
+
+
+def _run_process(cmd: Union[str, List[str]], timeout: Optional[float], **kwargs) -> subprocess.CompletedProcess:
+    """
+    Run a command like subprocess.run, but killable with its whole process tree.
+
+    The command gets its own process group, and the tree is killed when the
+    timeout expires (raising subprocess.TimeoutExpired) or when the calling
+    task is cancelled by its frontmatter timeout (raising TaskTimeoutError),
+    so a hung command cannot keep the task's worker slot.
+    """
+    from task_scheduler.cancellation import TaskTimeoutError, get_cancellation_token
+    from task_scheduler.process_pool import kill_process_tree
+
+    token = get_cancellation_token()
+    process = subprocess.Popen(cmd, start_new_session=True, **kwargs)
+    kill_tree = functools.partial(kill_process_tree, process.pid)
+    token.on_cancel(kill_tree)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        while True:
+            wait = CANCEL_POLL_INTERVAL if deadline is None else min(CANCEL_POLL_INTERVAL, deadline - time.monotonic())
+            try:
+                stdout, stderr = process.communicate(timeout=max(0.0, wait))
+                break
+            except subprocess.TimeoutExpired:
+                if token.wait(0):
+                    kill_tree()
+                    process.communicate()
+                    raise TaskTimeoutError(token.reason or "Task cancelled")
+                if deadline is not None and time.monotonic() >= deadline:
+                    kill_tree()
+                    process.communicate()
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+    finally:
+        token.remove_on_cancel(kill_tree)
+        if process.poll() is None:
+            kill_tree()
+    if token.cancelled:
+        raise TaskTimeoutError(token.reason or "Task cancelled")
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
 def execute_python_script(
     script_path: Union[str, Path],
     args: List[str] = None,
@@ -37,6 +84,8 @@ def execute_python_script(
     Returns:
         Dict with execution results
     """
+    from task_scheduler.cancellation import TaskTimeoutError
+
     script_path = Path(script_path)
     args = args or []
     python_exe = python_executable or sys.executable
@@ -64,15 +113,9 @@ def execute_python_script(
         
         start_time = datetime.now()
         
-        # Execute the script
-        process = subprocess.run(
-            cmd,
-            cwd=cwd,
-            capture_output=capture_output,
-            text=True,
-            timeout=timeout,
-            check=False  # Don't raise exception on non-zero exit
-        )
+        # Execute the script (a non-zero exit is reported, not raised)
+        pipe = subprocess.PIPE if capture_output else None
+        process = _run_process(cmd, timeout, cwd=cwd, stdout=pipe, stderr=pipe, text=True)
         
         end_time = datetime.now()
         result["execution_time"] = (end_time - start_time).total_seconds()
@@ -85,6 +128,8 @@ def execute_python_script(
         
         print(f"Script completed in {result['execution_time']:.2f}s with return code {result['return_code']}")
         
+    except TaskTimeoutError:
+        raise
     except subprocess.TimeoutExpired:
         result["error"] = f"Script execution timed out after {timeout} seconds"
         print(f"❌ {result['error']}")
@@ -117,6 +162,8 @@ def execute_cli_command(
     Returns:
         Dict with execution results
     """
+    from task_scheduler.cancellation import TaskTimeoutError
+
     result = {
         "success": False,
         "return_code": None,
@@ -142,16 +189,8 @@ def execute_cli_command(
             cmd = command
         
         # Execute the command
-        process = subprocess.run(
-            cmd,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            shell=shell,
-            env=env,
-            check=False
-        )
+        process = _run_process(cmd, timeout, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, shell=shell, env=env)
         
         end_time = datetime.now()
         result["execution_time"] = (end_time - start_time).total_seconds()
@@ -162,6 +201,8 @@ def execute_cli_command(
         
         print(f"Command completed in {result['execution_time']:.2f}s with return code {result['return_code']}")
         
+    except TaskTimeoutError:
+        raise
     except subprocess.TimeoutExpired:
         result["error"] = f"Command execution timed out after {timeout} seconds"
         print(f"❌ {result['error']}")
@@ -224,6 +265,10 @@ def execute_script_with_retry(
 ) -> Dict[str, Any]:
     """
     Execute a Python script with retry logic.
+
+    The wait between attempts ends early if the calling task is cancelled
+    (e.g. by its timeout). To retry a whole task without holding a worker
+    thread, prefer ``retry_count``/``retry_delay`` in the task frontmatter.
     
     Args:
         script_path: Path to the Python script to execute
@@ -235,8 +280,9 @@ def execute_script_with_retry(
     Returns:
         Dict with execution results including retry information
     """
-    import time
-    
+    from task_scheduler.cancellation import get_cancellation_token
+
+    token = get_cancellation_token()
     result = None
     attempts = []
     
@@ -251,7 +297,9 @@ def execute_script_with_retry(
         
         if attempt < max_retries:
             print(f"Retrying in {retry_delay} seconds...")
-            time.sleep(retry_delay)
+            if token.wait(retry_delay):
+                print("Task cancelled, not retrying")
+                break
     
     # Add retry information to final result
     result["retry_attempts"] = len(attempts)
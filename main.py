@@ -12,13 +12,62 @@ from pathlib import Path
 project_dir = Path(__file__).parent
 sys.path.insert(0, str(project_dir))
 
-from task_scheduler.scheduler import TaskScheduler
-from task_scheduler.logging_config import setup_logging_from_config, set_logging_manager
-from loguru import logger
+# Only the standard library is needed for --status; the scheduler and
+# logging imports are deferred until the scheduler actually starts
+from task_scheduler.status_snapshot import STATUS_FILE_NAME, read_status
+from task_scheduler.startup_profiler import StartupProfiler
+
+
+def show_status(config_path: Path) -> int:
+    """Print the status published by the running scheduler"""
+    status = read_status(config_path.parent.parent / "data" / STATUS_FILE_NAME)
+    print("Task Scheduler Status:")
+    if status is None:
+        print("  Running: False (no status published yet)")
+        return 0
+
+    print(f"  Running: {status['running']} (pid {status['pid']}, updated {status['age_seconds']:.1f}s ago)")
+    print(f"  Loaded Tasks: {status['loaded_tasks']}")
+    print(f"  Scheduled Jobs: {status['scheduled_jobs']}")
+    running_tasks = status.get('running_tasks', {})
+    print(f"  Running Tasks: {', '.join(sorted(running_tasks)) if running_tasks else 'none'}")
+    executor = status.get('executor', {})
+    print(f"  Queue Depth: {status['queued_jobs']} timers, {executor.get('queued', 0)} waiting for a worker")
+    lag = status.get('scheduling_lag', {})
+    if lag.get('samples'):
+        print(f"  Scheduling Lag: last {lag['last_ms']:.1f} ms, avg {lag['avg_ms']:.1f} ms, max {lag['max_ms']:.1f} ms")
+    print(f"  Memory Usage: {status['memory_usage'].get('rss_mb', 0):.1f} MB")
+    return 0
+
+
+def run_simulation(config_path: Path, hours: float, task_duration: float) -> int:
+    """Print a load report for the configured tasks replayed in virtual time"""
+    import json
+    import yaml
+    from loguru import logger
+    from task_scheduler.simulation import Simulation
+
+    # Per-run log lines would dominate the runtime; only problems are shown
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    tasks_config = config.get('tasks', {})
+    simulation = Simulation(
+        config_path.parent.parent / tasks_config.get('directory', 'tasks'),
+        hours=hours,
+        max_workers=config['scheduler'].get('max_workers', 4),
+        task_duration=task_duration,
+        include_example_tasks=tasks_config.get('include_example_tasks', True)
+    )
+    print(json.dumps(simulation.run(), indent=2))
+    return 0
 
 
 def main():
     """Main entry point"""
+    startup = StartupProfiler()
     parser = argparse.ArgumentParser(description="Task Scheduler - Background task management system")
     parser.add_argument(
         "--config", 
@@ -36,29 +85,60 @@ def main():
         action="store_true",
         help="Show scheduler status and exit"
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Start up, print the time spent in each startup phase and exit"
+    )
+    parser.add_argument(
+        "--upgrade-pip",
+        action="store_true",
+        help="Upgrade pip in the task virtual environment on startup (otherwise only when the venv changed)"
+    )
+    parser.add_argument(
+        "--simulate",
+        type=float,
+        nargs="?",
+        const=24,
+        metavar="HOURS",
+        help="Replay the task schedules for HOURS (default 24) of virtual time with stub task bodies, "
+             "print a load report and exit"
+    )
+    parser.add_argument(
+        "--task-duration",
+        type=float,
+        default=1.0,
+        help="Virtual seconds each stub run takes in --simulate (default 1)"
+    )
     
     args = parser.parse_args()
-    
+
+    if args.status:
+        return show_status(args.config)
+    if args.simulate is not None:
+        return run_simulation(args.config, args.simulate, args.task_duration)
+
+    with startup.phase("imports"):
+        from task_scheduler.scheduler import TaskScheduler
+        from task_scheduler.logging_config import setup_logging_from_config, set_logging_manager
+        from loguru import logger
+
     # Setup logging
-    logs_dir = project_dir / "logs"
-    logging_manager = setup_logging_from_config(args.config, logs_dir)
-    set_logging_manager(logging_manager)
-    
-    # Log system info
-    logging_manager.log_system_info()
+    with startup.phase("logging"):
+        logs_dir = project_dir / "logs"
+        logging_manager = setup_logging_from_config(args.config, logs_dir)
+        set_logging_manager(logging_manager)
+
+        # Log system info
+        logging_manager.log_system_info()
     
     try:
         # Create scheduler
-        scheduler = TaskScheduler(args.config)
-        
-        if args.status:
-            # Show status and exit
-            status = scheduler.get_status()
-            print("Task Scheduler Status:")
-            print(f"  Running: {status['running']}")
-            print(f"  Loaded Tasks: {status['loaded_tasks']}")
-            print(f"  Scheduled Jobs: {status['scheduled_jobs']}")
-            print(f"  Memory Usage: {status['memory_usage'].get('rss_mb', 0):.1f} MB")
+        scheduler = TaskScheduler(args.config, upgrade_pip=args.upgrade_pip, startup_profiler=startup)
+
+        if args.profile_startup:
+            scheduler.start(startup_only=True)
+            print(startup.format_report())
             return 0
         
         if args.daemon:
@@ -95,6 +175,8 @@ def main():
 
 def daemonize():
     """Daemonize the process (Unix only)"""
+    from loguru import logger
+
     if os.name == 'nt':
         logger.warning("Daemon mode not supported on Windows")
         return
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Control a running scheduler through its control socket
+
+Usage:
+    python scripts/control.py COMMAND [TASK]
+
+Commands:
+    ping            Check that the scheduler answers
+    stats           Print the full scheduler status
+    metrics         Print metrics in the Prometheus text format
+    jobs            List scheduled jobs and pending retries
+    run TASK        Run a task once now (its schedule is unchanged)
+    pause TASK      Skip a task's scheduled runs until it is resumed
+    resume TASK     Run a paused task on its schedule again
+    reload TASK     Load a task from its file again, even if unchanged
+    restart         Restart the scheduler once running tasks have finished
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add project directory to path
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+
+from task_scheduler.control import ControlError, PID_FILE_NAME, read_pid_file, send_command
+
+TASK_COMMANDS = {"run", "pause", "resume", "reload"}
+COMMANDS = {"ping", "stats", "metrics", "jobs", "restart"} | TASK_COMMANDS
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Control a running task scheduler",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("command", choices=sorted(COMMANDS), help="Command to send")
+    parser.add_argument("task", nargs="?", help="Task name (run, pause, resume, reload)")
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=project_dir / "data",
+        help="Scheduler data directory holding the PID file"
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds to wait for the reply")
+    return parser.parse_args()
+
+
+def print_jobs(jobs):
+    """Print the reply of the jobs command as a table"""
+    if not jobs:
+        print("No scheduled jobs")
+        return
+    for job in sorted(jobs, key=lambda j: j["next_run"] or ""):
+        flags = [name for name in ("running", "paused") if job[name]]
+        print(f"{job['task'] or '?':30} {job['type']:10} {job['next_run'] or '-':26} {' '.join(flags)}")
+
+
+def main():
+    """Main entry point"""
+    args = parse_arguments()
+    if args.command in TASK_COMMANDS and not args.task:
+        print(f"The {args.command} command needs a task name")
+        return 2
+
+    pid_file = read_pid_file(args.data_dir / PID_FILE_NAME)
+    if pid_file is None:
+        print("No running scheduler found (no PID file)")
+        return 1
+
+    arguments = {"task": args.task} if args.command in TASK_COMMANDS else {}
+    try:
+        result = send_command(pid_file["socket"], args.command, timeout=args.timeout, **arguments)
+    except ConnectionError:
+        print(f"Scheduler (PID {pid_file['pid']}) is not answering on {pid_file['socket']}")
+        return 1
+    except ControlError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.command == "jobs":
+        print_jobs(result)
+    elif args.command == "metrics":
+        print(result, end="")
+    else:
+        print(json.dumps(result, indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
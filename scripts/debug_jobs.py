@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Debug what jobs are actually in the schedule
+Debug what jobs are actually in the schedule of the running scheduler
 """
 
 import sys
@@ -10,31 +10,34 @@ from pathlib import Path
 project_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(project_dir))
 
-import schedule
-from task_scheduler.decorators import CronLikeJob
+from task_scheduler.control import PID_FILE_NAME, read_pid_file, send_command
 
 def main():
-    print(f"Total jobs in schedule: {len(schedule.jobs)}")
+    pid_file = read_pid_file(project_dir / "data" / PID_FILE_NAME)
+    if pid_file is None:
+        print("No running scheduler found (no PID file)")
+        return 1
+
+    try:
+        jobs = send_command(pid_file["socket"], "jobs")
+    except ConnectionError as e:
+        print(f"Scheduler is not answering: {e}")
+        return 1
+
+    print(f"Total jobs in schedule: {len(jobs)}")
     print()
     
-    for i, job in enumerate(schedule.jobs):
+    for i, job in enumerate(jobs):
         print(f"Job {i+1}:")
-        print(f"  Type: {type(job)}")
-        print(f"  Is CronLikeJob: {isinstance(job, CronLikeJob)}")
-        
-        if isinstance(job, CronLikeJob):
-            print(f"  Interval: {job.interval}")
-            print(f"  Unit: {job.unit}")
-            print(f"  Next run: {job.next_run}")
-            print(f"  Should run now: {job.should_run()}")
-            if hasattr(job.job_func, '_task_name'):
-                print(f"  Task name: {job.job_func._task_name}")
-        else:
-            print(f"  Next run: {getattr(job, 'next_run', 'N/A')}")
-            if hasattr(job, 'job_func') and hasattr(job.job_func, '_task_name'):
-                print(f"  Task name: {job.job_func._task_name}")
-        
+        print(f"  Type: {job['type']}")
+        print(f"  Job: {job['job']}")
+        print(f"  Task name: {job['task']}")
+        print(f"  Next run: {job['next_run']}")
+        print(f"  Queued: {job['queued']}")
+        print(f"  Running: {job['running']}")
+        print(f"  Paused: {job['paused']}")
         print()
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -17,7 +17,6 @@ Options:
 """
 
 import sys
-import sqlite3
 import argparse
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -139,21 +138,7 @@ def reset_schedules(args):
                     print(f"⚠️  Task '{task_name}' not found in database")
         else:
             # Get all schedules
-            conn = sqlite3.connect(db_path)
-            cursor = conn.execute("SELECT * FROM task_schedules WHERE is_active = 1")
-            rows = cursor.fetchall()
-            conn.close()
-            
-            schedules_to_reset = []
-            for row in rows:
-                schedule = TaskSchedule(
-                    task_name=row[0],
-                    next_run_time=datetime.fromisoformat(row[1]),
-                    schedule_config=row[2],
-                    last_updated=datetime.fromisoformat(row[3]),
-                    is_active=bool(row[4])
-                )
-                schedules_to_reset.append(schedule)
+            schedules_to_reset = db_manager.get_active_schedules()
         
         if not schedules_to_reset:
             print("ℹ️  No schedules found to reset")
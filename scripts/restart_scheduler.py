@@ -32,10 +32,30 @@ sys.path.insert(0, str(project_dir))
 
 # Import config helper
 from helpers.config_loader import get_config_value
+from task_scheduler.control import PID_FILE_NAME, read_pid_file
+
+
+def find_scheduler_from_pid_file() -> Optional[psutil.Process]:
+    """Find the scheduler through the PID file it writes while running"""
+    pid_file = read_pid_file(project_dir / "data" / PID_FILE_NAME)
+    if not pid_file:
+        return None
+    try:
+        proc = psutil.Process(pid_file["pid"])
+        # Guard against the pid having been reused after an unclean exit
+        if proc.create_time() <= pid_file.get("started_at", float("inf")):
+            return proc
+    except (psutil.NoSuchProcess, psutil.AccessDenied, KeyError):
+        pass
+    return None
 
 
 def find_scheduler_processes() -> List[psutil.Process]:
     """Find all running scheduler processes"""
+    proc = find_scheduler_from_pid_file()
+    if proc:
+        return [proc]
+
     processes = []
 
     # First try using pgrep for more reliable process finding
@@ -32,6 +32,19 @@ def run_tests(test_args=None):
     return result.returncode
 
 
+def run_benchmarks(bench_args):
+    """Run the scale benchmark suite"""
+    cmd = [sys.executable, str(project_dir / "benchmarks" / "bench_scale.py")] + bench_args
+
+    print("Running Task Scheduler Benchmarks")
+    print("=" * 40)
+    print(f"Command: {' '.join(cmd)}")
+    print()
+
+    result = subprocess.run(cmd, cwd=project_dir)
+    return result.returncode
+
+
 def main():
     """Main function"""
     import argparse
@@ -53,6 +66,23 @@ def main():
         action='store_true',
         help='Verbose output'
     )
+    parser.add_argument(
+        '--benchmark',
+        action='store_true',
+        help='Run the scale benchmarks instead of the tests and compare them with the baseline'
+    )
+    parser.add_argument(
+        '--benchmark-tasks',
+        type=int,
+        nargs='+',
+        metavar='N',
+        help='Numbers of synthetic tasks to benchmark (default: 100 1000 10000)'
+    )
+    parser.add_argument(
+        '--save-baseline',
+        action='store_true',
+        help='Store the benchmark results as the new baseline'
+    )
     parser.add_argument(
         'test_path',
         nargs='?',
@@ -60,6 +90,14 @@ def main():
     )
     
     args = parser.parse_args()
+
+    if args.benchmark:
+        bench_args = []
+        if args.benchmark_tasks:
+            bench_args += ['--tasks'] + [str(n) for n in args.benchmark_tasks]
+        if args.save_baseline:
+            bench_args.append('--save-baseline')
+        return run_benchmarks(bench_args)
     
     # Build pytest arguments
     test_args = []
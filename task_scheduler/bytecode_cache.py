@@ -0,0 +1,153 @@
+"""
+Compiled code cache for task modules
+"""
+
+import hashlib
+import importlib.util
+import marshal
+import os
+import sys
+import threading
+from pathlib import Path
+from types import CodeType
+from typing import Dict, Optional, Set, Tuple
+
+
+# Names the on-disk entries like __pycache__ does, e.g. ".cpython-311.bin"
+CACHE_SUFFIX = f".{sys.implementation.cache_tag or 'python'}.bin"
+
+
+class BytecodeCache:
+    """
+    Code objects for task sources, keyed by content hash
+
+    Compiling a task is the expensive part of loading it, so the result is
+    kept in memory for reloads and, like ``__pycache__``, marshalled to
+    ``cache_dir`` for the next start. Entries are tagged with the
+    interpreter's cache tag and magic number, so the scheduler and venv
+    workers running a different Python can share the directory. Only the
+    latest entry per source file is kept on disk; the directory is listed
+    once to find older entries, not on every write.
+
+    Also used by the worker process, so loguru is only imported on errors.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._codes: Dict[str, Tuple[str, CodeType]] = {}  # filename -> (key, code)
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "compiles": 0}
+        self._disk_entries: Optional[Dict[str, Set[str]]] = None  # file stem -> entry names, listed on first write
+        if self.cache_dir:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                from loguru import logger
+                logger.warning(f"Bytecode cache directory {self.cache_dir} unavailable: {e}")
+                self.cache_dir = None
+
+    @staticmethod
+    def make_key(source: str, filename: str, first_line: int = 1) -> str:
+        """Cache key: everything that ends up in the code object"""
+        digest = hashlib.sha1(f"{filename}\0{first_line}\0".encode('utf-8'))
+        digest.update(source.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get_code(self, source: str, filename: str, first_line: int = 1) -> CodeType:
+        """
+        Get the code object for a task source, compiling it only if needed
+
+        Args:
+            source: Python source to compile
+            filename: Real path of the task file, used in tracebacks
+            first_line: Line of the file the source starts on (after frontmatter)
+        """
+        key = self.make_key(source, filename, first_line)
+
+        with self._lock:
+            cached = self._codes.get(filename)
+        if cached and cached[0] == key:
+            self.stats["memory_hits"] += 1
+            return cached[1]
+
+        code = self._read(filename, key)
+        if code is not None:
+            self.stats["disk_hits"] += 1
+        else:
+            self.stats["compiles"] += 1
+            # Pad so line numbers in tracebacks match the file
+            code = compile("\n" * (first_line - 1) + source, filename, 'exec', dont_inherit=True)
+            self._write(filename, key, code)
+
+        with self._lock:
+            self._codes[filename] = (key, code)
+        return code
+
+    def discard(self, filename: str):
+        """Forget the in-memory entry for a file (the disk entry stays for the next start)"""
+        with self._lock:
+            self._codes.pop(filename, None)
+
+    def clear(self):
+        """Forget all in-memory entries"""
+        with self._lock:
+            self._codes.clear()
+
+    def _entry_path(self, filename: str, key: str) -> Path:
+        return self.cache_dir / f"{Path(filename).stem}.{key[:20]}{CACHE_SUFFIX}"
+
+    def _read(self, filename: str, key: str) -> Optional[CodeType]:
+        """Load a marshalled code object, or None if missing or stale"""
+        if not self.cache_dir:
+            return None
+        try:
+            data = self._entry_path(filename, key).read_bytes()
+        except OSError:
+            return None
+        magic = importlib.util.MAGIC_NUMBER
+        if data[:len(magic)] != magic:
+            return None
+        try:
+            code = marshal.loads(data[len(magic):])
+        except (EOFError, ValueError, TypeError):
+            return None
+        return code if isinstance(code, CodeType) and code.co_filename == filename else None
+
+    def _write(self, filename: str, key: str, code: CodeType):
+        """Marshal a code object to disk and remove older entries for the file"""
+        if not self.cache_dir:
+            return
+        entry_path = self._entry_path(filename, key)
+        tmp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(importlib.util.MAGIC_NUMBER + marshal.dumps(code))
+            os.replace(tmp_path, entry_path)
+            with self._lock:
+                entries = self._list_disk_entries()
+                stale = entries.get(Path(filename).stem, set()) - {entry_path.name}
+                entries[Path(filename).stem] = {entry_path.name}
+            for name in stale:
+                try:
+                    (self.cache_dir / name).unlink()
+                except FileNotFoundError:
+                    pass
+        except OSError as e:
+            from loguru import logger
+            logger.debug(f"Could not write bytecode cache entry for {filename}: {e}")
+
+    def _list_disk_entries(self) -> Dict[str, Set[str]]:
+        """Entry names on disk by file stem (listed once, then kept up to date by _write)"""
+        if self._disk_entries is None:
+            self._disk_entries = {}
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(CACHE_SUFFIX):
+                    continue
+                stem, _, key = name[:-len(CACHE_SUFFIX)].rpartition('.')
+                if stem and len(key) == 20:
+                    self._disk_entries.setdefault(stem, set()).add(name)
+        return self._disk_entries
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics"""
+        with self._lock:
+            return {"entries": len(self._codes), **self.stats}
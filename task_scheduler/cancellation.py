@@ -0,0 +1,193 @@
+"""
+Cancellation tokens and timeout enforcement for task runs
+"""
+
+import ctypes
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+from loguru import logger
+
+
+class TaskTimeoutError(Exception):
+    """Raised when a task exceeds its frontmatter timeout"""
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag handed to a running task
+
+    Long-running tasks should poll ``cancelled`` (or call
+    ``raise_if_cancelled()``) and use ``wait()`` instead of ``time.sleep()``
+    so they stop promptly when their timeout expires. Code that blocks on
+    something else (such as a subprocess) registers a callback with
+    ``on_cancel()`` that unblocks it.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+        self._callbacks: List[Callable[[], Any]] = []
+        self._lock = threading.Lock()
+
+    def cancel(self, reason: str = "cancelled"):
+        """Request cancellation and run the registered callbacks"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._run_callback(callback)
+
+    def on_cancel(self, callback: Callable[[], Any]):
+        """Call ``callback`` when cancellation is requested (straight away if it already was)"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        self._run_callback(callback)
+
+    def remove_on_cancel(self, callback: Callable[[], Any]):
+        """Unregister a callback added with ``on_cancel()``"""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    @staticmethod
+    def _run_callback(callback: Callable[[], Any]):
+        """Run a cancellation callback, logging its failure"""
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Cancellation callback {callback} failed: {e}")
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested"""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        """Raise TaskTimeoutError if cancellation has been requested"""
+        if self._event.is_set():
+            raise TaskTimeoutError(self.reason or "Task cancelled")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Sleep for up to ``timeout`` seconds; returns True if cancelled meanwhile"""
+        return self._event.wait(timeout)
+
+
+_current = threading.local()
+_NEVER_CANCELLED = CancellationToken()
+
+
+def get_cancellation_token() -> CancellationToken:
+    """Get the token of the task running on this thread (a never-cancelled token outside tasks)"""
+    return getattr(_current, "token", None) or _NEVER_CANCELLED
+
+
+def set_cancellation_token(token: Optional[CancellationToken]):
+    """Bind a token to the current thread (None to clear)"""
+    _current.token = token
+
+
+def _set_async_exception(thread_id: int, exc_type: Optional[type]) -> bool:
+    """Raise ``exc_type`` asynchronously in another thread (None clears a pending one)"""
+    result = ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread_id), ctypes.py_object(exc_type) if exc_type else ctypes.c_void_p(0)
+    )
+    return result == 1
+
+
+class _Watch:
+    """A task run being supervised"""
+
+    def __init__(self, token: CancellationToken, thread_id: int, task_name: str, timeout: float):
+        self.token = token
+        self.thread_id = thread_id
+        self.task_name = task_name
+        self.timeout = timeout
+        self.active = True
+        self.interrupted = False
+
+
+class TimeoutSupervisor:
+    """
+    Enforces task timeouts for in-process runs
+
+    When a run's deadline passes its token is cancelled (cooperative). If the
+    run is still going after ``grace_period`` seconds, a TaskTimeoutError is
+    raised asynchronously in the worker thread (hard). The asynchronous
+    exception is delivered at the next Python bytecode, so a thread blocked
+    inside a C call only stops once that call returns; tasks that need a
+    guaranteed kill should use ``execution: process``.
+    """
+
+    def __init__(self, grace_period: float = 5.0):
+        self.grace_period = grace_period
+        self._heap: List[Tuple[float, int, str, _Watch]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def watch(self, token: CancellationToken, timeout: float, task_name: str,
+              thread_id: Optional[int] = None) -> _Watch:
+        """Start supervising the calling (or given) thread's run"""
+        watch = _Watch(token, thread_id or threading.get_ident(), task_name, timeout)
+        with self._condition:
+            self._ensure_thread()
+            heapq.heappush(self._heap, (time.monotonic() + timeout, next(self._counter), "cancel", watch))
+            self._condition.notify()
+        return watch
+
+    def unwatch(self, watch: _Watch):
+        """Stop supervising a run; clears a hard cancellation that has not fired yet"""
+        with self._condition:
+            watch.active = False
+            if watch.interrupted:
+                _set_async_exception(watch.thread_id, None)
+
+    def _ensure_thread(self):
+        """Start the supervisor thread on first use (caller holds the condition)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._loop, name="timeout-supervisor", daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        """Fire cancellations as their deadlines pass"""
+        with self._condition:
+            while not self._stopped:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+
+                deadline, _, action, watch = self._heap[0]
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+
+                heapq.heappop(self._heap)
+                if not watch.active:
+                    continue
+
+                if action == "cancel":
+                    logger.warning(f"Task {watch.task_name} exceeded its timeout of {watch.timeout}s, cancelling")
+                    watch.token.cancel(f"Task {watch.task_name} timed out after {watch.timeout}s")
+                    heapq.heappush(self._heap, (time.monotonic() + self.grace_period,
+                                                next(self._counter), "interrupt", watch))
+                else:
+                    logger.error(f"Task {watch.task_name} ignored cancellation, interrupting its thread")
+                    watch.interrupted = _set_async_exception(watch.thread_id, TaskTimeoutError)
+
+    def stop(self):
+        """Stop the supervisor thread"""
+        with self._condition:
+            self._stopped = True
+            self._heap.clear()
+            self._condition.notify()
@@ -0,0 +1,105 @@
+"""
+Injectable time source for scheduling decisions
+"""
+
+import datetime as _datetime
+import time as _time
+import types
+from contextlib import contextmanager
+from typing import Optional, Union
+
+import schedule
+
+
+class SystemClock:
+    """Wall-clock time (the default)"""
+
+    def time(self) -> float:
+        return _time.time()
+
+    def now(self) -> _datetime.datetime:
+        return _datetime.datetime.now()
+
+
+class VirtualClock:
+    """
+    Time that only moves when advanced
+
+    Used to replay schedules faster than real time (``main.py --simulate``)
+    and in tests.
+    """
+
+    def __init__(self, start: Optional[float] = None):
+        self._now = _time.time() if start is None else float(start)
+
+    def time(self) -> float:
+        return self._now
+
+    def now(self) -> _datetime.datetime:
+        return _datetime.datetime.fromtimestamp(self._now)
+
+    def advance(self, seconds: float):
+        """Move time forward by ``seconds``"""
+        self._now += max(0.0, seconds)
+
+    def advance_to(self, timestamp: float):
+        """Move time forward to ``timestamp`` (never backwards)"""
+        self._now = max(self._now, timestamp)
+
+
+Clock = Union[SystemClock, VirtualClock]
+
+_clock: Clock = SystemClock()
+_schedule_datetime = schedule.datetime
+
+
+class _ClockDatetime(_datetime.datetime):
+    """datetime whose now() reads the installed clock, for the schedule library"""
+
+    @classmethod
+    def now(cls, tz=None):
+        if tz is not None:
+            return _datetime.datetime.fromtimestamp(_clock.time(), tz)
+        return _clock.now()
+
+
+# Stands in for the datetime module inside the schedule library while a
+# non-system clock is installed, so its jobs compute next_run in that time
+_clock_datetime_module = types.SimpleNamespace(**{
+    name: getattr(_datetime, name) for name in dir(_datetime) if not name.startswith('__')
+})
+_clock_datetime_module.datetime = _ClockDatetime
+
+
+def time() -> float:
+    """Current time as an epoch timestamp"""
+    return _clock.time()
+
+
+def now() -> _datetime.datetime:
+    """Current local time as a naive datetime"""
+    return _clock.now()
+
+
+def get_clock() -> Clock:
+    """The clock scheduling decisions are based on"""
+    return _clock
+
+
+def set_clock(clock: Optional[Clock]) -> Clock:
+    """Install a clock (None: the system clock) and return the previous one"""
+    global _clock
+    previous = _clock
+    _clock = clock or SystemClock()
+    schedule.datetime = _schedule_datetime if isinstance(_clock, SystemClock) else _clock_datetime_module
+    return previous
+
+
+@contextmanager
+def use_clock(clock: Clock):
+    """Run a block with ``clock`` installed"""
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
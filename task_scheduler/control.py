@@ -0,0 +1,235 @@
+"""
+Unix domain socket control interface of a running scheduler
+"""
+
+import json
+import os
+import select
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+CONTROL_SOCKET_NAME = "control.sock"
+PID_FILE_NAME = "scheduler.pid"
+
+
+class ControlError(Exception):
+    """A control command was rejected or failed in the scheduler"""
+
+
+class TriggerJob:
+    """
+    A run of a task requested with the ``run`` command
+
+    Dispatched through the scheduler like a due job, so pausing, module
+    retirement and lazy eviction account for it, but never rescheduled.
+    """
+
+    one_shot = True
+
+    def __init__(self, task_name: str, job_func: Callable[[], Any]):
+        self.task_name = task_name
+        self.job_func = job_func
+
+    def run(self):
+        """Run the task; its outcome is recorded by the tracking wrapper"""
+        try:
+            return self.job_func()
+        except Exception:
+            return None
+
+    def __str__(self):
+        return f"Triggered run of {self.task_name}"
+
+
+class ControlServer:
+    """
+    Serves newline-delimited JSON commands on a Unix domain socket
+
+    A request is ``{"command": name, ...arguments}`` and the reply is
+    ``{"ok": true, "result": ...}`` or ``{"ok": false, "error": message}``.
+    Each connection is handled on its own thread and may send several
+    requests. Handlers are called with the request's arguments as keyword
+    arguments. Alongside the socket, a PID file records the scheduler's pid
+    and socket path, so tools find a running scheduler without scanning the
+    process table.
+    """
+
+    def __init__(self, socket_path: Path, pid_path: Path, handlers: Dict[str, Callable[..., Any]]):
+        self.socket_path = Path(socket_path)
+        self.pid_path = Path(pid_path)
+        self.handlers = handlers
+        self._socket: Optional[socket.socket] = None
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"connections": 0, "commands": 0, "errors": 0}
+
+    def start(self) -> bool:
+        """Bind the socket, write the PID file and start serving"""
+        from loguru import logger
+
+        if self._socket is not None:
+            return True
+        if self.socket_path.exists():
+            if _socket_in_use(self.socket_path):
+                logger.error(f"Control socket {self.socket_path} is in use by another scheduler")
+                return False
+            self.socket_path.unlink()  # Left behind by a scheduler that did not exit cleanly
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(str(self.socket_path))
+            os.chmod(self.socket_path, 0o600)
+            server.listen(socket.SOMAXCONN)
+        except OSError as e:
+            server.close()
+            logger.error(f"Failed to open control socket {self.socket_path}: {e}")
+            return False
+
+        self._socket = server
+        self._wake_r, self._wake_w = os.pipe()
+        self._write_pid_file()
+        self._thread = threading.Thread(target=self._serve, name="control-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Control socket listening on {self.socket_path}")
+        return True
+
+    def stop(self):
+        """Stop serving and remove the socket and PID file"""
+        if self._socket is None:
+            return
+        os.write(self._wake_w, b'x')
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._socket.close()
+        self._socket = None
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+        for path in (self.socket_path, self.pid_path):
+            try:
+                if path == self.pid_path and (read_pid_file(path) or {}).get("pid") != os.getpid():
+                    continue  # Taken over by another scheduler
+                path.unlink()
+            except OSError:
+                pass
+
+    def _write_pid_file(self):
+        """Atomically record this process and its socket"""
+        tmp_path = self.pid_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps({
+            "pid": os.getpid(),
+            "socket": str(self.socket_path),
+            "started_at": time.time()
+        }))
+        os.replace(tmp_path, self.pid_path)
+
+    def _serve(self):
+        """Accept connections until stopped"""
+        while True:
+            readable, _, _ = select.select([self._socket, self._wake_r], [], [])
+            if self._wake_r in readable:
+                return
+            try:
+                conn, _ = self._socket.accept()
+            except OSError:
+                continue
+            self._stats["connections"] += 1
+            threading.Thread(target=self._handle_connection, args=(conn,),
+                             name="control-connection", daemon=True).start()
+
+    def _handle_connection(self, conn: socket.socket):
+        """Answer requests on one connection until the client closes it"""
+        with conn, conn.makefile('rwb') as stream:
+            for line in stream:
+                if not line.strip():
+                    continue
+                reply = self._execute(line)
+                try:
+                    stream.write(json.dumps(reply, default=str).encode() + b'\n')
+                    stream.flush()
+                except OSError:
+                    return
+
+    def _execute(self, line: bytes) -> Dict[str, Any]:
+        """Run one request and build its reply"""
+        from loguru import logger
+
+        self._stats["commands"] += 1
+        try:
+            request = json.loads(line)
+            command = request.pop("command")
+            handler = self.handlers.get(command)
+            if handler is None:
+                raise ControlError(f"Unknown command '{command}', expected one of: {', '.join(sorted(self.handlers))}")
+            return {"ok": True, "result": handler(**request)}
+        except Exception as e:
+            self._stats["errors"] += 1
+            if not isinstance(e, (ControlError, KeyError, TypeError, ValueError)):
+                logger.error(f"Control command failed: {e}")
+            return {"ok": False, "error": str(e) or type(e).__name__}
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get control interface statistics"""
+        return dict(self._stats)
+
+
+def _socket_in_use(socket_path: Path) -> bool:
+    """Check whether something accepts connections on a socket file"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def read_pid_file(pid_path: Path) -> Optional[Dict[str, Any]]:
+    """Read the PID file of a scheduler, or None if there is none"""
+    try:
+        return json.loads(Path(pid_path).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def send_command(socket_path: Path, command: str, timeout: float = 30, **arguments) -> Any:
+    """
+    Send one command to a running scheduler
+
+    Raises:
+        ConnectionError: No scheduler is listening on the socket
+        ControlError: The scheduler rejected the command or it failed
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                client.connect(str(socket_path))
+                break
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                raise ConnectionError(f"No scheduler is listening on {socket_path}") from e
+            except BlockingIOError:
+                # The listen backlog is full; a Unix socket with a timeout does not wait for room
+                if time.monotonic() >= deadline:
+                    raise ConnectionError(f"The scheduler is not accepting connections on {socket_path}")
+                time.sleep(0.01)
+        with client.makefile('rwb') as stream:
+            stream.write(json.dumps({"command": command, **arguments}).encode() + b'\n')
+            stream.flush()
+            line = stream.readline()
+        if not line:
+            raise ConnectionError("The scheduler closed the control connection")
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise ControlError(reply.get("error", "Unknown error"))
+        return reply.get("result")
+    finally:
+        client.close()
@@ -8,7 +8,121 @@ from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 from dataclasses import dataclass, asdict
+from contextlib import contextmanager
 import threading
+from loguru import logger
+
+
+# Bumped whenever the on-disk layout changes; stored in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+# Times are stored as integer epoch microseconds, so range queries can use the
+# indexes and values round-trip exactly
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS task_executions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_name TEXT NOT NULL,
+        execution_time INTEGER NOT NULL,
+        next_run_time INTEGER,
+        status TEXT NOT NULL,
+        duration REAL NOT NULL,
+        error_message TEXT,
+        retry_count INTEGER DEFAULT 0,
+        created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER) * 1000000)
+    );
+
+    CREATE TABLE IF NOT EXISTS task_schedules (
+        task_name TEXT PRIMARY KEY,
+        next_run_time INTEGER NOT NULL,
+        schedule_config TEXT NOT NULL,
+        last_updated INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER) * 1000000),
+        is_active BOOLEAN DEFAULT 1
+    );
+
+    CREATE TABLE IF NOT EXISTS scheduler_state (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        updated_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER) * 1000000)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_task_executions_name_time
+        ON task_executions(task_name, execution_time);
+    CREATE INDEX IF NOT EXISTS idx_task_executions_time
+        ON task_executions(execution_time);
+    CREATE INDEX IF NOT EXISTS idx_task_schedules_due
+        ON task_schedules(is_active, next_run_time);
+"""
+
+# Plain range on the column so idx_task_schedules_due is used
+OVERDUE_QUERY = """
+    SELECT * FROM task_schedules
+    WHERE is_active = 1 AND next_run_time <= ?
+    ORDER BY next_run_time
+"""
+
+
+
+def _iso_to_epoch_sql(column: str, utc: bool = False) -> str:
+    """SQL expression converting an ISO text time to epoch microseconds"""
+    modifier = "" if utc else ", 'utc'"
+    return (f"CAST(strftime('%s', {column}{modifier}) AS INTEGER) * 1000000 + "
+            f"CASE WHEN length({column}) > 20 THEN CAST(substr({column} || '000000', 21, 6) AS INTEGER) ELSE 0 END")
+
+
+# Version 0 stored times as ISO text: naive local times written by Python, and
+# UTC for CURRENT_TIMESTAMP defaults (created_at, updated_at)
+MIGRATE_ISO_TO_EPOCH = """
+    DROP INDEX IF EXISTS idx_task_executions_name;
+    DROP INDEX IF EXISTS idx_task_executions_time;
+    DROP INDEX IF EXISTS idx_task_schedules_next_run;
+
+    ALTER TABLE task_executions RENAME TO task_executions_v0;
+    ALTER TABLE task_schedules RENAME TO task_schedules_v0;
+    ALTER TABLE scheduler_state RENAME TO scheduler_state_v0;
+""" + SCHEMA + """
+    INSERT INTO task_executions
+        (id, task_name, execution_time, next_run_time, status, duration,
+         error_message, retry_count, created_at)
+    SELECT id, task_name,
+           """ + _iso_to_epoch_sql("execution_time") + """,
+           """ + _iso_to_epoch_sql("next_run_time") + """,
+           status, duration, error_message, retry_count,
+           """ + _iso_to_epoch_sql("created_at", utc=True) + """
+    FROM task_executions_v0;
+
+    INSERT INTO task_schedules
+        (task_name, next_run_time, schedule_config, last_updated, is_active)
+    SELECT task_name,
+           """ + _iso_to_epoch_sql("next_run_time") + """,
+           schedule_config,
+           """ + _iso_to_epoch_sql("last_updated") + """,
+           is_active
+    FROM task_schedules_v0;
+
+    INSERT INTO scheduler_state (key, value, updated_at)
+    SELECT key, value, """ + _iso_to_epoch_sql("updated_at", utc=True) + """
+    FROM scheduler_state_v0;
+
+    DROP TABLE task_executions_v0;
+    DROP TABLE task_schedules_v0;
+    DROP TABLE scheduler_state_v0;
+"""
+
+
+def to_epoch(value: Optional[datetime]) -> Optional[int]:
+    """Convert a naive local datetime to the integer epoch microseconds stored in the database"""
+    if value is None:
+        return None
+    # Whole seconds and microseconds separately, so no float rounding creeps in
+    return int(value.replace(microsecond=0).timestamp()) * 1000000 + value.microsecond
+
+
+def from_epoch(value: Optional[int]) -> Optional[datetime]:
+    """Convert stored epoch microseconds back to a naive local datetime"""
+    if value is None:
+        return None
+    seconds, microseconds = divmod(int(value), 1000000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=microseconds)
 
 
 @dataclass
@@ -34,245 +148,245 @@ class TaskSchedule:
 
 
 class DatabaseManager:
-    """Manages SQLite database for task scheduling"""
+    """Manages SQLite database for task scheduling
+
+    Each thread keeps one connection open for the life of the manager, so
+    connection setup and PRAGMAs are paid once per thread and the sqlite3
+    statement cache stays warm. Under WAL, reads run concurrently without
+    any Python-level lock; writes are serialised by ``_write_lock`` (SQLite
+    allows a single writer anyway) to avoid busy-timeout stalls.
+    """
+
+    # Prepared statements kept per connection by the sqlite3 module
+    STATEMENT_CACHE_SIZE = 64
     
     def __init__(self, db_path: Path):
         self.db_path = db_path
         # Ensure database directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self._init_database()
     
     def _init_database(self):
-        """Initialize database tables"""
-        with self._lock:
+        """Initialize database tables, migrating older layouts"""
+        with self._write_lock:
             conn = self._get_connection()
-            try:
-                # Create tables
-                conn.executescript("""
-                    CREATE TABLE IF NOT EXISTS task_executions (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        task_name TEXT NOT NULL,
-                        execution_time TIMESTAMP NOT NULL,
-                        next_run_time TIMESTAMP,
-                        status TEXT NOT NULL,
-                        duration REAL NOT NULL,
-                        error_message TEXT,
-                        retry_count INTEGER DEFAULT 0,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    );
-                    
-                    CREATE TABLE IF NOT EXISTS task_schedules (
-                        task_name TEXT PRIMARY KEY,
-                        next_run_time TIMESTAMP NOT NULL,
-                        schedule_config TEXT NOT NULL,
-                        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        is_active BOOLEAN DEFAULT 1
-                    );
-                    
-                    CREATE TABLE IF NOT EXISTS scheduler_state (
-                        key TEXT PRIMARY KEY,
-                        value TEXT NOT NULL,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    );
-                    
-                    CREATE INDEX IF NOT EXISTS idx_task_executions_name 
-                        ON task_executions(task_name);
-                    CREATE INDEX IF NOT EXISTS idx_task_executions_time 
-                        ON task_executions(execution_time);
-                    CREATE INDEX IF NOT EXISTS idx_task_schedules_next_run 
-                        ON task_schedules(next_run_time);
-                """)
-                conn.commit()
-            finally:
-                conn.close()
+            # WAL is persistent in the database file, so it is set once here
+            conn.execute("PRAGMA journal_mode=WAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            has_tables = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_schedules'"
+            ).fetchone()
+
+            if has_tables and version < 1:
+                logger.info(f"Migrating {self.db_path} to epoch timestamps")
+                conn.executescript("BEGIN;" + MIGRATE_ISO_TO_EPOCH + "COMMIT;")
+            else:
+                conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     
     def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection with proper configuration"""
-        conn = sqlite3.connect(
-            self.db_path,
-            timeout=30.0,
-            check_same_thread=False
-        )
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA cache_size=10000")
+        """Get this thread's database connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=30.0,
+                check_same_thread=False,  # Lets close() run from any thread
+                cached_statements=self.STATEMENT_CACHE_SIZE
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA cache_size=10000")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
         return conn
+
+    @contextmanager
+    def _write(self):
+        """Run statements in a transaction, one writer at a time"""
+        with self._write_lock:
+            conn = self._get_connection()
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def close(self):
+        """Close the connections of all threads"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        # Threads that still hold a closed connection will reopen on next use
+        self._local = threading.local()
     
     def record_execution(self, execution: TaskExecution):
         """Record a task execution"""
-        with self._lock:
-            conn = self._get_connection()
-            try:
-                conn.execute("""
+        with self._write() as conn:
+            conn.execute("""
+                INSERT INTO task_executions 
+                (task_name, execution_time, next_run_time, status, 
+                 duration, error_message, retry_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                execution.task_name,
+                to_epoch(execution.execution_time),
+                to_epoch(execution.next_run_time),
+                execution.status,
+                execution.duration,
+                execution.error_message,
+                execution.retry_count
+            ))
+    
+    def update_task_schedule(self, schedule: TaskSchedule):
+        """Update or insert task schedule"""
+        with self._write() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO task_schedules 
+                (task_name, next_run_time, schedule_config, last_updated, is_active)
+                VALUES (?, ?, ?, ?, ?)
+            """, (
+                schedule.task_name,
+                to_epoch(schedule.next_run_time),
+                schedule.schedule_config,
+                to_epoch(schedule.last_updated),
+                schedule.is_active
+            ))
+    
+    def write_batch(self, executions: List[TaskExecution], schedules: List[TaskSchedule]):
+        """Record executions and schedule updates in a single transaction"""
+        with self._write() as conn:
+            if executions:
+                conn.executemany("""
                     INSERT INTO task_executions 
                     (task_name, execution_time, next_run_time, status, 
                      duration, error_message, retry_count)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
+                """, [(
                     execution.task_name,
-                    execution.execution_time,
-                    execution.next_run_time,
+                    to_epoch(execution.execution_time),
+                    to_epoch(execution.next_run_time),
                     execution.status,
                     execution.duration,
                     execution.error_message,
                     execution.retry_count
-                ))
-                conn.commit()
-            finally:
-                conn.close()
-    
-    def update_task_schedule(self, schedule: TaskSchedule):
-        """Update or insert task schedule"""
-        with self._lock:
-            conn = self._get_connection()
-            try:
-                conn.execute("""
+                ) for execution in executions])
+            if schedules:
+                conn.executemany("""
                     INSERT OR REPLACE INTO task_schedules 
                     (task_name, next_run_time, schedule_config, last_updated, is_active)
                     VALUES (?, ?, ?, ?, ?)
-                """, (
+                """, [(
                     schedule.task_name,
-                    schedule.next_run_time,
+                    to_epoch(schedule.next_run_time),
                     schedule.schedule_config,
-                    schedule.last_updated,
+                    to_epoch(schedule.last_updated),
                     schedule.is_active
-                ))
-                conn.commit()
-            finally:
-                conn.close()
+                ) for schedule in schedules])
     
     def get_task_schedule(self, task_name: str) -> Optional[TaskSchedule]:
         """Get task schedule by name"""
-        with self._lock:
-            conn = self._get_connection()
-            try:
-                cursor = conn.execute("""
-                    SELECT * FROM task_schedules WHERE task_name = ?
-                """, (task_name,))
-                row = cursor.fetchone()
-                if row:
-                    return TaskSchedule(
-                        task_name=row['task_name'],
-                        next_run_time=datetime.fromisoformat(row['next_run_time']),
-                        schedule_config=row['schedule_config'],
-                        last_updated=datetime.fromisoformat(row['last_updated']),
-                        is_active=bool(row['is_active'])
-                    )
-                return None
-            finally:
-                conn.close()
+        row = self._get_connection().execute("""
+            SELECT * FROM task_schedules WHERE task_name = ?
+        """, (task_name,)).fetchone()
+        return self._row_to_schedule(row) if row else None
     
     def get_overdue_tasks(self, current_time: datetime) -> List[TaskSchedule]:
         """Get tasks that are overdue for execution"""
-        with self._lock:
-            conn = self._get_connection()
-            try:
-                # Convert current_time to ISO format string for consistent comparison
-                # Remove microseconds for consistent comparison
-                current_time_normalized = current_time.replace(microsecond=0)
-                current_time_str = current_time_normalized.isoformat()
-
-                cursor = conn.execute("""
-                    SELECT * FROM task_schedules
-                    WHERE datetime(next_run_time) <= datetime(?) AND is_active = 1
-                    ORDER BY next_run_time
-                """, (current_time_str,))
-
-                overdue_tasks = []
-                rows = cursor.fetchall()
-
-                for row in rows:
-                    task_schedule = TaskSchedule(
-                        task_name=row['task_name'],
-                        next_run_time=datetime.fromisoformat(row['next_run_time']),
-                        schedule_config=row['schedule_config'],
-                        last_updated=datetime.fromisoformat(row['last_updated']),
-                        is_active=bool(row['is_active'])
-                    )
-                    overdue_tasks.append(task_schedule)
-
-                return overdue_tasks
-            finally:
-                conn.close()
+        rows = self._get_connection().execute(OVERDUE_QUERY, (to_epoch(current_time),)).fetchall()
+        return [self._row_to_schedule(row) for row in rows]
+
+    def explain_overdue_query(self, current_time: datetime) -> List[str]:
+        """Get SQLite's query plan for get_overdue_tasks, one line per step"""
+        plan = self._get_connection().execute(
+            f"EXPLAIN QUERY PLAN {OVERDUE_QUERY}", (to_epoch(current_time),)
+        ).fetchall()
+        return [step[-1] for step in plan]
+
+    def get_all_schedules(self) -> List[TaskSchedule]:
+        """Get every task schedule, active or not"""
+        rows = self._get_connection().execute("SELECT * FROM task_schedules").fetchall()
+        return [self._row_to_schedule(row) for row in rows]
+
+    def get_active_schedules(self) -> List[TaskSchedule]:
+        """Get all active task schedules ordered by next run time"""
+        rows = self._get_connection().execute("""
+            SELECT * FROM task_schedules
+            WHERE is_active = 1
+            ORDER BY next_run_time
+        """).fetchall()
+        return [self._row_to_schedule(row) for row in rows]
+
+    @staticmethod
+    def _row_to_schedule(row: sqlite3.Row) -> TaskSchedule:
+        """Build a TaskSchedule from a task_schedules row"""
+        return TaskSchedule(
+            task_name=row['task_name'],
+            next_run_time=from_epoch(row['next_run_time']),
+            schedule_config=row['schedule_config'],
+            last_updated=from_epoch(row['last_updated']),
+            is_active=bool(row['is_active'])
+        )
     
     def get_last_execution(self, task_name: str) -> Optional[TaskExecution]:
         """Get the last execution record for a task"""
-        with self._lock:
-            conn = self._get_connection()
-            try:
-                cursor = conn.execute("""
-                    SELECT * FROM task_executions 
-                    WHERE task_name = ? 
-                    ORDER BY execution_time DESC 
-                    LIMIT 1
-                """, (task_name,))
-                row = cursor.fetchone()
-                if row:
-                    return TaskExecution(
-                        task_name=row['task_name'],
-                        execution_time=datetime.fromisoformat(row['execution_time']),
-                        next_run_time=datetime.fromisoformat(row['next_run_time']) if row['next_run_time'] else None,
-                        status=row['status'],
-                        duration=row['duration'],
-                        error_message=row['error_message'],
-                        retry_count=row['retry_count']
-                    )
-                return None
-            finally:
-                conn.close()
+        row = self._get_connection().execute("""
+            SELECT * FROM task_executions 
+            WHERE task_name = ? 
+            ORDER BY execution_time DESC, id DESC
+            LIMIT 1
+        """, (task_name,)).fetchone()
+        if row:
+            return TaskExecution(
+                task_name=row['task_name'],
+                execution_time=from_epoch(row['execution_time']),
+                next_run_time=from_epoch(row['next_run_time']),
+                status=row['status'],
+                duration=row['duration'],
+                error_message=row['error_message'],
+                retry_count=row['retry_count']
+            )
+        return None
     
     def cleanup_old_executions(self, days_to_keep: int = 30):
         """Clean up old execution records"""
         cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-        with self._lock:
-            conn = self._get_connection()
-            try:
-                conn.execute("""
-                    DELETE FROM task_executions 
-                    WHERE execution_time < ?
-                """, (cutoff_date,))
-                conn.commit()
-            finally:
-                conn.close()
+        with self._write() as conn:
+            conn.execute("""
+                DELETE FROM task_executions 
+                WHERE execution_time < ?
+            """, (to_epoch(cutoff_date),))
     
     def deactivate_task(self, task_name: str):
         """Deactivate a task schedule"""
-        with self._lock:
-            conn = self._get_connection()
-            try:
-                conn.execute("""
-                    UPDATE task_schedules 
-                    SET is_active = 0, last_updated = CURRENT_TIMESTAMP
-                    WHERE task_name = ?
-                """, (task_name,))
-                conn.commit()
-            finally:
-                conn.close()
+        with self._write() as conn:
+            conn.execute("""
+                UPDATE task_schedules 
+                SET is_active = 0, last_updated = CAST(strftime('%s', 'now') AS INTEGER) * 1000000
+                WHERE task_name = ?
+            """, (task_name,))
     
     def get_scheduler_state(self, key: str) -> Optional[str]:
         """Get scheduler state value"""
-        with self._lock:
-            conn = self._get_connection()
-            try:
-                cursor = conn.execute("""
-                    SELECT value FROM scheduler_state WHERE key = ?
-                """, (key,))
-                row = cursor.fetchone()
-                return row['value'] if row else None
-            finally:
-                conn.close()
+        row = self._get_connection().execute("""
+            SELECT value FROM scheduler_state WHERE key = ?
+        """, (key,)).fetchone()
+        return row['value'] if row else None
     
     def set_scheduler_state(self, key: str, value: str):
         """Set scheduler state value"""
-        with self._lock:
-            conn = self._get_connection()
-            try:
-                conn.execute("""
-                    INSERT OR REPLACE INTO scheduler_state (key, value, updated_at)
-                    VALUES (?, ?, CURRENT_TIMESTAMP)
-                """, (key, value))
-                conn.commit()
-            finally:
-                conn.close()
+        with self._write() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO scheduler_state (key, value, updated_at)
+                VALUES (?, ?, CAST(strftime('%s', 'now') AS INTEGER) * 1000000)
+            """, (key, value))
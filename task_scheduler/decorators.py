@@ -2,41 +2,145 @@
 Custom decorators for task scheduling with tracking and execution management
 """
 
+import dataclasses
 import functools
-import time
+import threading
 import traceback
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Callable, Any, Optional, Dict
+from typing import Callable, Any, Optional, Dict, List, Tuple
 import schedule
 from loguru import logger
 
 from .database import DatabaseManager, TaskExecution, TaskSchedule
+from . import clock
+from .cancellation import CancellationToken, TaskTimeoutError, set_cancellation_token
+from .job_registry import JobRegistry
 
 
 class TaskTracker:
-    """Tracks task execution and manages scheduling"""
+    """Tracks task execution and manages scheduling
+
+    Thread-safe: task runs are dispatched to a worker pool, so the running
+    counts and per-task settings are guarded by a lock.
+    """
     
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
-        self._running_tasks: Dict[str, bool] = {}
+        self._running_tasks: Dict[str, int] = {}
+        self._task_settings: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        # Worker process pool for tasks with 'execution: process' (set by the scheduler)
+        self.process_pool = None
+        # Enforces frontmatter timeouts for in-process runs (set by the scheduler)
+        self.timeout_supervisor = None
+        # Re-enqueues failed runs as one-shot timers (set by the scheduler)
+        self.retry_scheduler = None
+        # Write-behind journal for run records (set by the scheduler)
+        self.journal = None
+        # In-memory schedule table that owns next-run state (set by the scheduler)
+        self.schedule_store = None
+        # Reloads evicted task modules on demand (set by the scheduler when lazy loading is on)
+        self.lazy_loader = None
+        # Duration and outcome metrics (set by the scheduler)
+        self.metrics = None
     
     def is_task_running(self, task_name: str) -> bool:
         """Check if a task is currently running"""
-        return self._running_tasks.get(task_name, False)
+        with self._lock:
+            return self._running_tasks.get(task_name, 0) > 0
     
     def set_task_running(self, task_name: str, running: bool):
         """Set task running status"""
-        self._running_tasks[task_name] = running
+        with self._lock:
+            self._set_running(task_name, running)
+
+    def try_start_task(self, task_name: str) -> bool:
+        """Atomically mark a task as running if it is below its concurrency limit"""
+        with self._lock:
+            if self._running_tasks.get(task_name, 0) >= self.get_max_concurrency(task_name):
+                return False
+            self._set_running(task_name, True)
+            return True
+
+    def get_running_count(self, task_name: str) -> int:
+        """Get the number of in-flight runs of a task"""
+        with self._lock:
+            return self._running_tasks.get(task_name, 0)
+
+    def get_running_tasks(self) -> Dict[str, int]:
+        """Get the number of in-flight runs of every running task"""
+        with self._lock:
+            return dict(self._running_tasks)
+
+    def set_task_settings(self, task_name: str, metadata: Any):
+        """Register the parsed frontmatter metadata for a task"""
+        with self._lock:
+            self._task_settings[task_name] = metadata
+
+    def remove_task_settings(self, task_name: str):
+        """Forget the metadata of an unloaded task"""
+        with self._lock:
+            self._task_settings.pop(task_name, None)
+
+    def get_task_settings(self, task_name: str) -> Optional[Any]:
+        """Get the frontmatter metadata registered for a task"""
+        return self._task_settings.get(task_name)
+
+    def uses_process_execution(self, task_name: str) -> bool:
+        """Check whether a task should run in a worker process"""
+        metadata = self._task_settings.get(task_name)
+        return getattr(metadata, 'execution', 'thread') == 'process' and self.process_pool is not None
+
+    def get_task_timeout(self, task_name: str) -> Optional[float]:
+        """Get the frontmatter timeout of a task in seconds (None if unlimited)"""
+        metadata = self._task_settings.get(task_name)
+        timeout = getattr(metadata, 'timeout', None)
+        return timeout if timeout and timeout > 0 else None
+
+    def get_retry_policy(self, task_name: str) -> Tuple[int, float]:
+        """Get the frontmatter retry_count and retry_delay of a task"""
+        metadata = self._task_settings.get(task_name)
+        return max(0, getattr(metadata, 'retry_count', 0) or 0), getattr(metadata, 'retry_delay', 60) or 0
+
+    def record_execution(self, execution: TaskExecution):
+        """Record a run, through the journal when one is attached"""
+        (self.journal or self.db_manager).record_execution(execution)
+
+    def update_task_schedule(self, schedule_record: TaskSchedule):
+        """Record a schedule update in the schedule store, or directly when there is none"""
+        (self.schedule_store or self.journal or self.db_manager).update_task_schedule(schedule_record)
+
+    def get_task_schedule(self, task_name: str) -> Optional[TaskSchedule]:
+        """Get a task's schedule from the schedule store, or the database when there is none"""
+        return (self.schedule_store or self.db_manager).get_task_schedule(task_name)
+
+    def get_max_concurrency(self, task_name: str) -> int:
+        """Get how many runs of a task may overlap (defaults to 1)"""
+        metadata = self._task_settings.get(task_name)
+        return max(1, getattr(metadata, 'max_concurrency', 1) or 1)
+
+    def _set_running(self, task_name: str, running: bool):
+        """Adjust the running count (caller holds the lock)"""
+        count = self._running_tasks.get(task_name, 0) + (1 if running else -1)
+        if count > 0:
+            self._running_tasks[task_name] = count
+        else:
+            self._running_tasks.pop(task_name, None)
 
 
 # Global task tracker instance
 _task_tracker: Optional[TaskTracker] = None
 
-# Global registry to map job functions to task names
-_job_task_registry: Dict[Any, str] = {}
+# Global registry of scheduled jobs by task name and by wrapper
+_job_registry = JobRegistry()
+
+# Set while a task module is re-executed only to get fresh function objects
+_registration = threading.local()
 
 # Global registry to track recently executed tasks (to prevent double execution)
 _recently_executed_tasks: Dict[str, datetime] = {}
+_recently_executed_lock = threading.Lock()
 
 
 def set_task_tracker(tracker: TaskTracker):
@@ -45,6 +149,35 @@ def set_task_tracker(tracker: TaskTracker):
     _task_tracker = tracker
 
 
+def get_job_registry() -> JobRegistry:
+    """Get the global job registry"""
+    return _job_registry
+
+
+@contextmanager
+def suppress_registration():
+    """Execute task modules in this thread without scheduling their decorated functions"""
+    _registration.suppressed = True
+    try:
+        yield
+    finally:
+        _registration.suppressed = False
+
+
+def _registration_suppressed() -> bool:
+    return getattr(_registration, 'suppressed', False)
+
+
+def _resolve_task_func(task_name: str, wrapper: Callable) -> Callable:
+    """The task function behind a wrapper, reloading its module first if it was evicted"""
+    if _task_tracker is not None and _task_tracker.lazy_loader is not None:
+        _task_tracker.lazy_loader.ensure_loaded(task_name)
+    func = wrapper._original_func
+    if func is None:
+        raise RuntimeError(f"Module of task {task_name} is not loaded")
+    return func
+
+
 def get_task_tracker() -> TaskTracker:
     """Get the global task tracker"""
     if _task_tracker is None:
@@ -52,6 +185,176 @@ def get_task_tracker() -> TaskTracker:
     return _task_tracker
 
 
+def _get_task_name(func: Callable) -> str:
+    """Derive the task name from the module a task function was loaded into"""
+    if hasattr(func, '__module__') and func.__module__.startswith('task_'):
+        # Extract task name from module name (e.g., 'task_example_hello_world_123' -> 'example_hello_world')
+        module_parts = func.__module__.split('_')
+        if len(module_parts) >= 3:
+            return '_'.join(module_parts[1:-1])  # Remove 'task_' prefix and timestamp suffix
+    return func.__name__
+
+
+def _invoke_task(tracker: TaskTracker, task_name: str, func: Callable, args: tuple, kwargs: dict,
+                 task_logger) -> Any:
+    """Run the task body in-process or in a worker process, enforcing its timeout"""
+    timeout = tracker.get_task_timeout(task_name)
+
+    if tracker.uses_process_execution(task_name):
+        # Run the body in a venv worker process; only the outcome comes back.
+        # On timeout the worker and its process tree are killed.
+        outcome = tracker.process_pool.run(
+            task_name, func.__globals__.get('__file__'), func.__name__, timeout=timeout
+        )
+        task_logger.info(
+            f"Task {task_name} completed successfully in worker {outcome['pid']} "
+            f"({outcome['duration']:.2f}s, peak RSS {outcome['peak_rss_mb']:.1f} MB)"
+        )
+        return None
+
+    # In-process: give the task a token it can poll, cancelled when the timeout expires
+    token = CancellationToken()
+    supervisor = tracker.timeout_supervisor
+    watch = supervisor.watch(token, timeout, task_name) if timeout and supervisor else None
+    set_cancellation_token(token)
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        # Report any failure after cancellation (including the bare exception
+        # injected by a hard interrupt) as a timeout with a readable reason
+        if token.cancelled and (not isinstance(e, TaskTimeoutError) or not str(e)):
+            raise TaskTimeoutError(token.reason) from e
+        raise
+    finally:
+        if watch:
+            supervisor.unwatch(watch)
+        set_cancellation_token(None)
+
+    task_logger.info(f"Task {task_name} completed successfully")
+    return result
+
+
+def _schedule_retry(tracker: TaskTracker, task_name: str, func: Callable, args: tuple, kwargs: dict,
+                    attempt: int, task_logger):
+    """Queue the next attempt of a failed run if the task's retry_count allows it"""
+    retry_count, retry_delay = tracker.get_retry_policy(task_name)
+    if tracker.retry_scheduler is None or attempt >= retry_count:
+        if retry_count:
+            task_logger.warning(f"Task {task_name} failed after {attempt + 1} attempts, giving up")
+        return
+
+    tracker.retry_scheduler.schedule(
+        task_name, attempt + 1, retry_delay,
+        functools.partial(_execute_tracked, task_name, func, args, kwargs, attempt=attempt + 1),
+        task_func=func
+    )
+
+
+def _execute_tracked(task_name: str, func: Callable, args: tuple, kwargs: dict,
+                     next_run_getter: Optional[Callable[[], Optional[datetime]]] = None,
+                     attempt: int = 0):
+    """
+    Run a task function with concurrency control and execution tracking
+
+    Shared by the schedule library and cron-like wrappers. Safe to call from
+    worker threads.
+
+    Args:
+        task_name: Name of the task being run
+        func: The undecorated task function
+        args: Positional arguments for the task function
+        kwargs: Keyword arguments for the task function
+        next_run_getter: Returns the job's next run time after execution, if the
+            schedule should be updated from the wrapper
+        attempt: Retry number of this run (0 for a scheduled run)
+    """
+    tracker = get_task_tracker()
+
+    # Check if task is already running (at its concurrency limit)
+    if not tracker.try_start_task(task_name):
+        logger.warning(f"Task {task_name} is already running, skipping execution")
+        return
+
+    start_time = clock.time()
+    execution_time = clock.now()
+    status = "success"
+    error_message = None
+    retry = False
+
+    # Create task-specific logger
+    task_logger = logger.bind(task_name=task_name)
+
+    try:
+        if attempt:
+            task_logger.info(f"Starting task: {task_name} (retry {attempt})")
+        else:
+            task_logger.info(f"Starting task: {task_name}")
+
+        return _invoke_task(tracker, task_name, func, args, kwargs, task_logger)
+
+    except Exception as e:
+        status = "timeout" if isinstance(e, TaskTimeoutError) else "failed"
+        error_message = str(e)
+
+        # Log error with task context
+        task_logger.error(f"Task {task_name} failed: {error_message}")
+        task_logger.error(f"Task {task_name} traceback: {getattr(e, 'remote_traceback', None) or traceback.format_exc()}")
+        retry = True
+        raise
+
+    finally:
+        # Also cleared here: a hard interrupt may land in _invoke_task's finally block
+        set_cancellation_token(None)
+
+        # Mark task as not running
+        tracker.set_task_running(task_name, False)
+
+        # Calculate duration and next run time
+        duration = clock.time() - start_time
+        next_run = next_run_getter() if next_run_getter else None
+
+        if tracker.metrics:
+            tracker.metrics.task_duration.observe(duration, task=task_name)
+            tracker.metrics.task_runs.inc(task=task_name, status=status)
+
+        # Record execution
+        execution = TaskExecution(
+            task_name=task_name,
+            execution_time=execution_time,
+            next_run_time=next_run,
+            status=status,
+            duration=duration,
+            error_message=error_message,
+            retry_count=attempt
+        )
+
+        tracker.record_execution(execution)
+
+        # Track this task as recently executed to prevent double execution
+        with _recently_executed_lock:
+            _recently_executed_tasks[task_name] = execution_time
+
+        # Update schedule in database
+        if next_run:
+            # Ensure consistent datetime format
+            next_run_normalized = next_run
+            if isinstance(next_run_normalized, datetime):
+                next_run_normalized = next_run_normalized.replace(microsecond=0)
+
+            schedule_record = TaskSchedule(
+                task_name=task_name,
+                next_run_time=next_run_normalized,
+                schedule_config="",  # Will be updated by scheduler
+                last_updated=clock.now()
+            )
+            tracker.update_task_schedule(schedule_record)
+
+        # Only once this run no longer counts as running: a retry due
+        # straight away would otherwise be skipped as a concurrent run
+        if retry:
+            _schedule_retry(tracker, task_name, func, args, kwargs, attempt, task_logger)
+
+
 def tracked_schedule(schedule_func):
     """
     Decorator that wraps schedule decorators to add execution tracking
@@ -62,116 +365,36 @@ def tracked_schedule(schedule_func):
             pass
     """
     def decorator(func: Callable) -> Callable:
-        # Try to get task name from module name, fallback to function name
-        if hasattr(func, '__module__') and func.__module__.startswith('task_'):
-            # Extract task name from module name (e.g., 'task_example_hello_world_123' -> 'example_hello_world')
-            module_parts = func.__module__.split('_')
-            if len(module_parts) >= 3:
-                task_name = '_'.join(module_parts[1:-1])  # Remove 'task_' prefix and timestamp suffix
-            else:
-                task_name = func.__name__
-        else:
-            task_name = func.__name__
+        if _registration_suppressed():
+            return func
+        task_name = _get_task_name(func)
+
+        def get_next_run():
+            # The schedule library only advances next_run after the function
+            # returns, so a time that is not in the future is the run that just
+            # happened; the scheduler records the new one when the job completes
+            job = _job_registry.get_job_for_wrapper(wrapper)
+            if job is not None and job.next_run and job.next_run > clock.now():
+                return job.next_run
+            return None
         
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            tracker = get_task_tracker()
-            
-            # Check if task is already running
-            if tracker.is_task_running(task_name):
-                logger.warning(f"Task {task_name} is already running, skipping execution")
-                return
-            
-            # Mark task as running
-            tracker.set_task_running(task_name, True)
-            
-            start_time = time.time()
-            execution_time = datetime.now()
-            status = "success"
-            error_message = None
-            
-            try:
-                # Create task-specific logger
-                task_logger = logger.bind(task_name=task_name)
-                task_logger.info(f"Starting task: {task_name}")
-
-                result = func(*args, **kwargs)
-
-                task_logger.info(f"Task {task_name} completed successfully")
-                return result
-
-            except Exception as e:
-                status = "failed"
-                error_message = str(e)
-
-                # Log error with task context
-                task_logger = logger.bind(task_name=task_name)
-                task_logger.error(f"Task {task_name} failed: {error_message}")
-                task_logger.error(f"Task {task_name} traceback: {traceback.format_exc()}")
-
-                # Also log to general error log
-                logger.error(f"Task execution failed - {task_name}: {error_message}")
-                logger.error(traceback.format_exc())
-                raise
-                
-            finally:
-                # Mark task as not running
-                tracker.set_task_running(task_name, False)
-                
-                # Calculate duration and next run time
-                duration = time.time() - start_time
-                
-                # Get next run time from schedule
-                next_run = None
-                for job in schedule.jobs:
-                    if job.job_func == wrapper:
-                        next_run = job.next_run
-                        break
-                
-                # Record execution
-                execution = TaskExecution(
-                    task_name=task_name,
-                    execution_time=execution_time,
-                    next_run_time=next_run,
-                    status=status,
-                    duration=duration,
-                    error_message=error_message
-                )
-
-                tracker.db_manager.record_execution(execution)
-
-                # Track this task as recently executed to prevent double execution
-                _recently_executed_tasks[task_name] = execution_time
-                
-                # Update schedule in database
-                if next_run:
-                    # Ensure consistent datetime format
-                    next_run_normalized = next_run
-                    if isinstance(next_run_normalized, datetime):
-                        next_run_normalized = next_run_normalized.replace(microsecond=0)
-
-                    schedule_record = TaskSchedule(
-                        task_name=task_name,
-                        next_run_time=next_run_normalized,
-                        schedule_config="",  # Will be updated by scheduler
-                        last_updated=datetime.now()
-                    )
-                    tracker.db_manager.update_task_schedule(schedule_record)
+            # Looked up per call: a lazily reloaded module rebinds it
+            return _execute_tracked(task_name, _resolve_task_func(task_name, wrapper), args, kwargs,
+                                    get_next_run)
         
         # Apply the original schedule decorator
         scheduled_func = schedule_func.do(wrapper)
+        # ScheduleWrapper wraps the returned Job too
+        job = getattr(scheduled_func, 'schedule_unit', scheduled_func)
 
         # Store original function reference for identification
         wrapper._original_func = func
         wrapper._task_name = task_name
 
-        # Register the job function with the task name in our global registry
-        # Find the job that was just created and register it
-        for job in schedule.jobs:
-            if hasattr(job.job_func, 'func') and job.job_func.func == wrapper:
-                _job_task_registry[job.job_func] = task_name
-                logger.debug(f"Registered job function with task name: {task_name}")
-                break
+        _job_registry.register(task_name, job, wrapper)
+        logger.debug(f"Registered job function with task name: {task_name}")
 
         return wrapper
     
@@ -191,79 +414,23 @@ def repeat(interval):
     if isinstance(interval, CronLikeInterval):
         # Use cron-like scheduling
         def decorator(func: Callable) -> Callable:
-            # Extract task name from module
-            if hasattr(func, '__module__') and func.__module__.startswith('task_'):
-                # Extract task name from module name (e.g., 'task_example_hello_world_123' -> 'example_hello_world')
-                module_parts = func.__module__.split('_')
-                if len(module_parts) >= 3:
-                    task_name = '_'.join(module_parts[1:-1])  # Remove 'task_' prefix and timestamp suffix
-                else:
-                    task_name = func.__name__
-            else:
-                task_name = func.__name__
+            if _registration_suppressed():
+                return func
+            task_name = _get_task_name(func)
 
             # Create wrapper with tracking
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
-                tracker = get_task_tracker()
-
-                # Check if task is already running
-                if tracker.is_task_running(task_name):
-                    logger.warning(f"Task {task_name} is already running, skipping execution")
-                    return
-
-                # Mark task as running
-                tracker.set_task_running(task_name, True)
-
-                start_time = time.time()
-                execution_time = datetime.now()
-                status = "success"
-                error_message = None
-
-                try:
-                    logger.info(f"Starting task: {task_name}")
-                    result = func(*args, **kwargs)
-                    logger.info(f"Task {task_name} completed successfully")
-                    return result
-
-                except Exception as e:
-                    status = "failed"
-                    error_message = str(e)
-                    logger.error(f"Task {task_name} failed: {error_message}")
-                    logger.error(traceback.format_exc())
-                    raise
-
-                finally:
-                    # Mark task as not running
-                    tracker.set_task_running(task_name, False)
-
-                    # Calculate duration
-                    duration = time.time() - start_time
-
-                    # Record execution
-                    execution = TaskExecution(
-                        task_name=task_name,
-                        execution_time=execution_time,
-                        next_run_time=None,  # Will be set by cron-like job
-                        status=status,
-                        duration=duration,
-                        error_message=error_message
-                    )
-
-                    tracker.db_manager.record_execution(execution)
-
-                    # Track this task as recently executed to prevent double execution
-                    _recently_executed_tasks[task_name] = execution_time
+                # Next run time is recorded by the cron-like job itself
+                return _execute_tracked(task_name, _resolve_task_func(task_name, wrapper), args, kwargs)
 
             # Store task name on function for later reference
             wrapper._task_name = f"{func.__module__}.{func.__name__}"
             wrapper._original_func = func
 
-            # Register the job function with task name for database sync
-            _job_task_registry[wrapper] = task_name
-
-            # Create cron-like job
+            # Create cron-like job and register it for database sync
             job = interval.do(wrapper)
+            _job_registry.register(task_name, job, wrapper)
 
             logger.debug(f"Created cron-like job for task {task_name}: {job}")
 
@@ -401,10 +568,11 @@ class CronLikeInterval:
         if self._use_cron_like and self._unit in ['minutes', 'hours', 'days']:
             # Use our cron-like job for alignment to clock boundaries
             job = CronLikeJob(self.interval, self._unit, func)
-            # Add to our separate cron-like jobs list, NOT to schedule.jobs
+            # Add to our separate cron-like jobs, NOT to schedule.jobs; keyed by
+            # id() because CronLikeJob equality compares next_run
             if not hasattr(schedule, '_cron_like_jobs'):
-                schedule._cron_like_jobs = []
-            schedule._cron_like_jobs.append(job)
+                schedule._cron_like_jobs = {}
+            schedule._cron_like_jobs[id(job)] = job
             return job
         else:
             # Delegate to standard schedule library
@@ -425,9 +593,7 @@ class CronLikeJob:
 
     def _calculate_next_run(self):
         """Calculate next run time aligned to clock boundaries"""
-        from datetime import datetime, timedelta
-
-        now = datetime.now()
+        now = clock.now()
 
         if self.unit == 'minutes':
             # Align to minute boundaries: 0, 5, 10, 15, etc.
@@ -460,26 +626,22 @@ class CronLikeJob:
 
     def should_run(self):
         """Check if this job should run now"""
-        from datetime import datetime
-        return datetime.now() >= self.next_run
+        return clock.now() >= self.next_run
 
     def run(self):
         """Run the job and reschedule"""
-        from datetime import datetime
-
-        self.last_run = datetime.now()
-        result = self.job_func()
-        self.next_run = self._calculate_next_run()
+        self.last_run = clock.now()
+        try:
+            result = self.job_func()
+        finally:
+            # Advance even if the run failed so the job does not stay due
+            self.next_run = self._calculate_next_run()
 
         # Update database with new next run time
         try:
             tracker = get_task_tracker()
-            if tracker and hasattr(self.job_func, '_task_name'):
-                # Extract task name from the function
-                task_name = None
-                if self.job_func in _job_task_registry:
-                    task_name = _job_task_registry[self.job_func]
-
+            if tracker:
+                task_name = _job_registry.get_task_name(self.job_func)
                 if task_name:
                     from .database import TaskSchedule
                     # Ensure consistent datetime format
@@ -489,10 +651,10 @@ class CronLikeJob:
                         task_name=task_name,
                         next_run_time=next_run_normalized,
                         schedule_config=str(self),
-                        last_updated=datetime.now(),
+                        last_updated=clock.now(),
                         is_active=True
                     )
-                    tracker.db_manager.update_task_schedule(updated_schedule)
+                    tracker.update_task_schedule(updated_schedule)
                     logger.debug(f"Updated database for cron-like job {task_name}: next run at {next_run_normalized}")
         except Exception as e:
             logger.error(f"Error updating database for cron-like job: {e}")
@@ -677,12 +839,12 @@ def force_run_if_overdue(task_name: str, func: Callable, max_delay_minutes: int
     
     # Get last execution and schedule
     last_execution = tracker.db_manager.get_last_execution(task_name)
-    task_schedule = tracker.db_manager.get_task_schedule(task_name)
+    task_schedule = tracker.get_task_schedule(task_name)
     
     if not task_schedule:
         return
     
-    current_time = datetime.now()
+    current_time = clock.now()
     
     # Check if task is overdue
     if (task_schedule.next_run_time <= current_time and 
@@ -701,19 +863,29 @@ def force_run_if_overdue(task_name: str, func: Callable, max_delay_minutes: int
 class ScheduleManager:
     """Manages schedule objects and their database synchronization"""
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, schedule_store=None):
         self.db_manager = db_manager
+        # Schedule reads and writes go to the in-memory store when there is one
+        self.schedules = schedule_store or db_manager
     
-    def sync_schedules_with_database(self, loaded_tasks=None):
+    def sync_schedules_with_database(self, loaded_tasks=None,
+                                     dispatch: Optional[Callable[[Any, Callable[[], None]], bool]] = None) -> List[Any]:
         """Synchronize schedule jobs with database records
 
         Args:
             loaded_tasks: Set of currently loaded task names (optional)
+            dispatch: Runs a job asynchronously and calls the given completion
+                callback afterwards; returns False if the job is already running.
+                When omitted, overdue jobs are run inline.
+
+        Returns:
+            Jobs that were run inline, so callers can requeue them
         """
-        current_time = datetime.now()
+        current_time = clock.now()
+        executed_jobs = []
 
         # Get overdue tasks from database
-        overdue_tasks = self.db_manager.get_overdue_tasks(current_time)
+        overdue_tasks = self.schedules.get_overdue_tasks(current_time)
 
         if overdue_tasks:
             logger.info(f"Found {len(overdue_tasks)} overdue tasks to check:")
@@ -724,8 +896,9 @@ class ScheduleManager:
         for task_schedule in overdue_tasks:
             # Check if this task was recently executed (within last 30 seconds)
             # to prevent double execution
-            if task_schedule.task_name in _recently_executed_tasks:
-                last_execution = _recently_executed_tasks[task_schedule.task_name]
+            with _recently_executed_lock:
+                last_execution = _recently_executed_tasks.get(task_schedule.task_name)
+            if last_execution is not None:
                 time_since_execution = (current_time - last_execution).total_seconds()
                 if time_since_execution < 30:  # 30 second cooldown
                     logger.info(f"Skipping {task_schedule.task_name} - executed {time_since_execution:.1f}s ago (cooldown)")
@@ -733,50 +906,11 @@ class ScheduleManager:
                 else:
                     # Remove old entry
                     logger.info(f"Cooldown expired for {task_schedule.task_name} - last executed {time_since_execution:.1f}s ago")
-                    del _recently_executed_tasks[task_schedule.task_name]
+                    with _recently_executed_lock:
+                        _recently_executed_tasks.pop(task_schedule.task_name, None)
 
             # Find corresponding schedule job
-            matching_job = None
-
-            # First check CronLikeJob objects (stored separately)
-            cron_jobs = getattr(schedule, '_cron_like_jobs', [])
-            for job in cron_jobs:
-                if isinstance(job, CronLikeJob):
-                    if job.job_func in _job_task_registry:
-                        job_task_name = _job_task_registry[job.job_func]
-                        if job_task_name == task_schedule.task_name:
-                            matching_job = job
-                            break
-                    elif hasattr(job.job_func, '_task_name'):
-                        job_task_name = job.job_func._task_name
-                        if '.' in job_task_name:
-                            job_task_name = job_task_name.split('.')[-1]
-
-                        if job_task_name == task_schedule.task_name:
-                            matching_job = job
-                            break
-
-            # If not found in cron jobs, check regular schedule jobs
-            if not matching_job:
-                for job in schedule.jobs:
-                    # Handle regular schedule jobs
-                    if hasattr(job, 'job_func'):
-                        if job.job_func in _job_task_registry:
-                            job_task_name = _job_task_registry[job.job_func]
-
-                            if job_task_name == task_schedule.task_name:
-                                matching_job = job
-                                break
-                        elif hasattr(job.job_func, '_task_name'):
-                            # Fallback to checking _task_name attribute
-                            job_task_name = job.job_func._task_name
-
-                            if '.' in job_task_name:
-                                job_task_name = job_task_name.split('.')[-1]
-
-                            if job_task_name == task_schedule.task_name:
-                                matching_job = job
-                                break
+            matching_job = _job_registry.get_job(task_schedule.task_name)
 
             if matching_job:
                 # Calculate how overdue the task is
@@ -785,60 +919,67 @@ class ScheduleManager:
 
                 # Run overdue tasks (with a reasonable maximum delay)
                 if delay_minutes > 0 and delay_minutes <= 1440:  # Up to 24 hours overdue
+                    if dispatch is not None:
+                        # Hand the run to the worker pool; the schedule is recorded on completion
+                        on_complete = functools.partial(
+                            self._record_next_run, task_schedule, matching_job, current_time
+                        )
+                        if dispatch(matching_job, on_complete):
+                            logger.info(f"DISPATCHED OVERDUE TASK: {task_schedule.task_name} (overdue by {delay_minutes:.1f} minutes)")
+                        else:
+                            logger.debug(f"Overdue task {task_schedule.task_name} is already running")
+                        continue
+
                     logger.info(f"EXECUTING OVERDUE TASK: {task_schedule.task_name} (overdue by {delay_minutes:.1f} minutes)")
                     try:
+                        executed_jobs.append(matching_job)
                         matching_job.run()
 
                         # Update the next run time in database after forced execution
-                        if matching_job.next_run:
-                            # Ensure consistent datetime format
-                            next_run_time = matching_job.next_run
-                            if isinstance(next_run_time, datetime):
-                                next_run_time = next_run_time.replace(microsecond=0)
-
-                            updated_schedule = TaskSchedule(
-                                task_name=task_schedule.task_name,
-                                next_run_time=next_run_time,
-                                schedule_config=task_schedule.schedule_config,
-                                last_updated=current_time,
-                                is_active=True
-                            )
-                            self.db_manager.update_task_schedule(updated_schedule)
-                            logger.debug(f"Updated next run time for {task_schedule.task_name} to {matching_job.next_run}")
-                        else:
-                            logger.warning(f"No next_run time available for {task_schedule.task_name}, cannot update database")
+                        self._record_next_run(task_schedule, matching_job, current_time)
 
                     except Exception as e:
                         logger.error(f"Failed to run overdue task {task_schedule.task_name}: {e}")
                 elif delay_minutes > 1440:
                     # Task is too old, just update its next run time without executing
                     logger.warning(f"Task {task_schedule.task_name} is too overdue ({delay_minutes:.1f} minutes), updating next run time without execution")
-                    if matching_job.next_run:
-                        # Ensure consistent datetime format
-                        next_run_time = matching_job.next_run
-                        if isinstance(next_run_time, datetime):
-                            next_run_time = next_run_time.replace(microsecond=0)
-
-                        updated_schedule = TaskSchedule(
-                            task_name=task_schedule.task_name,
-                            next_run_time=next_run_time,
-                            schedule_config=task_schedule.schedule_config,
-                            last_updated=current_time,
-                            is_active=True
-                        )
-                        self.db_manager.update_task_schedule(updated_schedule)
+                    self._record_next_run(task_schedule, matching_job, current_time)
             else:
                 # If no matching job found, remove the task from database to prevent future warnings
                 logger.debug(f"No matching job found for overdue task: {task_schedule.task_name}, removing from database")
-                self.db_manager.deactivate_task(task_schedule.task_name)
+                self.schedules.deactivate_task(task_schedule.task_name)
+
+        return executed_jobs
+
+    def _record_next_run(self, task_schedule: TaskSchedule, job: Any, current_time: datetime):
+        """Persist a job's next run time after an overdue run"""
+        if not job.next_run:
+            logger.warning(f"No next_run time available for {task_schedule.task_name}, cannot update database")
+            return
+
+        # Ensure consistent datetime format
+        next_run_time = job.next_run
+        if isinstance(next_run_time, datetime):
+            next_run_time = next_run_time.replace(microsecond=0)
+
+        updated_schedule = TaskSchedule(
+            task_name=task_schedule.task_name,
+            next_run_time=next_run_time,
+            schedule_config=task_schedule.schedule_config,
+            last_updated=current_time,
+            is_active=True
+        )
+        self.schedules.update_task_schedule(updated_schedule)
+        logger.debug(f"Updated next run time for {task_schedule.task_name} to {job.next_run}")
     
     def update_schedule_config(self, task_name: str, config: str):
         """Update schedule configuration in database"""
-        task_schedule = self.db_manager.get_task_schedule(task_name)
+        task_schedule = self.schedules.get_task_schedule(task_name)
         if task_schedule:
-            task_schedule.schedule_config = config
-            task_schedule.last_updated = datetime.now()
-            self.db_manager.update_task_schedule(task_schedule)
+            # Copy: the store's record must only change through update_task_schedule
+            self.schedules.update_task_schedule(dataclasses.replace(
+                task_schedule, schedule_config=config, last_updated=clock.now()
+            ))
     
     def cleanup_inactive_schedules(self):
         """Remove schedule jobs for tasks that are no longer active"""
@@ -857,4 +998,4 @@ class ScheduleManager:
         for job in jobs_to_remove:
             schedule.cancel_job(job)
             if hasattr(job.job_func, '_task_name'):
-                self.db_manager.deactivate_task(job.job_func._task_name)
+                self.schedules.deactivate_task(job.job_func._task_name)
@@ -0,0 +1,114 @@
+"""
+Worker pool for running task jobs off the scheduler main loop
+"""
+
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from loguru import logger
+
+
+class TaskExecutor:
+    """
+    Runs due jobs on a bounded thread pool
+
+    The main loop only dispatches; the job (and the database writes done by
+    the tracking wrappers) runs on a worker thread. A job object is not
+    dispatched again while ``limit`` runs of it (one by default) are still in
+    flight.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max(1, int(max_workers))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="task-worker")
+        self._in_flight: Dict[int, Tuple[Any, Future]] = {}  # run id -> (job, future)
+        self._job_runs: Dict[int, int] = {}  # id(job) -> runs queued or running
+        self._run_ids = itertools.count()
+        self._active = 0
+        self._shutdown = False
+        self._lock = threading.Lock()
+
+    def submit(self, job: Any, run: Callable[[Any], Any],
+               on_done: Optional[Callable[[Any], None]] = None, limit: int = 1) -> bool:
+        """
+        Dispatch a job to the pool
+
+        Args:
+            job: The job object (used to detect duplicate dispatches)
+            run: Called with the job on a worker thread
+            on_done: Called with the return value of ``run`` once it finishes
+            limit: How many runs of this job may be in flight at once
+
+        Returns:
+            False if ``limit`` runs of the job are in flight or the executor is shut down
+        """
+        with self._lock:
+            if self._shutdown or self._job_runs.get(id(job), 0) >= max(1, limit):
+                return False
+            run_id = next(self._run_ids)
+            self._job_runs[id(job)] = self._job_runs.get(id(job), 0) + 1
+            self._in_flight[run_id] = (job, self._pool.submit(self._run, run_id, job, run, on_done))
+            return True
+
+    def _run(self, run_id: int, job: Any, run: Callable[[Any], Any], on_done: Optional[Callable[[Any], None]]):
+        """Worker-side wrapper that keeps the bookkeeping consistent"""
+        with self._lock:
+            self._active += 1
+
+        result = None
+        try:
+            result = run(job)
+        except Exception as e:
+            logger.error(f"Unhandled error running job {job}: {e}")
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._forget(run_id)
+
+        if on_done:
+            try:
+                on_done(result)
+            except Exception as e:
+                logger.error(f"Error in completion callback for job {job}: {e}")
+        return result
+
+    def _forget(self, run_id: int):
+        """Drop a finished or cancelled run (caller holds the lock)"""
+        job, _ = self._in_flight.pop(run_id)
+        remaining = self._job_runs.pop(id(job)) - 1
+        if remaining:
+            self._job_runs[id(job)] = remaining
+
+    def is_running(self, job: Any) -> bool:
+        """Check whether a job is queued or running on the pool"""
+        with self._lock:
+            return id(job) in self._job_runs
+
+    def running_count(self, job: Any) -> int:
+        """Number of runs of a job queued or running on the pool"""
+        with self._lock:
+            return self._job_runs.get(id(job), 0)
+
+    def in_flight_jobs(self) -> List[Any]:
+        """Jobs with a run queued or running on the pool (once per run)"""
+        with self._lock:
+            return [job for job, _ in self._in_flight.values()]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get pool utilisation"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queued": len(self._in_flight) - self._active,
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs, drop queued ones and optionally wait for running ones"""
+        with self._lock:
+            self._shutdown = True
+            for run_id, (_, future) in list(self._in_flight.items()):
+                if future.cancel():
+                    self._forget(run_id)
+        self._pool.shutdown(wait=wait)
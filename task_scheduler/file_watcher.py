@@ -0,0 +1,239 @@
+"""
+Change notification for task and helper files
+"""
+
+import ctypes
+import ctypes.util
+from abc import ABC, abstractmethod
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from loguru import logger
+
+
+# Called with the path of a created, modified, deleted or renamed file, or
+# with None when events were lost and everything should be rescanned
+ChangeCallback = Callable[[Optional[Path]], None]
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _load_libc():
+    """Load libc with the inotify calls, or None if unavailable"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher(ABC):
+    """Base class: watches directories for changes to files with a given suffix"""
+
+    backend = "none"
+
+    def __init__(self, directories: List[Path], callback: ChangeCallback, suffix: str = ".py"):
+        self.directories = [Path(d) for d in directories]
+        self.callback = callback
+        self.suffix = suffix
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start watching on a background thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"file-watcher-{self.backend}", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {', '.join(str(d) for d in self.directories)} for changes ({self.backend})")
+
+    def stop(self):
+        """Stop watching"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    @abstractmethod
+    def _run(self):
+        """Report changes until stop() is called (runs on the watcher thread)"""
+
+    def _notify(self, path: Optional[Path]):
+        """Pass a change to the callback, ignoring files with other suffixes"""
+        if path is not None and path.suffix != self.suffix:
+            return
+        try:
+            self.callback(path)
+        except Exception as e:
+            logger.error(f"Error handling change to {path}: {e}")
+
+
+class InotifyWatcher(FileWatcher):
+    """Kernel change notifications via inotify; costs nothing while idle"""
+
+    backend = "inotify"
+
+    def __init__(self, directories: List[Path], callback: ChangeCallback, suffix: str = ".py"):
+        super().__init__(directories, callback, suffix)
+        self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError("inotify is not available on this platform")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: Dict[int, Path] = {}
+        for directory in self.directories:
+            if directory.is_dir():
+                self._add_watch(directory)
+        # Written to by stop() to wake the reader out of select()
+        self._wake_r, self._wake_w = os.pipe()
+
+    def _add_watch(self, directory: Path):
+        """Watch one directory"""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"Cannot watch {directory}: {os.strerror(err)}")
+        self._watches[wd] = directory
+
+    def stop(self):
+        """Stop watching and release the inotify descriptor"""
+        self._stop.set()
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass
+        super().stop()
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _run(self):
+        """Block in select() until the kernel reports events"""
+        while not self._stop.is_set():
+            try:
+                readable, _, _ = select.select([self._fd, self._wake_r], [], [])
+            except (OSError, ValueError):
+                return
+            if self._fd not in readable:
+                continue
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except OSError as e:
+                if e.errno == errno.EAGAIN:
+                    continue
+                logger.error(f"inotify read failed: {e}")
+                return
+            for path, mask in self._parse(data):
+                if mask & IN_Q_OVERFLOW:
+                    logger.warning("inotify event queue overflowed, requesting a full rescan")
+                    self._notify(None)
+                elif mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    logger.warning(f"Watched directory {path} went away, requesting a full rescan")
+                    self._notify(None)
+                elif path is not None:
+                    self._notify(path)
+
+    def _parse(self, data: bytes) -> List[Tuple[Optional[Path], int]]:
+        """Split a read buffer into (path, mask) pairs"""
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None:
+                events.append((None, mask))
+            elif name:
+                events.append((directory / os.fsdecode(name), mask))
+            else:
+                events.append((directory, mask))
+        return events
+
+
+class PollingWatcher(FileWatcher):
+    """Portable fallback: compares directory listings and file stats periodically
+
+    Only ``stat`` is used, so a poll costs one directory listing, never a
+    file read.
+    """
+
+    backend = "poll"
+
+    def __init__(self, directories: List[Path], callback: ChangeCallback, suffix: str = ".py",
+                 interval: float = 5.0):
+        super().__init__(directories, callback, suffix)
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> Dict[Path, Tuple[int, int, int]]:
+        """Map each watched file to (inode, size, mtime_ns)"""
+        snapshot = {}
+        for directory in self.directories:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(self.suffix) and entry.is_file():
+                            st = entry.stat()
+                            snapshot[Path(entry.path)] = (st.st_ino, st.st_size, st.st_mtime_ns)
+            except OSError:
+                continue
+        return snapshot
+
+    def _run(self):
+        """Diff snapshots every interval"""
+        while not self._stop.wait(self.interval):
+            snapshot = self._take_snapshot()
+            for path in snapshot.keys() | self._snapshot.keys():
+                if snapshot.get(path) != self._snapshot.get(path):
+                    self._notify(path)
+            self._snapshot = snapshot
+
+
+def create_watcher(directories: List[Path], callback: ChangeCallback, mode: str = "auto",
+                   poll_interval: float = 5.0) -> FileWatcher:
+    """
+    Create a watcher for the given directories
+
+    Args:
+        directories: Directories whose files should be watched
+        callback: Called with each changed path (None: rescan everything)
+        mode: 'inotify', 'poll', or 'auto' (inotify when available)
+        poll_interval: Seconds between polls for the polling backend
+    """
+    if mode in ("auto", "inotify"):
+        try:
+            return InotifyWatcher(directories, callback)
+        except OSError as e:
+            if mode == "inotify":
+                raise
+            logger.info(f"inotify unavailable ({e}), falling back to polling every {poll_interval}s")
+    return PollingWatcher(directories, callback, interval=poll_interval)
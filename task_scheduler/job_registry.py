@@ -0,0 +1,98 @@
+"""
+Registry of scheduled jobs indexed by task name and by wrapper function
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+class JobRegistry:
+    """
+    Constant-time lookups between tasks, their jobs and their wrappers
+
+    Jobs are registered by the decorators when a task module is executed and
+    unregistered by the scheduler when the task is reloaded or removed, so
+    nothing has to scan ``schedule.jobs`` or match names by suffix. Jobs are
+    stored by identity: CronLikeJob defines ``__eq__`` on next_run and is not
+    hashable.
+    """
+
+    def __init__(self):
+        self._jobs_by_task: Dict[str, List[Any]] = {}
+        self._task_by_func: Dict[Any, str] = {}  # wrapper or job.job_func -> task name
+        self._job_by_wrapper: Dict[Callable, Any] = {}
+        self._registered: Dict[int, Any] = {}  # id(job) -> job
+        self._lock = threading.Lock()
+
+    def register(self, task_name: str, job: Any, wrapper: Callable):
+        """Record a newly scheduled job of a task"""
+        with self._lock:
+            self._jobs_by_task.setdefault(task_name, []).append(job)
+            self._registered[id(job)] = job
+            self._job_by_wrapper[wrapper] = job
+            self._task_by_func[wrapper] = task_name
+            self._task_by_func[job.job_func] = task_name
+
+    def unregister(self, task_name: str, jobs: Optional[List[Any]] = None) -> List[Any]:
+        """Forget some (default: all) jobs of a task and return the ones removed"""
+        with self._lock:
+            current = self._jobs_by_task.get(task_name, [])
+            if jobs is None:
+                removed, kept = current, []
+            else:
+                ids = {id(job) for job in jobs}
+                removed = [job for job in current if id(job) in ids]
+                kept = [job for job in current if id(job) not in ids]
+
+            if kept:
+                self._jobs_by_task[task_name] = kept
+            else:
+                self._jobs_by_task.pop(task_name, None)
+
+            for job in removed:
+                self._registered.pop(id(job), None)
+                self._task_by_func.pop(job.job_func, None)
+                wrapper = getattr(job.job_func, 'func', job.job_func)  # schedule jobs wrap it in a partial
+                self._task_by_func.pop(wrapper, None)
+                if self._job_by_wrapper.get(wrapper) is job:
+                    del self._job_by_wrapper[wrapper]
+            return removed
+
+    def get_jobs(self, task_name: str) -> List[Any]:
+        """Get all jobs of a task"""
+        with self._lock:
+            return list(self._jobs_by_task.get(task_name, []))
+
+    def get_job(self, task_name: str) -> Optional[Any]:
+        """Get the (first) job of a task"""
+        with self._lock:
+            jobs = self._jobs_by_task.get(task_name)
+            return jobs[0] if jobs else None
+
+    def is_registered(self, job: Any) -> bool:
+        """Check whether this job (not just an equal one) is still registered"""
+        return self._registered.get(id(job)) is job
+
+    def get_job_for_wrapper(self, wrapper: Callable) -> Optional[Any]:
+        """Get the job that runs a tracking wrapper"""
+        return self._job_by_wrapper.get(wrapper)
+
+    def get_task_name(self, func: Any) -> Optional[str]:
+        """Get the task a wrapper or job function belongs to"""
+        return self._task_by_func.get(func)
+
+    def get_task_name_for_job(self, job: Any) -> Optional[str]:
+        """Get the task a job belongs to"""
+        return self._task_by_func.get(getattr(job, 'job_func', None))
+
+    def clear(self):
+        """Forget all jobs"""
+        with self._lock:
+            self._jobs_by_task.clear()
+            self._task_by_func.clear()
+            self._job_by_wrapper.clear()
+            self._registered.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._registered)
@@ -0,0 +1,168 @@
+"""
+Write-behind journal for execution and schedule records
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+from .database import DatabaseManager, TaskExecution, TaskSchedule
+
+# Queue marker waking the writer for pending schedule updates
+_SCHEDULES_PENDING = object()
+
+
+class ExecutionJournal:
+    """
+    Buffers TaskExecution and TaskSchedule writes and commits them in batches
+
+    Task threads only enqueue records; a background writer commits everything
+    queued in one transaction once ``batch_size`` records are waiting or
+    ``flush_interval`` seconds have passed since the first of them. The queue
+    of execution records is bounded: when the database cannot keep up, task
+    threads block until there is room again instead of buffering without
+    limit. Schedule updates never block, since the scheduler loop writes
+    them too; they are kept per task, latest wins, and committed with the
+    next batch.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, flush_interval: float = 0.2,
+                 batch_size: int = 100, max_queue: int = 10000):
+        self.db_manager = db_manager
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, int(batch_size))
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._stats = {"written": 0, "batches": 0, "dropped": 0, "backpressure_waits": 0,
+                       "coalesced_schedules": 0}
+        # Latest pending schedule update per task
+        self._schedules: Dict[str, TaskSchedule] = {}
+        self._schedules_lock = threading.Lock()
+        self._closed = False
+        # Commit latency metrics (set by the scheduler)
+        self.metrics = None
+        self._thread = threading.Thread(target=self._writer_loop, name="execution-journal", daemon=True)
+        self._thread.start()
+
+    def record_execution(self, execution: TaskExecution):
+        """Queue an execution record"""
+        self._put(execution)
+
+    def update_task_schedule(self, schedule: TaskSchedule):
+        """Queue a schedule update without blocking, replacing one still pending for the task"""
+        if self._closed:
+            self._write([schedule])
+            return
+        with self._schedules_lock:
+            if schedule.task_name in self._schedules:
+                self._stats["coalesced_schedules"] += 1
+                self._schedules[schedule.task_name] = schedule
+                return
+            self._schedules[schedule.task_name] = schedule
+        try:
+            # Wake the writer; if the queue is full it is busy and commits this with its next batch
+            self._queue.put_nowait(_SCHEDULES_PENDING)
+        except queue.Full:
+            pass
+
+    def _put(self, record: Any):
+        """Enqueue an execution record, blocking while the queue is full"""
+        if self._closed:
+            # Late writes after shutdown go straight to the database
+            self._write([record])
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._stats["backpressure_waits"] += 1
+            logger.warning("Execution journal is full, waiting for the writer to catch up")
+            self._queue.put(record)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far is committed; returns False on timeout"""
+        if self._closed or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0):
+        """Flush pending records and stop the writer thread"""
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _writer_loop(self):
+        """Collect records into batches and commit each batch in one transaction"""
+        while True:
+            item = self._queue.get()
+            batch: List[Any] = []
+            waiters: List[threading.Event] = []
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    # Flush request: commit now
+                    waiters.append(item)
+                    break
+                if item is not _SCHEDULES_PENDING:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            batch.extend(self._take_schedules())
+            if batch:
+                self._write(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _take_schedules(self) -> List[TaskSchedule]:
+        """Remove and return the pending schedule updates"""
+        with self._schedules_lock:
+            schedules = list(self._schedules.values())
+            self._schedules.clear()
+        return schedules
+
+    def _write(self, batch: List[Any]):
+        """Commit a batch of records"""
+        executions = [r for r in batch if isinstance(r, TaskExecution)]
+        # Only the latest schedule per task matters
+        schedules: Dict[str, TaskSchedule] = {}
+        for record in batch:
+            if isinstance(record, TaskSchedule):
+                schedules[record.task_name] = record
+        try:
+            start = time.perf_counter()
+            self.db_manager.write_batch(executions, list(schedules.values()))
+            if self.metrics:
+                self.metrics.db_write.observe(time.perf_counter() - start)
+            self._stats["written"] += len(batch)
+            self._stats["batches"] += 1
+        except Exception as e:
+            self._stats["dropped"] += len(batch)
+            logger.error(f"Failed to write {len(batch)} journal records: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get journal statistics"""
+        with self._schedules_lock:
+            pending_schedules = len(self._schedules)
+        return {"queued": self._queue.qsize(), "pending_schedules": pending_schedules, **self._stats}
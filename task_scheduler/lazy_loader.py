@@ -0,0 +1,166 @@
+"""
+On-demand loading and idle eviction of task modules
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+from loguru import logger
+
+from . import clock
+from .decorators import suppress_registration
+from .job_registry import JobRegistry
+from .memory_manager import TaskModuleManager
+
+
+@dataclass
+class LazyTask:
+    """What is needed to bring an evicted task module back"""
+    path: Path
+    content: str
+    first_line: int
+    last_used: float
+    resident: bool = True
+
+
+class LazyModuleLoader:
+    """
+    Keeps only the schedule declarations of rarely-run tasks in memory
+
+    A task is executed once when it is loaded, which registers its jobs.
+    After ``idle_timeout`` seconds without a run its module is evicted
+    (least recently used first): the jobs stay scheduled, but their wrappers
+    drop the task functions and the module namespace is torn down. The
+    scheduler loads it again shortly before the next run (``ensure_loaded``),
+    re-executing the module with registration suppressed and rebinding the
+    wrappers to the fresh functions; a run that finds its module still
+    evicted (e.g. a triggered one) loads it itself.
+    """
+
+    def __init__(self, module_manager: TaskModuleManager, job_registry: JobRegistry,
+                 idle_timeout: float = 3600, max_resident: int = 0):
+        self.module_manager = module_manager
+        self.job_registry = job_registry
+        self.idle_timeout = idle_timeout
+        self.max_resident = max_resident  # 0: no limit
+        self._tasks: "OrderedDict[str, LazyTask]" = OrderedDict()  # Least recently used first
+        self._evicted: Set[str] = set()
+        self._lock = threading.RLock()
+        self._stats = {"evictions": 0, "loads": 0, "load_failures": 0}
+        # Load time metrics (set by the scheduler)
+        self.metrics = None
+
+    def track(self, task_name: str, path: Path, content: str, first_line: int = 1):
+        """Record a freshly loaded (resident) task"""
+        with self._lock:
+            self._tasks[task_name] = LazyTask(path, content, first_line, clock.time())
+            self._tasks.move_to_end(task_name)
+
+    def forget(self, task_name: str):
+        """Stop tracking an unloaded task"""
+        with self._lock:
+            self._tasks.pop(task_name, None)
+            self._evicted.discard(task_name)
+
+    def ensure_loaded(self, task_name: str) -> bool:
+        """Mark a task as used, loading its module first if it was evicted"""
+        with self._lock:
+            task = self._tasks.get(task_name)
+            if task is None:
+                return True  # Not managed here
+            task.last_used = clock.time()
+            self._tasks.move_to_end(task_name)
+            if task.resident:
+                return True
+            return self._load(task_name, task)
+
+    def _load(self, task_name: str, task: LazyTask) -> bool:
+        """Re-execute an evicted module and rebind its jobs (caller holds the lock)"""
+        start = time.perf_counter()
+        with suppress_registration():
+            module = self.module_manager.load_task_module(task.path, task.content, force_reload=True,
+                                                          first_line=task.first_line)
+        if module is None:
+            self._stats["load_failures"] += 1
+            logger.error(f"Failed to reload evicted task {task_name}")
+            return False
+
+        for job in self.job_registry.get_jobs(task_name):
+            wrapper = self._wrapper(job)
+            fresh = getattr(module, wrapper.__name__, None)
+            if fresh is None:
+                logger.error(f"Evicted task {task_name} no longer defines {wrapper.__name__}")
+                continue
+            wrapper._original_func = getattr(fresh, '_original_func', fresh)
+
+        task.resident = True
+        self._evicted.discard(task_name)
+        self._stats["loads"] += 1
+        elapsed = time.perf_counter() - start
+        if self.metrics:
+            self.metrics.task_load.observe(elapsed, task=task_name, reason="lazy")
+        logger.debug(f"Loaded evicted task {task_name} in {elapsed * 1000:.1f}ms")
+        return True
+
+    def evict_idle(self, is_busy: Callable[[str], bool], force: bool = False) -> List[str]:
+        """
+        Evict modules idle for longer than idle_timeout, plus the least
+        recently used ones beyond max_resident
+
+        Args:
+            is_busy: True for tasks that must stay loaded (running, queued or
+                with a retry pending)
+            force: Evict every task that is not busy (memory pressure)
+
+        Returns:
+            Names of the evicted tasks
+        """
+        now = clock.time()
+        evicted = []
+        with self._lock:
+            resident = [name for name, task in self._tasks.items() if task.resident]
+            excess = len(resident) - self.max_resident if self.max_resident else 0
+            for task_name in resident:  # Least recently used first
+                task = self._tasks[task_name]
+                idle = now - task.last_used >= self.idle_timeout
+                if not (force or idle or excess > 0) or is_busy(task_name):
+                    continue
+                self._evict(task_name, task)
+                evicted.append(task_name)
+                excess -= 1
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} idle task module(s): {', '.join(evicted)}")
+        return evicted
+
+    def _evict(self, task_name: str, task: LazyTask):
+        """Drop a task's functions and retire its module (caller holds the lock)"""
+        for job in self.job_registry.get_jobs(task_name):
+            self._wrapper(job)._original_func = None
+        self.module_manager.evict_task_module(task.path)
+        task.resident = False
+        self._evicted.add(task_name)
+        self._stats["evictions"] += 1
+
+    @staticmethod
+    def _wrapper(job) -> Callable:
+        return getattr(job.job_func, 'func', job.job_func)  # schedule jobs wrap it in a partial
+
+    def evicted_tasks(self) -> List[str]:
+        """Names of the tasks whose module is currently evicted"""
+        with self._lock:
+            return list(self._evicted)
+
+    def is_resident(self, task_name: str) -> Optional[bool]:
+        """Whether a task's module is loaded (None if not tracked)"""
+        with self._lock:
+            task = self._tasks.get(task_name)
+            return task.resident if task else None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get residency statistics"""
+        with self._lock:
+            resident = sum(1 for task in self._tasks.values() if task.resident)
+            return {"tracked": len(self._tasks), "resident": resident, **self._stats}
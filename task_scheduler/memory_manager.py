@@ -3,16 +3,23 @@ Memory management and module reloading for long-running task scheduler
 """
 
 import gc
+import math
 import sys
 import psutil
 import importlib
 import importlib.util
+import itertools
 import threading
-from typing import Dict, Set, Optional, Any
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Set, Optional, Any, Tuple
 from pathlib import Path
 import time
 from loguru import logger
 
+from .bytecode_cache import BytecodeCache
+
 
 class MemoryManager:
     """Manages memory usage and module reloading for long-running processes"""
@@ -105,17 +112,36 @@ class MemoryManager:
 
 
 class TaskModuleManager:
-    """Manages loading and reloading of task modules"""
+    """Manages loading and reloading of task modules
+
+    A module replaced by a reload or unloaded is retired: once nothing may
+    still be executing it, its namespace is cleared, which breaks the
+    function/globals reference cycles so its data is freed immediately. A
+    weak reference is kept to each torn-down module, and one that is still
+    alive afterwards is reported as leaked.
+    """
     
-    def __init__(self):
+    def __init__(self, bytecode_cache: Optional[BytecodeCache] = None):
         self._loaded_tasks: Dict[str, Any] = {}
         self._task_timestamps: Dict[str, float] = {}
         self._lock = threading.Lock()
+        self.bytecode_cache = bytecode_cache or BytecodeCache()
+        # Module names are task_<stem>_<generation>, unique within the process
+        self._generation = itertools.count(1)
+        self._retiring: List[Any] = []  # Replaced modules waiting for their last run to finish
+        self._released: List[Tuple[weakref.ref, str, float]] = []  # (module, name, teardown time)
+        self._stats = {"retired": 0, "torn_down": 0, "collected": 0}
     
-    def load_task_module(self, task_file_path: Path, task_content: str = None, force_reload: bool = False) -> Optional[Any]:
-        """Load or reload a task module"""
+    def load_task_module(self, task_file_path: Path, task_content: str = None, force_reload: bool = False,
+                         first_line: int = 1) -> Optional[Any]:
+        """Load or reload a task module
+
+        ``first_line`` is the line of the file ``task_content`` starts on, so
+        tracebacks point at the right line of the task file.
+        """
         try:
-            module_name = f"task_{task_file_path.stem}_{int(time.time())}"
+            module = None
+            module_name = f"task_{task_file_path.stem}_{next(self._generation)}"
             file_timestamp = task_file_path.stat().st_mtime
 
             with self._lock:
@@ -132,31 +158,45 @@ class TaskModuleManager:
                     return None
 
                 module = importlib.util.module_from_spec(spec)
+                module.__file__ = str(task_file_path)
 
                 # If task_content is provided, use it; otherwise read from file
                 if task_content is None:
                     with open(task_file_path, 'r', encoding='utf-8') as f:
                         code_content = f.read()
+                    first_line = 1
                 else:
                     code_content = task_content
 
-                # Execute the module code
-                exec(code_content, module.__dict__)
+                # Execute the module code, compiled once per content
+                code = self.bytecode_cache.get_code(code_content, str(task_file_path), first_line)
+                exec(code, module.__dict__)
 
                 # Verify the module has a start function
                 if not hasattr(module, 'start'):
                     logger.error(f"Task module {task_file_path} does not have a 'start' function")
+                    self._retiring.append(module)
+                    self._stats["retired"] += 1
                     return None
 
-                # Cache the module
+                # Cache the module; the version it replaces is retired
+                previous = self._loaded_tasks.get(str(task_file_path))
+                if previous is not None:
+                    self._retiring.append(previous)
+                    self._stats["retired"] += 1
                 self._loaded_tasks[str(task_file_path)] = module
                 self._task_timestamps[str(task_file_path)] = file_timestamp
 
-                logger.debug(f"Loaded task module: {task_file_path}")
+                logger.debug(f"Loaded task module: {task_file_path} as {module_name}")
                 return module
                 
         except Exception as e:
             logger.error(f"Failed to load task module {task_file_path}: {e}")
+            if module is not None:
+                # Half-executed: it may have scheduled jobs before failing
+                with self._lock:
+                    self._retiring.append(module)
+                    self._stats["retired"] += 1
             return None
     
     def unload_task_module(self, task_file_path: Path):
@@ -164,12 +204,30 @@ class TaskModuleManager:
         with self._lock:
             path_str = str(task_file_path)
             if path_str in self._loaded_tasks:
-                del self._loaded_tasks[path_str]
+                self._retiring.append(self._loaded_tasks.pop(path_str))
+                self._stats["retired"] += 1
             if path_str in self._task_timestamps:
                 del self._task_timestamps[path_str]
+            self.bytecode_cache.discard(path_str)
             
             logger.debug(f"Unloaded task module: {task_file_path}")
     
+    def evict_task_module(self, task_file_path: Path) -> bool:
+        """Retire a task's module but remember the file as loaded (lazy loading)
+
+        Unlike unload_task_module the file timestamp is kept, so an evicted
+        task is not mistaken for a changed one by check_for_changes.
+        """
+        with self._lock:
+            path_str = str(task_file_path)
+            module = self._loaded_tasks.pop(path_str, None)
+            if module is None:
+                return False
+            self._retiring.append(module)
+            self._stats["retired"] += 1
+            self.bytecode_cache.discard(path_str)
+            return True
+
     def reload_task_module(self, task_file_path: Path) -> Optional[Any]:
         """Force reload a task module"""
         self.unload_task_module(task_file_path)
@@ -195,77 +253,275 @@ class TaskModuleManager:
     def cleanup_all_modules(self):
         """Unload all task modules"""
         with self._lock:
+            self._retiring.extend(self._loaded_tasks.values())
+            self._stats["retired"] += len(self._loaded_tasks)
             self._loaded_tasks.clear()
             self._task_timestamps.clear()
             logger.info("Cleared all loaded task modules")
 
+    def release_retired_modules(self, in_use: Optional[Callable[[Any], bool]] = None) -> int:
+        """
+        Tear down retired modules that are no longer in use
+
+        Args:
+            in_use: Called with a retired module; True keeps it for a later call
+                (e.g. while a run of its code is queued or in progress)
+
+        Returns:
+            Number of modules torn down
+        """
+        with self._lock:
+            retiring, self._retiring = self._retiring, []
+
+        kept = []
+        released = []
+        for module in retiring:
+            if in_use is not None and in_use(module):
+                kept.append(module)
+                continue
+            name = module.__name__
+            module.__dict__.clear()
+            released.append((weakref.ref(module), name, time.time()))
+
+        with self._lock:
+            self._retiring.extend(kept)
+            self._released.extend(released)
+            self._stats["torn_down"] += len(released)
+        if released:
+            logger.debug(f"Tore down {len(released)} retired task module(s)")
+        return len(released)
+
+    def find_leaked_modules(self, min_age: float = 0) -> List[str]:
+        """
+        Names of torn-down modules that are still referenced somewhere
+
+        Call after a garbage collection. Collected modules are forgotten;
+        ``min_age`` (seconds since teardown) skips modules that may simply
+        not have been collected yet.
+        """
+        now = time.time()
+        leaked = []
+        with self._lock:
+            alive = []
+            for ref, name, released_at in self._released:
+                if ref() is None:
+                    self._stats["collected"] += 1
+                    continue
+                alive.append((ref, name, released_at))
+                if now - released_at >= min_age:
+                    leaked.append(name)
+            self._released = alive
+        return leaked
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get module lifecycle statistics"""
+        with self._lock:
+            return {
+                "loaded": len(self._loaded_tasks),
+                "retiring": len(self._retiring),
+                "torn_down_alive": len(self._released),
+                **self._stats
+            }
+
+
+@dataclass(frozen=True)
+class ResourceSample:
+    """System and process metrics at one point in time"""
+    timestamp: float
+    cpu_percent: float
+    memory_percent: float
+    memory_available_mb: float
+    memory_used_mb: float
+    disk_percent: float
+    disk_free_gb: float
+    process_rss_mb: float
+    process_vms_mb: float
+    process_cpu_percent: float
+    process_threads: int
+
 
 class ResourceMonitor:
-    """Monitors system resources and triggers cleanup when needed"""
-    
-    def __init__(self, memory_manager: MemoryManager, check_interval: int = 60):
+    """
+    Samples system resources in the background and triggers cleanup when needed
+
+    Every ``sample_interval`` seconds a sample is appended to a ring buffer
+    holding the last 15 minutes, and the snapshot served by
+    ``get_system_stats`` (latest values plus 1m/5m/15m aggregates) is rebuilt,
+    so readers never wait on psutil. CPU percentages are computed from the
+    CPU time consumed between two samples rather than by sleeping.
+    """
+
+    WINDOWS = {"1m": 60, "5m": 300, "15m": 900}
+
+    def __init__(self, memory_manager: MemoryManager, check_interval: int = 60,
+                 sample_interval: float = 5, disk_path: str = '/'):
         self.memory_manager = memory_manager
         self.check_interval = check_interval
-        self._monitoring = False
+        self.sample_interval = sample_interval
+        self.disk_path = disk_path
+        self._samples: deque = deque(maxlen=max(1, math.ceil(max(self.WINDOWS.values()) / sample_interval)))
+        self._snapshot: Dict[str, Any] = {}
+        self._memory_total_mb = psutil.virtual_memory().total / 1024 / 1024
+        self._disk_total_gb = 0.0
+        self._last_cpu: Optional[Tuple[float, float, float]] = None  # (busy, total, process)
+        self._last_sample_at = 0.0
+        self._sampler_cpu_seconds = 0.0
+        self._started_at = time.monotonic()
+        self._stop_event = threading.Event()
         self._monitor_thread: Optional[threading.Thread] = None
-    
+
     def start_monitoring(self):
         """Start resource monitoring in background thread"""
-        if self._monitoring:
+        if self._monitor_thread and self._monitor_thread.is_alive():
             return
-        
-        self._monitoring = True
-        self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
+
+        self._stop_event.clear()
+        self._started_at = time.monotonic()
+        self._monitor_thread = threading.Thread(target=self._monitor_loop, name="resource-monitor", daemon=True)
         self._monitor_thread.start()
         logger.info("Started resource monitoring")
-    
+
     def stop_monitoring(self):
         """Stop resource monitoring"""
-        self._monitoring = False
+        self._stop_event.set()
         if self._monitor_thread:
             self._monitor_thread.join(timeout=5)
+            self._monitor_thread = None
         logger.info("Stopped resource monitoring")
-    
+
     def _monitor_loop(self):
         """Main monitoring loop"""
-        while self._monitoring:
+        next_check = time.monotonic() + self.check_interval
+        while not self._stop_event.is_set():
+            started = time.thread_time()
             try:
-                # Check memory usage
-                if self.memory_manager.is_memory_usage_high():
-                    logger.warning("High memory usage detected, triggering cleanup")
-                    self.memory_manager.cleanup_memory()
-                
-                # Sleep until next check
-                time.sleep(self.check_interval)
-                
+                self.sample()
+
+                now = time.monotonic()
+                if now >= next_check:
+                    next_check = now + self.check_interval
+                    if self.memory_manager.is_memory_usage_high():
+                        logger.warning("High memory usage detected, triggering cleanup")
+                        self.memory_manager.cleanup_memory()
+
             except Exception as e:
                 logger.error(f"Error in resource monitoring loop: {e}")
-                time.sleep(self.check_interval)
-    
-    def get_system_stats(self) -> Dict[str, Any]:
-        """Get comprehensive system statistics"""
+            self._sampler_cpu_seconds += time.thread_time() - started
+            self._stop_event.wait(self.sample_interval)
+
+    def _cpu_counters(self) -> Tuple[float, float, float]:
+        """Busy and total system CPU seconds, and CPU seconds used by this process"""
+        times = psutil.cpu_times()
+        total = sum(times)
+        idle = times.idle + getattr(times, 'iowait', 0.0)
+        process = self.memory_manager.process.cpu_times()
+        return total - idle, total, process.user + process.system
+
+    def sample(self) -> Optional[ResourceSample]:
+        """Take a sample, add it to the ring buffer and rebuild the snapshot"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            now = time.time()
+            busy, total, process_cpu = self._cpu_counters()
+            cpu_percent = process_cpu_percent = 0.0
+            if self._last_cpu is not None:
+                last_busy, last_total, last_process = self._last_cpu
+                elapsed = now - self._last_sample_at
+                if total > last_total:
+                    cpu_percent = (busy - last_busy) / (total - last_total) * 100
+                if elapsed > 0:
+                    process_cpu_percent = (process_cpu - last_process) / elapsed * 100
+            self._last_cpu = (busy, total, process_cpu)
+            self._last_sample_at = now
+
             memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            
-            return {
-                "cpu_percent": cpu_percent,
-                "memory": {
-                    "total_mb": memory.total / 1024 / 1024,
-                    "available_mb": memory.available / 1024 / 1024,
-                    "used_mb": memory.used / 1024 / 1024,
-                    "percent": memory.percent
-                },
-                "disk": {
-                    "total_gb": disk.total / 1024 / 1024 / 1024,
-                    "free_gb": disk.free / 1024 / 1024 / 1024,
-                    "used_gb": disk.used / 1024 / 1024 / 1024,
-                    "percent": (disk.used / disk.total) * 100
-                },
-                "process_memory": self.memory_manager.get_memory_usage()
-            }
-            
+            disk = psutil.disk_usage(self.disk_path)
+            process = self.memory_manager.process
+            with process.oneshot():
+                memory_info = process.memory_info()
+                threads = process.num_threads()
+
+            self._memory_total_mb = memory.total / 1024 / 1024
+            self._disk_total_gb = disk.total / 1024 / 1024 / 1024
+            sample = ResourceSample(
+                timestamp=now,
+                cpu_percent=round(max(cpu_percent, 0.0), 1),
+                memory_percent=memory.percent,
+                memory_available_mb=memory.available / 1024 / 1024,
+                memory_used_mb=memory.used / 1024 / 1024,
+                disk_percent=(disk.used / disk.total) * 100 if disk.total else 0.0,
+                disk_free_gb=disk.free / 1024 / 1024 / 1024,
+                process_rss_mb=memory_info.rss / 1024 / 1024,
+                process_vms_mb=memory_info.vms / 1024 / 1024,
+                process_cpu_percent=round(max(process_cpu_percent, 0.0), 1),
+                process_threads=threads
+            )
         except Exception as e:
-            logger.error(f"Failed to get system stats: {e}")
-            return {}
+            logger.error(f"Failed to sample system resources: {e}")
+            return None
+
+        self._samples.append(sample)
+        self._snapshot = self._build_snapshot(sample)  # Replaced whole, readers need no lock
+        return sample
+
+    def get_samples(self, window: Optional[float] = None) -> List[ResourceSample]:
+        """Get the buffered samples, optionally only those from the last ``window`` seconds"""
+        samples = list(self._samples)
+        if window is None or not samples:
+            return samples
+        cutoff = samples[-1].timestamp - window
+        return [sample for sample in samples if sample.timestamp > cutoff]
+
+    def get_window_stats(self, window: float) -> Dict[str, Any]:
+        """Average and peak values over the last ``window`` seconds"""
+        samples = self.get_samples(window)
+        if not samples:
+            return {"samples": 0}
+
+        stats: Dict[str, Any] = {"samples": len(samples)}
+        for field in ("cpu_percent", "process_cpu_percent", "memory_percent", "process_rss_mb"):
+            values = [getattr(sample, field) for sample in samples]
+            stats[field] = {"avg": round(sum(values) / len(values), 1), "max": round(max(values), 1)}
+        stats["disk_free_gb"] = {"min": round(min(sample.disk_free_gb for sample in samples), 2)}
+        return stats
+
+    def _build_snapshot(self, sample: ResourceSample) -> Dict[str, Any]:
+        """Assemble what get_system_stats returns from the latest sample"""
+        uptime = time.monotonic() - self._started_at
+        return {
+            "sampled_at": sample.timestamp,
+            "cpu_percent": sample.cpu_percent,
+            "memory": {
+                "total_mb": self._memory_total_mb,
+                "available_mb": sample.memory_available_mb,
+                "used_mb": sample.memory_used_mb,
+                "percent": sample.memory_percent
+            },
+            "disk": {
+                "total_gb": self._disk_total_gb,
+                "free_gb": sample.disk_free_gb,
+                "used_gb": self._disk_total_gb - sample.disk_free_gb,
+                "percent": sample.disk_percent
+            },
+            "process_memory": {
+                "rss_mb": sample.process_rss_mb,
+                "vms_mb": sample.process_vms_mb,
+                "percent": sample.process_rss_mb / self._memory_total_mb * 100 if self._memory_total_mb else 0.0,
+                "available_mb": sample.memory_available_mb
+            },
+            "process": {
+                "cpu_percent": sample.process_cpu_percent,
+                "threads": sample.process_threads
+            },
+            "windows": {name: self.get_window_stats(seconds) for name, seconds in self.WINDOWS.items()},
+            "monitor": {
+                "sample_interval": self.sample_interval,
+                "samples": len(self._samples),
+                "cpu_percent": round(self._sampler_cpu_seconds / uptime * 100, 4) if uptime > 0 else 0.0
+            }
+        }
+
+    def get_system_stats(self) -> Dict[str, Any]:
+        """Get the latest system statistics without blocking"""
+        if not self._snapshot:
+            self.sample()  # Not started yet: take one sample now (CPU percentages read 0)
+        return self._snapshot
@@ -0,0 +1,88 @@
+"""
+Graduated response to high memory usage
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+import psutil
+from loguru import logger
+
+from .memory_manager import MemoryManager
+
+
+@dataclass
+class PressureTier:
+    """One step of the response, from cheapest to most disruptive"""
+    name: str
+    action: Callable[[], Any]
+
+
+class MemoryPressureResponder:
+    """
+    Runs increasingly expensive tiers until memory usage is back under the limit
+
+    The limit is ``MemoryManager.max_memory_mb`` for the scheduler process.
+    What each tier reclaimed is measured over the whole process tree, so
+    recycling worker processes is credited too. If every tier has run and
+    usage is still high, a restart is requested. After a response, further
+    ones wait for ``cooldown`` seconds so a process hovering at the limit is
+    not collected over and over.
+    """
+
+    def __init__(self, memory_manager: MemoryManager, tiers: List[PressureTier], cooldown: float = 60):
+        self.memory_manager = memory_manager
+        self.tiers = tiers
+        self.cooldown = cooldown
+        self._last_response = 0.0
+        self.last_report: List[Dict[str, Any]] = []
+        self._stats = {"responses": 0, "restarts_requested": 0}
+
+    def _tree_rss_mb(self) -> float:
+        """RSS of the scheduler and its child processes in MB"""
+        process = self.memory_manager.process
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / 1024 / 1024
+
+    def respond(self, now: Optional[float] = None) -> bool:
+        """
+        Relieve memory pressure
+
+        Returns:
+            True if all tiers ran and usage is still above the limit (restart)
+        """
+        now = time.time() if now is None else now
+        if now - self._last_response < self.cooldown:
+            return False
+        self._last_response = now
+        self._stats["responses"] += 1
+
+        report = []
+        before = self._tree_rss_mb()
+        for tier in self.tiers:
+            try:
+                tier.action()
+            except Exception as e:
+                logger.error(f"Memory pressure tier '{tier.name}' failed: {e}")
+            after = self._tree_rss_mb()
+            report.append({"tier": tier.name, "reclaimed_mb": round(before - after, 1), "rss_mb": round(after, 1)})
+            logger.info(f"Memory pressure tier '{tier.name}' reclaimed {before - after:.1f} MB "
+                        f"(process tree now {after:.1f} MB)")
+            before = after
+            if not self.memory_manager.is_memory_usage_high():
+                self.last_report = report
+                return False
+
+        self.last_report = report
+        self._stats["restarts_requested"] += 1
+        logger.warning("Memory usage still above the limit after all pressure tiers, restart needed")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get response statistics and the tiers run by the last response"""
+        return {**self._stats, "last_report": self.last_report}
@@ -0,0 +1,307 @@
+"""
+Pool of long-lived worker processes that run tasks inside the managed virtualenv
+"""
+
+import itertools
+import json
+import os
+import queue
+import select
+import signal
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import psutil
+from loguru import logger
+
+from .cancellation import TaskTimeoutError
+
+
+class TaskExecutionError(Exception):
+    """Raised when a task run in a worker process fails"""
+
+    def __init__(self, message: str, remote_traceback: Optional[str] = None):
+        super().__init__(message)
+        self.remote_traceback = remote_traceback
+
+
+class WorkerError(Exception):
+    """Raised when a worker process dies or stops responding"""
+
+
+class ProcessWorker:
+    """A single worker process speaking JSON lines over its stdin/stdout"""
+
+    def __init__(self, python_executable: str, cwd: Path, env: Optional[Dict[str, str]] = None,
+                 startup_timeout: float = 30.0):
+        self.process = subprocess.Popen(
+            [python_executable, "-m", "task_scheduler.worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=str(cwd),
+            env=env,
+            start_new_session=True  # Own process group, so the whole tree can be killed
+        )
+        self.pid = self.process.pid
+        self.tasks_run = 0
+        self._buffer = b""
+
+        ready = self._read_message(startup_timeout)
+        if not ready.get("ready"):
+            self.kill()
+            raise WorkerError(f"Worker {self.pid} sent an unexpected handshake: {ready}")
+
+    def call(self, request: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a request and wait for its response"""
+        try:
+            self.process.stdin.write((json.dumps(request) + "\n").encode())
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerError(f"Worker {self.pid} is not accepting requests: {e}")
+
+        response = self._read_message(timeout)
+        self.tasks_run += 1
+        return response
+
+    def _read_message(self, timeout: Optional[float]) -> Dict[str, Any]:
+        """Read one JSON line from the worker, honouring the timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        fd = self.process.stdout.fileno()
+
+        while b"\n" not in self._buffer:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError(f"Worker {self.pid} did not respond within {timeout}s")
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if not readable:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise WorkerError(f"Worker {self.pid} exited with code {self.process.poll()}")
+            self._buffer += chunk
+
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def is_alive(self) -> bool:
+        """Check whether the worker process is still running"""
+        return self.process.poll() is None
+
+    def close(self, timeout: float = 5.0):
+        """Ask the worker to exit by closing its stdin"""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=timeout)
+        except (subprocess.TimeoutExpired, OSError):
+            self.kill()
+
+    def kill(self, grace_period: float = 0.0):
+        """Kill the worker and every process it spawned"""
+        kill_process_tree(self.pid, grace_period)
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            pass
+
+
+def kill_process_tree(pid: int, grace_period: float = 0.0):
+    """Kill a process and every process it spawned
+
+    The process's group is signalled too (processes started with
+    ``start_new_session=True`` lead their own), which reaches descendants
+    that were re-parented before psutil could list them. With a grace period
+    the tree gets SIGTERM first and SIGKILL only if it is still alive
+    afterwards.
+    """
+    try:
+        root = psutil.Process(pid)
+        procs = root.children(recursive=True) + [root]
+    except psutil.Error:
+        procs = []
+
+    if grace_period > 0:
+        _signal_tree(pid, procs, signal.SIGTERM)
+        _, procs = psutil.wait_procs(procs, timeout=grace_period)
+
+    _signal_tree(pid, procs, signal.SIGKILL)
+    psutil.wait_procs(procs, timeout=5)
+
+
+def _signal_tree(pid: int, procs: List[psutil.Process], sig: int):
+    """Signal a process group and any descendants that left it"""
+    try:
+        os.killpg(pid, sig)
+    except OSError:
+        pass
+    for proc in procs:
+        try:
+            proc.send_signal(sig)
+        except psutil.Error:
+            pass
+
+
+class ProcessWorkerPool:
+    """
+    Runs task functions in a pool of long-lived worker processes
+
+    Workers are started lazily from the virtualenv interpreter with the
+    helpers pre-imported, so each run avoids interpreter start-up while tasks
+    stay isolated from the scheduler and from each other's memory growth.
+    Workers are recycled after ``max_tasks_per_worker`` runs.
+    """
+
+    def __init__(self, python_executable: str, cwd: Path, size: int = 2,
+                 max_tasks_per_worker: int = 100, env: Optional[Dict[str, str]] = None,
+                 kill_grace_period: float = 5.0):
+        self.python_executable = python_executable
+        self.cwd = Path(cwd)
+        self.size = max(1, int(size))
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.env = env
+        self.kill_grace_period = kill_grace_period
+        self._idle: "queue.Queue[ProcessWorker]" = queue.Queue()
+        self._workers: List[ProcessWorker] = []
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._closed = False
+        self._stats = {"runs": 0, "failures": 0, "timeouts": 0, "workers_started": 0, "workers_recycled": 0}
+
+    def run(self, task_name: str, task_path: str, function_name: str,
+            timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run a task function in a worker process and wait for the outcome
+
+        Returns:
+            The worker's response with status, duration, pid and peak_rss_mb
+
+        Raises:
+            TaskExecutionError: If the task raised or the worker died
+            TaskTimeoutError: If the run exceeded ``timeout``; the worker and
+                its whole process tree are killed
+        """
+        request = {
+            "id": next(self._request_ids),
+            "task_name": task_name,
+            "path": str(task_path),
+            "function": function_name,
+        }
+
+        worker = self._acquire()
+        healthy = False
+        try:
+            response = worker.call(request, timeout)
+            healthy = True
+        except WorkerError as e:
+            self._stats["failures"] += 1
+            raise TaskExecutionError(f"Worker process failed while running {task_name}: {e}")
+        except TimeoutError:
+            self._stats["timeouts"] += 1
+            logger.warning(f"Task {task_name} timed out after {timeout}s, killing worker {worker.pid} and its children")
+            worker.kill(self.kill_grace_period)
+            raise TaskTimeoutError(f"Task {task_name} timed out after {timeout}s")
+        finally:
+            self._release(worker, healthy)
+
+        self._stats["runs"] += 1
+        if response.get("status") != "success":
+            self._stats["failures"] += 1
+            raise TaskExecutionError(response.get("error") or "Task failed", response.get("traceback"))
+        return response
+
+    def _acquire(self) -> ProcessWorker:
+        """Check out an idle worker, starting one if the pool is not full"""
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                worker = None
+                with self._lock:
+                    if self._closed:
+                        raise TaskExecutionError("Process pool is shut down")
+                    can_start = len(self._workers) < self.size
+                    if can_start:
+                        # Reserve the slot before the (slow) process start
+                        self._workers.append(None)
+                if can_start:
+                    return self._start_worker()
+                try:
+                    # Time out now and then in case a busy worker died and freed its slot
+                    worker = self._idle.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+
+            if worker.is_alive():
+                return worker
+            self._discard(worker)
+
+    def _start_worker(self) -> ProcessWorker:
+        """Start a worker process in a reserved slot"""
+        try:
+            worker = ProcessWorker(self.python_executable, self.cwd, self.env)
+        except Exception as e:
+            with self._lock:
+                self._workers.remove(None)
+            raise TaskExecutionError(f"Failed to start worker process: {e}")
+
+        with self._lock:
+            self._workers[self._workers.index(None)] = worker
+            self._stats["workers_started"] += 1
+        logger.debug(f"Started task worker process {worker.pid}")
+        return worker
+
+    def _release(self, worker: ProcessWorker, healthy: bool):
+        """Return a worker to the pool, or retire it if it is spent or broken"""
+        if not healthy or not worker.is_alive():
+            worker.kill()
+            self._discard(worker)
+        elif self._closed or worker.tasks_run >= self.max_tasks_per_worker:
+            worker.close()
+            self._discard(worker)
+            self._stats["workers_recycled"] += 1
+        else:
+            self._idle.put(worker)
+
+    def _discard(self, worker: ProcessWorker):
+        """Forget a worker so its slot can be refilled"""
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+
+    def recycle(self) -> int:
+        """Stop all idle workers; fresh ones are started on demand"""
+        recycled = 0
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.close()
+            self._discard(worker)
+            recycled += 1
+        self._stats["workers_recycled"] += recycled
+        return recycled
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        with self._lock:
+            workers = [w for w in self._workers if w is not None]
+        return {
+            "size": self.size,
+            "workers": len(workers),
+            "idle": self._idle.qsize(),
+            "worker_pids": [w.pid for w in workers],
+            **self._stats,
+        }
+
+    def shutdown(self):
+        """Stop all worker processes"""
+        with self._lock:
+            self._closed = True
+        self.recycle()
+        with self._lock:
+            remaining = [w for w in self._workers if w is not None]
+        for worker in remaining:
+            worker.kill()
+            self._discard(worker)
@@ -0,0 +1,116 @@
+"""
+Retries of failed task runs as one-shot timers
+"""
+
+import random
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from loguru import logger
+
+from . import clock
+
+
+class RetryJob:
+    """
+    A single retry attempt waiting in the timer queue
+
+    Looks like a job to the main loop (``next_run`` and ``run()``) but is
+    never rescheduled: once it has run it is gone.
+    """
+
+    one_shot = True
+
+    def __init__(self, task_name: str, attempt: int, next_run: datetime, run_func: Callable[[], Any],
+                 task_func: Optional[Callable] = None):
+        self.task_name = task_name
+        self.attempt = attempt
+        self.next_run = next_run
+        self.run_func = run_func
+        # The task function the attempt calls, whose module must outlive it
+        self.task_func = task_func
+
+    def run(self):
+        """Run the attempt; its outcome is recorded by the tracking wrapper"""
+        try:
+            return self.run_func()
+        except Exception as e:
+            logger.debug(f"Retry {self.attempt} of task {self.task_name} failed: {e}")
+            return None
+
+    def __str__(self):
+        return f"Retry {self.attempt} of {self.task_name} (next run: {self.next_run})"
+
+
+class RetryScheduler:
+    """
+    Schedules retries of failed runs on the timer queue
+
+    Waiting for a retry costs a heap entry, not a sleeping thread. The delay
+    before attempt ``n`` is ``retry_delay * backoff_factor ** (n - 1)``,
+    capped at ``max_delay`` and spread by +/- ``jitter`` (a fraction) so that
+    tasks failing together do not retry in lockstep.
+    """
+
+    def __init__(self, timer_queue, backoff_factor: float = 2.0, max_delay: float = 3600,
+                 jitter: float = 0.1):
+        self.timer_queue = timer_queue
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self._pending: Dict[int, RetryJob] = {}
+        self._lock = threading.Lock()
+        self._scheduled = 0
+
+    def compute_delay(self, retry_delay: float, attempt: int) -> float:
+        """Seconds to wait before the given attempt (1 for the first retry)"""
+        delay = min(retry_delay * self.backoff_factor ** max(0, attempt - 1), self.max_delay)
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return max(0.0, delay)
+
+    def schedule(self, task_name: str, attempt: int, retry_delay: float,
+                 run_func: Callable[[], Any], task_func: Optional[Callable] = None) -> RetryJob:
+        """Queue a retry attempt of a task"""
+        delay = self.compute_delay(retry_delay, attempt)
+        job = RetryJob(task_name, attempt, clock.now() + timedelta(seconds=delay), run_func, task_func)
+        with self._lock:
+            self._pending[id(job)] = job
+            self._scheduled += 1
+        self.timer_queue.push(job)
+        logger.info(f"Scheduled retry {attempt} of task {task_name} in {delay:.1f}s")
+        return job
+
+    def complete(self, job: RetryJob):
+        """Forget a retry that has been dispatched"""
+        with self._lock:
+            self._pending.pop(id(job), None)
+
+    def cancel_task(self, task_name: str) -> int:
+        """Drop all pending retries of a task (e.g. when it is reloaded or removed)"""
+        with self._lock:
+            jobs = [job for job in self._pending.values() if job.task_name == task_name]
+            for job in jobs:
+                del self._pending[id(job)]
+        for job in jobs:
+            self.timer_queue.discard(job)
+        return len(jobs)
+
+    def has_pending(self, task_name: str) -> bool:
+        """Check whether a task has a retry waiting"""
+        with self._lock:
+            return any(job.task_name == task_name for job in self._pending.values())
+
+    def pending_jobs(self) -> List[RetryJob]:
+        """Retries waiting for their deadline"""
+        with self._lock:
+            return list(self._pending.values())
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get retry statistics"""
+        with self._lock:
+            return {"pending": len(self._pending), "scheduled": self._scheduled}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
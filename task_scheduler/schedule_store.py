@@ -0,0 +1,111 @@
+"""
+In-memory schedule table with write-through persistence
+"""
+
+import bisect
+import threading
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from loguru import logger
+
+from .database import DatabaseManager, TaskSchedule
+from . import clock
+
+
+class ScheduleStore:
+    """
+    Authoritative in-process copy of the task_schedules table
+
+    Loaded from SQLite once at start-up (restart recovery) and then owns the
+    next-run state: lookups and overdue queries are answered from memory, the
+    latter from a list of active schedules sorted by next run time. A change
+    is written through to ``writer`` (the execution journal or the database)
+    only when a persisted field actually changes.
+
+    Exposes the schedule methods of DatabaseManager so it can stand in for it.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, writer=None):
+        self.db_manager = db_manager
+        self.writer = writer or db_manager
+        self._schedules: Dict[str, TaskSchedule] = {}
+        self._due: List[Tuple[datetime, str]] = []  # (next_run_time, task_name) of active schedules
+        self._lock = threading.Lock()
+        self._stats = {"writes": 0, "skipped_writes": 0}
+        self.reload()
+
+    def reload(self):
+        """Replace the in-memory table with the database contents"""
+        schedules = self.db_manager.get_all_schedules()
+        with self._lock:
+            self._schedules = {s.task_name: s for s in schedules}
+            self._due = sorted((s.next_run_time, s.task_name) for s in schedules if s.is_active)
+        logger.debug(f"Loaded {len(schedules)} task schedules into memory")
+
+    def get_task_schedule(self, task_name: str) -> Optional[TaskSchedule]:
+        """Get a task's schedule"""
+        with self._lock:
+            return self._schedules.get(task_name)
+
+    def get_overdue_tasks(self, current_time: datetime) -> List[TaskSchedule]:
+        """Get active schedules due at or before ``current_time``, oldest first"""
+        with self._lock:
+            end = bisect.bisect_right(self._due, (current_time, chr(0x10FFFF)))
+            return [self._schedules[task_name] for _, task_name in self._due[:end]]
+
+    def update_task_schedule(self, schedule: TaskSchedule) -> bool:
+        """Record a schedule; returns False if nothing persisted changed
+
+        An empty ``schedule_config`` keeps the one already recorded.
+        """
+        with self._lock:
+            current = self._schedules.get(schedule.task_name)
+            if current is not None and not schedule.schedule_config:
+                schedule = replace(schedule, schedule_config=current.schedule_config)
+            if current is not None and self._same(current, schedule):
+                self._stats["skipped_writes"] += 1
+                return False
+            self._index(current, schedule)
+            self._schedules[schedule.task_name] = schedule
+            self._stats["writes"] += 1
+        self.writer.update_task_schedule(schedule)
+        return True
+
+    def deactivate_task(self, task_name: str) -> bool:
+        """Mark a task's schedule inactive; returns False if it was not active"""
+        with self._lock:
+            current = self._schedules.get(task_name)
+            if current is None or not current.is_active:
+                return False
+            schedule = replace(current, is_active=False, last_updated=clock.now())
+            self._index(current, schedule)
+            self._schedules[task_name] = schedule
+            self._stats["writes"] += 1
+        # Goes through the same writer as updates, so it cannot be overtaken by one
+        self.writer.update_task_schedule(schedule)
+        return True
+
+    def _index(self, old: Optional[TaskSchedule], new: TaskSchedule):
+        """Move a schedule in the sorted due list (caller holds the lock)"""
+        if old is not None and old.is_active:
+            position = bisect.bisect_left(self._due, (old.next_run_time, old.task_name))
+            if position < len(self._due) and self._due[position] == (old.next_run_time, old.task_name):
+                del self._due[position]
+        if new.is_active:
+            bisect.insort(self._due, (new.next_run_time, new.task_name))
+
+    @staticmethod
+    def _same(a: TaskSchedule, b: TaskSchedule) -> bool:
+        """Compare the fields that matter for scheduling (not last_updated)"""
+        return (a.next_run_time == b.next_run_time and a.schedule_config == b.schedule_config
+                and a.is_active == b.is_active)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get store statistics"""
+        with self._lock:
+            return {"schedules": len(self._schedules), "active": len(self._due), **self._stats}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._schedules)
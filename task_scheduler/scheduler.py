@@ -2,37 +2,58 @@
 Core task scheduler implementation
 """
 
+import gc
+import os
 import time
 import signal
 import sys
+import queue
 import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set
 import schedule
-import yaml
 from loguru import logger
 
-try:
-    import setproctitle
-    HAS_SETPROCTITLE = True
-except ImportError:
-    HAS_SETPROCTITLE = False
-
 from .task_parser import TaskParser, TaskFile
 from .database import DatabaseManager, TaskSchedule
 from .venv_manager import VirtualEnvironmentManager
 from .memory_manager import MemoryManager, TaskModuleManager, ResourceMonitor
-from .decorators import TaskTracker, ScheduleManager, set_task_tracker
+from .decorators import TaskTracker, ScheduleManager, CronLikeJob, set_task_tracker, get_job_registry
 from .logging_config import LoggingManager, StructuredLogger
+from .timer_queue import TimerQueue, job_deadline
+from .executor import TaskExecutor
+from .process_pool import ProcessWorkerPool
+from .cancellation import TimeoutSupervisor
+from .retry import RetryJob, RetryScheduler
+from .journal import ExecutionJournal
+from .schedule_store import ScheduleStore
+from .file_watcher import create_watcher
+from .bytecode_cache import BytecodeCache
+from .lazy_loader import LazyModuleLoader
+from .memory_pressure import MemoryPressureResponder, PressureTier
+from .status_snapshot import StatusPublisher, STATUS_FILE_NAME
+from .control import ControlServer, ControlError, TriggerJob, CONTROL_SOCKET_NAME, PID_FILE_NAME
+from .metrics import SchedulerMetrics, MetricsHTTPServer
+from .tick_profiler import TickProfiler, TICK_BUCKETS
+from .startup_profiler import StartupProfiler
+from . import clock
 
 
 class TaskScheduler:
     """Main task scheduler class"""
     
-    def __init__(self, config_path: Path):
+    def __init__(self, config_path: Path, upgrade_pip: bool = False,
+                 startup_profiler: Optional[StartupProfiler] = None):
+        # Time spent in each startup phase (main.py passes one that also timed the imports)
+        self.startup_profiler = startup_profiler or StartupProfiler()
         self.config_path = config_path
-        self.config = self._load_config()
+        with self.startup_profiler.phase("config"):
+            self.config = self._load_config()
+        # pip is otherwise only upgraded when the venv changed
+        self.upgrade_pip = upgrade_pip or self.config['virtual_env'].get('upgrade_pip', False)
         self.running = False
         self.restart_requested = False
         
@@ -46,26 +67,162 @@ class TaskScheduler:
         for directory in [self.tasks_dir, self.logs_dir, self.data_dir]:
             directory.mkdir(parents=True, exist_ok=True)
         
-        # Initialize managers
-        self.db_manager = DatabaseManager(self.data_dir / self.config['database']['path'])
-        self.task_parser = TaskParser()
+        # The database schema is set up (or migrated) while the other components are built
+        components_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="startup") as pool:
+            database = pool.submit(self.startup_profiler.timed, "database",
+                                   DatabaseManager, self.data_dir / self.config['database']['path'])
+            self._create_managers()
+            self.db_manager = database.result()
+        self._create_components()
+        self.startup_profiler.record("components", components_start, time.perf_counter())
+
+    def _create_managers(self):
+        """Create the components that do not need the database"""
+        self.task_parser = TaskParser(cache_path=self.data_dir / "parse_cache.json")
         self.venv_manager = VirtualEnvironmentManager(
             self.base_dir / self.config['virtual_env']['path'],
             self.config['virtual_env']['python_executable']
         )
         self.memory_manager = MemoryManager(self.config['scheduler']['max_memory_usage'])
-        self.task_module_manager = TaskModuleManager()
-        self.resource_monitor = ResourceMonitor(self.memory_manager)
-        
+        self.task_module_manager = TaskModuleManager(BytecodeCache(self.data_dir / "bytecode"))
+        self.resource_monitor = ResourceMonitor(
+            self.memory_manager,
+            sample_interval=self.config['scheduler'].get('resource_sample_interval', 5)
+        )
+
+    def _create_components(self):
+        """Create the components that read or write the database"""
         # Initialize tracking
         self.task_tracker = TaskTracker(self.db_manager)
         set_task_tracker(self.task_tracker)
-        self.schedule_manager = ScheduleManager(self.db_manager)
+
+        # Lag, duration, load time and DB write latency, exposed in Prometheus format
+        self.metrics = SchedulerMetrics()
+        self.task_tracker.metrics = self.metrics
+
+        # Run records are committed in batches off the task threads
+        self.journal = ExecutionJournal(
+            self.db_manager,
+            flush_interval=self.config['database'].get('journal_flush_interval', 200) / 1000,
+            batch_size=self.config['database'].get('journal_batch_size', 100),
+            max_queue=self.config['database'].get('journal_max_queue', 10000)
+        )
+        self.task_tracker.journal = self.journal
+        self.journal.metrics = self.metrics
+
+        # Next-run state lives in memory; SQLite is written through for restart recovery
+        self.schedule_store = ScheduleStore(self.db_manager, writer=self.journal)
+        self.task_tracker.schedule_store = self.schedule_store
+        self.schedule_manager = ScheduleManager(self.db_manager, self.schedule_store)
+
+        # Deadline-ordered queue of all scheduled jobs
+        self.timer_queue = TimerQueue()
+        self._schedules_dirty = False
+        # How late recent jobs were dispatched, in seconds
+        self._dispatch_lags: deque = deque(maxlen=256)
+
+        # Worker pool that runs due jobs off the main loop
+        self.executor = TaskExecutor(self.config['scheduler'].get('max_workers', 4))
+
+        # Worker processes for tasks with 'execution: process' (started on first use)
+        self.process_pool = ProcessWorkerPool(
+            python_executable=self.venv_manager.get_python_executable(),
+            cwd=self.base_dir,
+            size=self.config['scheduler'].get('process_workers', 2),
+            max_tasks_per_worker=self.config['scheduler'].get('max_tasks_per_worker', 100),
+            env=self._get_worker_environment(),
+            kill_grace_period=self.config['scheduler'].get('timeout_grace_period', 5)
+        )
+        self.task_tracker.process_pool = self.process_pool
+
+        # Enforces frontmatter timeouts for in-process runs
+        self.timeout_supervisor = TimeoutSupervisor(self.config['scheduler'].get('timeout_grace_period', 5))
+        self.task_tracker.timeout_supervisor = self.timeout_supervisor
+
+        # Failed runs are retried as one-shot timers on the same queue
+        self.retry_scheduler = RetryScheduler(
+            self.timer_queue,
+            backoff_factor=self.config['scheduler'].get('retry_backoff_factor', 2),
+            max_delay=self.config['scheduler'].get('retry_max_delay', 3600),
+            jitter=self.config['scheduler'].get('retry_jitter', 0.1)
+        )
+        self.task_tracker.retry_scheduler = self.retry_scheduler
         
+        # Scheduled jobs by task name, maintained by the decorators
+        self.job_registry = get_job_registry()
+
+        # Evicts task modules (when idle with lazy loading, or under memory
+        # pressure) and loads them again shortly before their next run
+        self.lazy_loading = self.config['scheduler'].get('lazy_loading', False)
+        self.lazy_loader = LazyModuleLoader(
+            self.task_module_manager,
+            self.job_registry,
+            idle_timeout=self.config['scheduler'].get('module_idle_timeout', 3600),
+            max_resident=self.config['scheduler'].get('max_resident_modules', 0)
+        )
+        self.task_tracker.lazy_loader = self.lazy_loader
+        self.lazy_loader.metrics = self.metrics
+
+        # High memory usage is relieved step by step; restarting is the last resort
+        self.memory_pressure = MemoryPressureResponder(
+            self.memory_manager,
+            [
+                PressureTier("gc_and_caches", self._clear_caches),
+                PressureTier("evict_modules", lambda: self._evict_idle_modules(force=True)),
+                PressureTier("recycle_workers", self.process_pool.recycle),
+            ],
+            cooldown=self.config['scheduler'].get('memory_pressure_cooldown', 60)
+        )
+
+        # Live status for `main.py --status`, readable without constructing a scheduler
+        self.status_publisher = StatusPublisher(
+            self.data_dir / STATUS_FILE_NAME,
+            interval=self.config['scheduler'].get('status_publish_interval', 1)
+        )
+
+        # Control socket; commands that change state run on the main loop
+        self._paused_tasks: Set[str] = set()
+        self._control_requests: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.control_server = None
+        if self.config['scheduler'].get('control_socket', True):
+            self.control_server = ControlServer(
+                self.data_dir / CONTROL_SOCKET_NAME,
+                self.data_dir / PID_FILE_NAME,
+                {
+                    "ping": lambda: {"pid": os.getpid(), "running": self.running},
+                    "stats": self.get_status,
+                    "jobs": self._on_main_loop(self._describe_jobs),
+                    "run": self._on_main_loop(self._run_task_now),
+                    "pause": self._on_main_loop(self._pause_task),
+                    "resume": self._on_main_loop(self._resume_task),
+                    "reload": self._on_main_loop(self._reload_task),
+                    "restart": self._on_main_loop(self._restart_from_control),
+                    "metrics": self.metrics.render,
+                }
+            )
+
+        self._register_gauges()
+        self.metrics_server = None
+
+        # Times each phase of a main loop iteration
+        self.tick_profiler = TickProfiler(
+            slow_threshold_ms=self.config['scheduler'].get('slow_tick_threshold_ms', 100),
+            histogram=self.metrics.registry.histogram(
+                "task_scheduler_tick_phase_seconds", "Time spent in each phase of a main loop iteration",
+                ["phase"], TICK_BUCKETS)
+        )
+
         # Track loaded tasks
         self._loaded_tasks: Dict[str, TaskFile] = {}
         self._last_scan_time = 0
 
+        # Task and helper files reported changed by the file watcher (None: rescan all)
+        self.helpers_dir = Path("helpers")
+        self.file_watcher = None
+        self._changed_paths: Set[Optional[Path]] = set()
+        self._changed_paths_lock = threading.Lock()
+
         # Track config file changes
         self._config_last_modified = self.config_path.stat().st_mtime if self.config_path.exists() else 0
         
@@ -84,6 +241,14 @@ class TaskScheduler:
             logger.error(f"Failed to load config: {e}")
             sys.exit(1)
 
+    def _get_worker_environment(self) -> Dict[str, str]:
+        """Environment for task worker processes: the venv plus the project on PYTHONPATH"""
+        env = self.venv_manager.get_venv_environment()
+        python_path = env.get("PYTHONPATH")
+        env["PYTHONPATH"] = f"{self.base_dir}{os.pathsep}{python_path}" if python_path else str(self.base_dir)
+        env["TASK_SCHEDULER_BYTECODE_DIR"] = str(self.data_dir / "bytecode")
+        return env
+
     def _check_and_reload_config(self) -> bool:
         """Check if config file has changed and reload if necessary"""
         try:
@@ -112,6 +277,10 @@ class TaskScheduler:
                     logger.info(f"Tasks directory changed from {self.tasks_dir} to {new_tasks_dir}")
                     self.tasks_dir = new_tasks_dir
                     self.tasks_dir.mkdir(parents=True, exist_ok=True)
+                    if self.file_watcher:
+                        self._stop_file_watcher()
+                        self._start_file_watcher()
+                        self._on_file_changed(None)
                     config_changed = True
 
                 # Check if virtual environment settings changed
@@ -123,6 +292,9 @@ class TaskScheduler:
                         new_venv_path,
                         self.config['virtual_env']['python_executable']
                     )
+                    self.process_pool.python_executable = self.venv_manager.get_python_executable()
+                    self.process_pool.env = self._get_worker_environment()
+                    self.process_pool.recycle()
                     config_changed = True
 
                 if config_changed:
@@ -142,14 +314,14 @@ class TaskScheduler:
         """Set a recognizable process name for the scheduler"""
         process_name = "myautohub-scheduler"
 
-        if HAS_SETPROCTITLE:
-            try:
-                setproctitle.setproctitle(process_name)
-                logger.debug(f"Process name set to: {process_name}")
-            except Exception as e:
-                logger.debug(f"Failed to set process name: {e}")
-        else:
+        try:
+            import setproctitle
+            setproctitle.setproctitle(process_name)
+            logger.debug(f"Process name set to: {process_name}")
+        except ImportError:
             logger.debug("setproctitle not available, process name not changed")
+        except Exception as e:
+            logger.debug(f"Failed to set process name: {e}")
 
         # Also set argv[0] as a fallback
         try:
@@ -162,35 +334,97 @@ class TaskScheduler:
         logger.info(f"Received signal {signum}, shutting down gracefully...")
         self.stop()
     
-    def start(self):
-        """Start the task scheduler"""
+    def start(self, startup_only: bool = False):
+        """Start the task scheduler
+
+        With ``startup_only`` it shuts down again once startup is complete
+        instead of running the main loop (``main.py --profile-startup``).
+        """
         logger.info("Starting Task Scheduler")
+        profile = self.startup_profiler
 
         # Set process name for easy identification
         self._set_process_name()
 
-        # Ensure virtual environment is ready
-        if not self.venv_manager.ensure_virtual_environment():
-            logger.error("Failed to setup virtual environment")
-            return False
-        
-        # Start resource monitoring
-        self.resource_monitor.start_monitoring()
-        
-        # Initial task scan
-        self._scan_and_load_tasks()
+        # Preparing the venv (and helper dependencies) and parsing the task
+        # files do not depend on each other, so they run concurrently; the
+        # parser only touches the cache entries of the files it is given
+        include_example_tasks = self.config.get('tasks', {}).get('include_example_tasks', True)
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup") as pool:
+            environment_ready = pool.submit(self._prepare_environment)
+            parsed = pool.submit(profile.timed, "task_parse", self.task_parser.scan_tasks_directory,
+                                 self.tasks_dir, include_example_tasks)
+            with profile.phase("resource_monitor"):
+                self.resource_monitor.start_monitoring()
+            if not environment_ready.result():
+                logger.error("Failed to setup virtual environment")
+                return False
+            task_files = parsed.result()
+
+        # The venv interpreter may only exist now that the environment is set up
+        self.process_pool.python_executable = self.venv_manager.get_python_executable()
+
+        # Initial task load
+        with profile.phase("task_load"):
+            self._scan_and_load_tasks(task_files)
+
+        # Afterwards only changed files are looked at
+        with profile.phase("file_watcher"):
+            self._start_file_watcher()
         
         # Start main loop
-        self.running = True
+        self.running = not startup_only
+        with profile.phase("services"):
+            self.status_publisher.start(self.get_status)
+            if self.control_server:
+                self.control_server.start()
+            self._start_metrics_server()
+        profile.finish()
+        self._log_startup_profile()
         self._main_loop()
+        if self.control_server:
+            self.control_server.stop()
+        self._fail_control_requests()
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        self._stop_file_watcher()
+        self.status_publisher.stop(final_status=self.get_status())
+
+        # Let in-flight task runs finish before returning
+        self.executor.shutdown(wait=True)
+        self.process_pool.shutdown()
+        self.timeout_supervisor.stop()
+        self.journal.close()
+        self.db_manager.close()
         
         return True
     
+    def _prepare_environment(self) -> bool:
+        """Ensure the virtual environment and install helper dependencies (startup)"""
+        profile = self.startup_profiler
+        if not profile.timed("venv", self.venv_manager.ensure_virtual_environment, self.upgrade_pip):
+            return False
+        profile.timed("helper_dependencies", self._scan_and_install_helper_dependencies)
+        return True
+
+    def _log_startup_profile(self):
+        """Log the startup time with its slowest phases"""
+        stats = self.startup_profiler.get_stats()
+        slowest = sorted(stats["phases"], key=lambda phase: phase["duration_ms"], reverse=True)[:3]
+        details = ", ".join(f"{phase['name']} {phase['duration_ms']:.0f} ms" for phase in slowest)
+        logger.info(f"Startup complete in {stats['total_ms']:.0f} ms ({details})")
+
     def stop(self):
         """Stop the task scheduler"""
         logger.info("Stopping Task Scheduler")
         self.running = False
+        self.timer_queue.wake()
         self.resource_monitor.stop_monitoring()
+        # Persist what has been recorded so far; runs still in flight are
+        # flushed by close() once start() has drained the worker pool
+        if not self.journal.flush(timeout=5):
+            logger.warning("Timed out flushing the execution journal")
     
     def restart(self):
         """Request scheduler restart"""
@@ -198,114 +432,514 @@ class TaskScheduler:
         self.restart_requested = True
         self.stop()
 
-    def _run_cron_like_jobs(self):
-        """Run any pending cron-like jobs"""
-        import schedule
+    def _get_all_jobs(self) -> List:
+        """Get all schedule library and cron-like jobs plus pending retries"""
+        return (list(schedule.jobs) + list(getattr(schedule, '_cron_like_jobs', {}).values()) +
+                self.retry_scheduler.pending_jobs())
+
+    def _run_job(self, job) -> bool:
+        """Run a single due job; returns False if the job cancelled itself"""
+        try:
+            if isinstance(job, CronLikeJob):
+                logger.info(f"EXECUTING CRON-LIKE JOB: {job}")
+                job.run()
+            elif getattr(job, 'one_shot', False):
+                job.run()  # Retries and triggers
+            else:
+                ret = job.run()
+                if isinstance(ret, schedule.CancelJob) or ret is schedule.CancelJob:
+                    self._cancel_job(job)
+                    return False
+        except Exception as e:
+            logger.error(f"Error running job {job}: {e}")
+            # A failed run must still advance, otherwise the job stays due forever
+            if not isinstance(job, CronLikeJob) and not getattr(job, 'one_shot', False):
+                job._schedule_next_run()
+        return True
+
+    def _is_job_scheduled(self, job) -> bool:
+        """Check whether a job is still registered with the schedule"""
+        if getattr(job, 'one_shot', False):
+            return False  # Retries and triggers
+        return self.job_registry.is_registered(job)
+
+    def _dispatch_job(self, job, on_complete=None) -> bool:
+        """Run a job on the worker pool and requeue it
+
+        A job whose task allows one run at a time is requeued when its run
+        finishes. With a ``max_concurrency`` above 1 it is requeued for its
+        next run straight away, so that many runs may overlap; a run that
+        comes due while the limit is reached is skipped.
+
+        Returns False if the job is already running (at its limit).
+        """
+        self.timer_queue.discard(job)
+        if isinstance(job, RetryJob):
+            self.retry_scheduler.complete(job)
 
-        # Get cron-like jobs from our separate list
-        cron_jobs = getattr(schedule, '_cron_like_jobs', [])
-        pending_jobs = [job for job in cron_jobs if job.should_run()]
+        if self._paused_tasks and self._job_task_name(job) in self._paused_tasks:
+            self._skip_run(job, "is paused")
+            return True
+
+        limit = 1
+        if not getattr(job, 'one_shot', False):
+            limit = self.task_tracker.get_max_concurrency(self._job_task_name(job))
+        if limit > 1:
+            return self._dispatch_overlapping(job, limit, on_complete)
+
+        def on_done(keep):
+            if on_complete:
+                on_complete()
+            if keep and self._is_job_scheduled(job):
+                self._record_next_run(job)
+                self.timer_queue.push(job)
+            self._schedules_dirty = True
+
+        return self.executor.submit(job, self._run_job, on_done)
+
+    def _dispatch_overlapping(self, job, limit: int, on_complete=None) -> bool:
+        """Dispatch a job whose runs may overlap and requeue it for its next run now"""
+        def on_done(keep):
+            if on_complete:
+                on_complete()
+            if not keep:
+                self._cancel_job(job)
+            self._schedules_dirty = True
+
+        if not self.executor.submit(job, self._run_job_func, on_done, limit=limit):
+            self._skip_run(job, f"has {limit} runs in flight")
+            return False
+        job.last_run = clock.now()
+        self._skip_run(job)
+        return True
+
+    def _run_job_func(self, job) -> bool:
+        """Run only a job's function (its next run was set at dispatch); False if it cancelled itself"""
+        try:
+            ret = job.job_func()
+            if isinstance(ret, schedule.CancelJob) or ret is schedule.CancelJob:
+                return False
+        except Exception as e:
+            logger.error(f"Error running job {job}: {e}")
+        return True
+
+    def _job_task_name(self, job) -> Optional[str]:
+        """Name of the task a job, retry or trigger belongs to"""
+        if getattr(job, 'one_shot', False):
+            return job.task_name
+        return self.job_registry.get_task_name_for_job(job)
+
+    def _skip_run(self, job, reason: Optional[str] = None):
+        """Advance a job to its next run and requeue it without waiting for a run to finish"""
+        if getattr(job, 'one_shot', False):
+            return  # Retries and triggers are dropped while the task is paused
+        if isinstance(job, CronLikeJob):
+            job.next_run = job._calculate_next_run()
+        else:
+            job._schedule_next_run()
+        if reason:
+            logger.debug(f"Task {self._job_task_name(job)} {reason}, skipped run of {job}")
+        self._record_next_run(job)
+        self.timer_queue.push(job)
+
+    def _register_gauges(self):
+        """Queue depths and resource usage, read when metrics are scraped"""
+        executor_stats = self.executor.get_stats
+        gauges = [
+            ("task_scheduler_loaded_tasks", "Loaded tasks", lambda: len(self._loaded_tasks)),
+            ("task_scheduler_timer_queue_depth", "Jobs waiting for their deadline", lambda: len(self.timer_queue)),
+            ("task_scheduler_executor_active", "Jobs running on the worker pool", lambda: executor_stats()["active"]),
+            ("task_scheduler_executor_queued", "Due jobs waiting for a worker", lambda: executor_stats()["queued"]),
+            ("task_scheduler_retries_pending", "Failed runs waiting to be retried",
+             lambda: len(self.retry_scheduler)),
+            ("task_scheduler_journal_queue_depth", "Records waiting to be committed",
+             lambda: self.journal.get_stats()["queued"]),
+            ("task_scheduler_resident_memory_bytes", "Scheduler RSS at the last resource sample",
+             lambda: self.resource_monitor.get_system_stats()["process_memory"]["rss_mb"] * 1024 * 1024),
+        ]
+        for name, documentation, function in gauges:
+            self.metrics.gauge(name, documentation, function)
 
-        if cron_jobs:
-            logger.debug(f"Found {len(cron_jobs)} cron-like jobs, {len(pending_jobs)} pending")
+    def _start_metrics_server(self):
+        """Serve metrics over HTTP on localhost if metrics_port is set"""
+        port = self.config['scheduler'].get('metrics_port', 0)
+        if not port:
+            return
+        try:
+            self.metrics_server = MetricsHTTPServer(self.metrics.render, port)
+            self.metrics_server.start()
+            logger.info(f"Serving metrics on http://127.0.0.1:{self.metrics_server.port}/metrics")
+        except OSError as e:
+            logger.error(f"Failed to serve metrics on port {port}: {e}")
+            self.metrics_server = None
 
-        for job in pending_jobs:
+    def _on_main_loop(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a control command so it runs on the main loop and wait for its result"""
+        def run(**arguments):
+            future: Future = Future()
+            self._control_requests.put((func, arguments, future))
+            self.timer_queue.wake()
+            return future.result(timeout=30)
+        return run
+
+    def _process_control_requests(self):
+        """Run control commands queued by the control socket"""
+        while True:
             try:
-                logger.info(f"EXECUTING CRON-LIKE JOB: {job}")
-                job.run()
+                func, arguments, future = self._control_requests.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                future.set_result(func(**arguments))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _fail_control_requests(self):
+        """Reject control commands that arrived while the main loop was stopping"""
+        while True:
+            try:
+                _, _, future = self._control_requests.get_nowait()
+            except queue.Empty:
+                return
+            future.set_exception(ControlError("The scheduler is stopping"))
+
+    def _require_task(self, task: str):
+        """Raise ControlError unless a task is loaded"""
+        if task not in self._loaded_tasks:
+            raise ControlError(f"Task {task} is not loaded")
+
+    def _describe_jobs(self) -> List[Dict[str, Any]]:
+        """Control command: every scheduled job and pending retry"""
+        jobs = []
+        for job in self._get_all_jobs():
+            task_name = self._job_task_name(job)
+            next_run = getattr(job, 'next_run', None)
+            jobs.append({
+                "task": task_name,
+                "job": str(job),
+                "type": "retry" if isinstance(job, RetryJob) else
+                        "cron_like" if isinstance(job, CronLikeJob) else "schedule",
+                "next_run": next_run.isoformat() if next_run else None,
+                "queued": self.timer_queue.contains(job),
+                "running": self.executor.is_running(job),
+                "paused": task_name in self._paused_tasks
+            })
+        return jobs
+
+    def _run_task_now(self, task: str) -> Dict[str, Any]:
+        """Control command: run a task once now, leaving its schedule as it is"""
+        self._require_task(task)
+        if task in self._paused_tasks:
+            raise ControlError(f"Task {task} is paused")
+        jobs = self.job_registry.get_jobs(task)
+        if not jobs:
+            raise ControlError(f"Task {task} has no scheduled jobs")
+        if any(isinstance(job, TriggerJob) and job.task_name == task for job in self.executor.in_flight_jobs()):
+            raise ControlError(f"Task {task} was already triggered and has not finished")
+        if not self._dispatch_job(TriggerJob(task, jobs[0].job_func)):
+            raise ControlError("The scheduler is stopping")
+        logger.info(f"Task {task} triggered through the control socket")
+        return {"task": task, "dispatched": True}
+
+    def _pause_task(self, task: str) -> Dict[str, Any]:
+        """Control command: skip a task's runs until it is resumed"""
+        self._require_task(task)
+        self._paused_tasks.add(task)
+        logger.info(f"Task {task} paused")
+        return {"task": task, "paused": True}
+
+    def _resume_task(self, task: str) -> Dict[str, Any]:
+        """Control command: run a paused task on its schedule again"""
+        self._require_task(task)
+        self._paused_tasks.discard(task)
+        logger.info(f"Task {task} resumed")
+        return {"task": task, "paused": False}
+
+    def _reload_task(self, task: str) -> Dict[str, Any]:
+        """Control command: load a task from its file again, even if unchanged"""
+        path = self._loaded_tasks[task].path if task in self._loaded_tasks else self.tasks_dir / f"{task}.py"
+        if not path.exists():
+            raise ControlError(f"Task file {path} does not exist")
+        task_file = self.task_parser.parse_file(path)
+        if not task_file.metadata.enabled:
+            raise ControlError(f"Task {task} is disabled")
+
+        start = time.perf_counter()
+        if not self._load_task(task_file, force=True):
+            raise ControlError(f"Failed to load task {task}, see the scheduler log")
+        self.timer_queue.sync_jobs(self._get_all_jobs())
+        self._schedules_dirty = True
+        return {"task": task, "reloaded": True, "seconds": round(time.perf_counter() - start, 4)}
+
+    def _restart_from_control(self) -> Dict[str, Any]:
+        """Control command: restart gracefully once running tasks have finished"""
+        self.restart()
+        return {"restarting": True}
+
+    def _record_next_run(self, job):
+        """Record a job's next run time after it has run (a no-op if unchanged)"""
+        task_name = self.job_registry.get_task_name_for_job(job)
+        if not task_name or not job.next_run:
+            return
+        self.schedule_store.update_task_schedule(TaskSchedule(
+            task_name=task_name,
+            next_run_time=job.next_run.replace(microsecond=0),
+            schedule_config="",  # Keep the recorded one
+            last_updated=clock.now()
+        ))
+
+    def _run_due_jobs(self) -> int:
+        """Dispatch all jobs whose deadline has passed to the worker pool"""
+        now = clock.time()
+        due_jobs = self.timer_queue.pop_due(now)
+
+        for job in due_jobs:
+            deadline = job_deadline(job)
+            if deadline is not None:
+                self._dispatch_lags.append(now - deadline)
+                self.metrics.dispatch_lag.observe(now - deadline, task=self._job_task_name(job) or "unknown")
+            if not self._dispatch_job(job):
+                # The running instance requeues the job when it completes
+                logger.debug(f"Job {job} is still running, not dispatching again")
+
+        return len(due_jobs)
+
+    def _sync_schedules_with_database(self):
+        """Dispatch overdue tasks recorded in the database"""
+        loaded_task_names = set(self._loaded_tasks.keys())
+        self._schedules_dirty = False
+        self.schedule_manager.sync_schedules_with_database(loaded_task_names, dispatch=self._dispatch_job)
+
+    def _start_file_watcher(self):
+        """Watch the task and helper directories unless watch_mode is 'off'"""
+        watch_mode = self.config['tasks'].get('watch_mode', 'auto')
+        if watch_mode == 'off':
+            return
+        try:
+            self.file_watcher = create_watcher(
+                [self.tasks_dir, self.helpers_dir],
+                self._on_file_changed,
+                mode=watch_mode,
+                poll_interval=self.config['scheduler']['task_check_interval']
+            )
+            self.file_watcher.start()
+        except Exception as e:
+            logger.error(f"Failed to start file watcher, falling back to periodic rescans: {e}")
+            self.file_watcher = None
+
+    def _stop_file_watcher(self):
+        """Stop the file watcher if one is running"""
+        if self.file_watcher:
+            self.file_watcher.stop()
+            self.file_watcher = None
+
+    def _on_file_changed(self, path: Optional[Path]):
+        """Queue a changed file for the main loop (called on the watcher thread)"""
+        with self._changed_paths_lock:
+            self._changed_paths.add(path)
+        self.timer_queue.wake()
+
+    def _process_file_changes(self):
+        """Reload, load or unload the tasks whose files changed"""
+        with self._changed_paths_lock:
+            changed_paths, self._changed_paths = self._changed_paths, set()
+        if not changed_paths:
+            return
+
+        if None in changed_paths:
+            self._scan_and_load_tasks()
+            return
+
+        helpers_dir = self.helpers_dir.resolve()
+        tasks_dir = self.tasks_dir.resolve()
+        tasks_changed = False
+        helpers_changed = False
+        for path in changed_paths:
+            parent = path.parent.resolve()
+            if parent == helpers_dir:
+                helpers_changed = True
+            elif parent == tasks_dir:
+                tasks_changed |= self._refresh_task(path)
+
+        if helpers_changed:
+            self._scan_and_install_helper_dependencies()
+        self.task_parser.save_cache()
+        if tasks_changed:
+            self.timer_queue.sync_jobs(self._get_all_jobs())
+            self._schedules_dirty = True
+
+    def _refresh_task(self, path: Path) -> bool:
+        """Bring one task in line with its file; returns True if anything changed"""
+        task_name = path.stem
+        include_example_tasks = self.config.get('tasks', {}).get('include_example_tasks', True)
+
+        task_file = None
+        if not path.exists():
+            self.task_parser.remove_from_cache(path)
+        elif include_example_tasks or not task_name.startswith("example_"):
+            try:
+                task_file = self.task_parser.parse_file(path)
             except Exception as e:
-                logger.error(f"Error running cron-like job {job}: {e}")
+                logger.error(f"Failed to parse task file {path}: {e}")
+
+        if task_file and task_file.metadata.enabled:
+            if self._task_needs_reload(task_file):
+                self._load_task(task_file)
+                return True
+            return False
+
+        # Deleted, disabled, excluded or unparsable: same outcome as a full scan
+        if task_name in self._loaded_tasks:
+            self._unload_task(task_name)
+            return True
+        return False
+
+    def _task_needs_reload(self, task_file: TaskFile) -> bool:
+        """Check whether a task is new or its file has changed since it was loaded"""
+        task_name = task_file.path.stem
+        return (
+            task_name not in self._loaded_tasks or
+            self._loaded_tasks[task_name].file_hash != task_file.file_hash or
+            self.task_module_manager.check_for_changes(task_file.path)
+        )
 
     def _main_loop(self):
-        """Main scheduler loop"""
-        last_memory_cleanup = time.time()
-        last_task_scan = time.time()
-        last_config_check = time.time()
+        """Main scheduler loop
+
+        Sleeps until the earliest job deadline or housekeeping deadline,
+        whichever comes first, and can be woken early through the timer queue.
+        Task changes come from the file watcher; without one the tasks
+        directory is rescanned every task_check_interval.
+        """
+        now = clock.time()
+        next_memory_cleanup = now + self.config['scheduler']['memory_cleanup_interval']
+        next_task_scan = now + self.config['scheduler']['task_check_interval']
+        next_config_check = now + 5
+        next_eviction_check = now + 60 if self.lazy_loading else float('inf')
+        next_prefetch_check = now
 
+        profiler = self.tick_profiler
         while self.running:
             try:
-                current_time = time.time()
+                profiler.start_tick()
+                current_time = clock.time()
 
                 # Check for config file changes (every 5 seconds)
-                if current_time - last_config_check >= 5:
+                if current_time >= next_config_check:
                     self._check_and_reload_config()
-                    last_config_check = current_time
+                    next_config_check = current_time + 5
+                profiler.mark("config_check")
 
-                # Scan for new/changed tasks
-                if current_time - last_task_scan >= self.config['scheduler']['task_check_interval']:
+                # Commands from the control socket
+                self._process_control_requests()
+                profiler.mark("control")
+
+                # Pick up new/changed tasks
+                if self.file_watcher:
+                    self._process_file_changes()
+                    next_task_scan = float('inf')
+                elif current_time >= next_task_scan:
                     self._scan_and_load_tasks()
-                    last_task_scan = current_time
-                
-                # Run our custom cron-like jobs
-                logger.debug("Running cron-like jobs")
-                self._run_cron_like_jobs()
-
-                # Run standard schedule library jobs
-                logger.debug("Running standard schedule jobs")
-                schedule.run_pending()
-
-                # Sync schedules with database
-                logger.debug("Syncing schedules with database")
-                loaded_task_names = set(self._loaded_tasks.keys())
-                self.schedule_manager.sync_schedules_with_database(loaded_task_names)
+                    next_task_scan = current_time + self.config['scheduler']['task_check_interval']
+                profiler.mark("task_changes")
+
+                # Dispatch jobs whose deadline has passed
+                self._run_due_jobs()
+                profiler.mark("dispatch")
+
+                # Sync schedules with database only when something changed
+                if self._schedules_dirty:
+                    logger.debug("Syncing schedules with database")
+                    self._sync_schedules_with_database()
+                profiler.mark("schedule_sync")
                 
                 # Memory cleanup
-                if current_time - last_memory_cleanup >= self.config['scheduler']['memory_cleanup_interval']:
+                if current_time >= next_memory_cleanup:
+                    self._release_retired_modules()
                     self.memory_manager.cleanup_memory()
-                    last_memory_cleanup = current_time
+                    self._check_for_module_leaks()
+                    next_memory_cleanup = current_time + self.config['scheduler']['memory_cleanup_interval']
+                profiler.mark("memory_cleanup")
+
+                # Evict idle task modules (lazy loading)
+                if current_time >= next_eviction_check:
+                    self._evict_idle_modules()
+                    next_eviction_check = current_time + 60
+                profiler.mark("eviction")
+
+                # Load evicted modules whose next run is near, so the run does not pay for it
+                if current_time >= next_prefetch_check:
+                    self._prefetch_modules(current_time)
+                    next_prefetch_check = current_time + max(1.0, self._prefetch_lead() / 2)
+                profiler.mark("prefetch")
                 
-                # Check if restart is needed due to high memory usage
-                if self.memory_manager.is_memory_usage_high():
-                    logger.warning("High memory usage detected, requesting restart")
+                # Relieve high memory usage; restart only if nothing else helped
+                if self.memory_manager.is_memory_usage_high() and self.memory_pressure.respond():
+                    logger.warning("High memory usage persists, requesting restart")
                     self.restart()
                     break
+                profiler.mark("memory_pressure")
                 
-                # Sleep until next iteration (but check for shutdown every second)
-                loop_interval = self.config['scheduler']['loop_interval']
-                for _ in range(loop_interval):
-                    if not self.running:
-                        break
-                    time.sleep(1)
+                # Sleep until the next deadline (woken early on stop or new jobs)
+                deadlines = [next_config_check, next_task_scan, next_memory_cleanup, next_eviction_check,
+                             next_prefetch_check]
+                next_job_deadline = self.timer_queue.next_deadline()
+                if next_job_deadline is not None:
+                    deadlines.append(next_job_deadline)
+                profiler.mark("next_deadline")
+                profiler.end_tick()
+                if self.running:
+                    self.timer_queue.wait(min(deadlines) - clock.time())
                 
             except Exception as e:
                 logger.error(f"Error in main loop: {e}")
-                time.sleep(self.config['scheduler']['loop_interval'])
+                self.timer_queue.wait(self.config['scheduler']['loop_interval'])
         
         logger.info("Main loop stopped")
     
-    def _scan_and_load_tasks(self):
-        """Scan tasks directory and load/reload tasks as needed"""
+    def _scan_and_load_tasks(self, task_files: Optional[List[TaskFile]] = None):
+        """Scan tasks directory and load/reload tasks as needed
+
+        Args:
+            task_files: Already parsed task files; startup parses them while
+                it prepares the venv and installs the helper dependencies
+        """
         try:
-            logger.debug("Scanning tasks directory")
+            if task_files is None:
+                logger.debug("Scanning tasks directory")
 
-            # First, scan and install helper dependencies
-            self._scan_and_install_helper_dependencies()
+                # First, scan and install helper dependencies
+                self._scan_and_install_helper_dependencies()
 
-            # Get all task files
-            include_example_tasks = self.config.get('tasks', {}).get('include_example_tasks', True)
-            task_files = self.task_parser.scan_tasks_directory(self.tasks_dir, include_example_tasks)
+                # Get all task files
+                include_example_tasks = self.config.get('tasks', {}).get('include_example_tasks', True)
+                task_files = self.task_parser.scan_tasks_directory(self.tasks_dir, include_example_tasks)
 
             # Track current task names
             current_tasks = set()
+            tasks_changed = False
             
             for task_file in task_files:
                 task_name = task_file.path.stem
                 current_tasks.add(task_name)
                 
                 # Check if task needs loading/reloading
-                needs_reload = (
-                    task_name not in self._loaded_tasks or
-                    self._loaded_tasks[task_name].file_hash != task_file.file_hash or
-                    self.task_module_manager.check_for_changes(task_file.path)
-                )
-                
-                if needs_reload:
+                if self._task_needs_reload(task_file):
                     self._load_task(task_file)
+                    tasks_changed = True
             
             # Remove tasks that no longer exist
             removed_tasks = set(self._loaded_tasks.keys()) - current_tasks
             for task_name in removed_tasks:
                 self._unload_task(task_name)
+                tasks_changed = True
+
+            # Bring the timer queue in line with the new set of jobs
+            if tasks_changed:
+                self.timer_queue.sync_jobs(self._get_all_jobs())
+                self._schedules_dirty = True
+
+            self.task_parser.save_cache()
             
             StructuredLogger.log_scheduler_event(
                 "task_scan_completed",
@@ -317,8 +951,8 @@ class TaskScheduler:
         except Exception as e:
             logger.error(f"Error scanning tasks: {e}")
     
-    def _load_task(self, task_file: TaskFile):
-        """Load or reload a single task"""
+    def _load_task(self, task_file: TaskFile, force: bool = False):
+        """Load or reload a single task (``force`` re-executes an unchanged file)"""
         try:
             task_name = task_file.path.stem
             logger.info(f"Loading task: {task_name}")
@@ -329,15 +963,29 @@ class TaskScheduler:
                     logger.error(f"Failed to install dependencies for task {task_name}")
                     return False
             
+            # Jobs of the currently loaded version; loading the module registers new ones
+            old_jobs = self.job_registry.get_jobs(task_name)
+
             # Load the task module
-            module = self.task_module_manager.load_task_module(task_file.path, task_file.content)
+            load_start = time.perf_counter()
+            module = self.task_module_manager.load_task_module(task_file.path, task_file.content,
+                                                               force_reload=force,
+                                                               first_line=task_file.body_line)
+            self.metrics.task_load.observe(time.perf_counter() - load_start, task=task_name, reason="file")
             if not module:
                 logger.error(f"Failed to load module for task {task_name}")
+                # Drop anything the broken version registered before failing
+                new_jobs = [j for j in self.job_registry.get_jobs(task_name)
+                            if not any(j is old for old in old_jobs)]
+                if new_jobs:
+                    self._unschedule_jobs(self.job_registry.unregister(task_name, new_jobs))
+                self._release_retired_modules()
                 return False
             
-            # Remove existing schedule if reloading
-            if task_name in self._loaded_tasks:
-                self._remove_task_from_schedule(task_name)
+            # Remove the previous version's schedule if reloading
+            if old_jobs:
+                self._remove_task_from_schedule(task_name, old_jobs)
+            self._release_retired_modules()
             
             # Execute the module to register schedules
             try:
@@ -357,6 +1005,8 @@ class TaskScheduler:
             
             # Update loaded tasks
             self._loaded_tasks[task_name] = task_file
+            self.lazy_loader.track(task_name, task_file.path, task_file.content, task_file.body_line)
+            self.task_tracker.set_task_settings(task_name, task_file.metadata)
             
             StructuredLogger.log_scheduler_event(
                 "task_loaded",
@@ -384,9 +1034,14 @@ class TaskScheduler:
                 task_file = self._loaded_tasks[task_name]
                 self.task_module_manager.unload_task_module(task_file.path)
                 del self._loaded_tasks[task_name]
+                self._release_retired_modules()
+            self.lazy_loader.forget(task_name)
+            self._paused_tasks.discard(task_name)
+            self.metrics.forget_task(task_name)
+            self.task_tracker.remove_task_settings(task_name)
             
-            # Deactivate in database
-            self.db_manager.deactivate_task(task_name)
+            # Deactivate in the schedule store (written through to the database)
+            self.schedule_store.deactivate_task(task_name)
             
             StructuredLogger.log_scheduler_event(
                 "task_unloaded",
@@ -397,26 +1052,101 @@ class TaskScheduler:
         except Exception as e:
             logger.error(f"Error unloading task {task_name}: {e}")
     
-    def _remove_task_from_schedule(self, task_name: str):
-        """Remove a task from the schedule"""
-        # Remove from standard schedule library jobs
-        jobs_to_remove = []
-        for job in schedule.jobs:
-            if hasattr(job.job_func, '_task_name') and job.job_func._task_name.endswith(task_name):
-                jobs_to_remove.append(job)
-
-        for job in jobs_to_remove:
-            schedule.cancel_job(job)
-
-        # Remove from cron-like jobs
-        if hasattr(schedule, '_cron_like_jobs'):
-            cron_jobs_to_remove = []
-            for job in schedule._cron_like_jobs:
-                if hasattr(job.job_func, '_task_name') and job.job_func._task_name.endswith(task_name):
-                    cron_jobs_to_remove.append(job)
-
-            for job in cron_jobs_to_remove:
-                schedule._cron_like_jobs.remove(job)
+    def _remove_task_from_schedule(self, task_name: str, jobs: Optional[List] = None):
+        """Remove some (default: all) of a task's jobs from the schedule"""
+        # Pending retries would run the old code
+        self.retry_scheduler.cancel_task(task_name)
+
+        self._unschedule_jobs(self.job_registry.unregister(task_name, jobs))
+
+    def _cancel_job(self, job):
+        """Drop a job that cancelled itself from the registry and the schedule"""
+        self._unschedule_jobs(self.job_registry.unregister(self._job_task_name(job), [job]) or [job])
+
+    def _unschedule_jobs(self, jobs: List):
+        """Take jobs out of the schedule lists and the timer queue"""
+        for job in jobs:
+            self.timer_queue.discard(job)
+            if isinstance(job, CronLikeJob):
+                schedule._cron_like_jobs.pop(id(job), None)
+            else:
+                schedule.cancel_job(job)
+
+    @staticmethod
+    def _job_globals(job) -> Optional[Dict]:
+        """The module namespace a job's (or retry's) task function runs in"""
+        if isinstance(job, RetryJob):
+            func = job.task_func
+        else:
+            func = getattr(job.job_func, 'func', job.job_func)  # schedule jobs wrap it in a partial
+            func = getattr(func, '_original_func', func)
+        return getattr(func, '__globals__', None)
+
+    def _release_retired_modules(self):
+        """Tear down replaced or unloaded task modules that nothing is running any more"""
+        # Every run on the pool counts, whether of a scheduled job, a retry or a trigger
+        busy_globals = [self._job_globals(job) for job in self.executor.in_flight_jobs()]
+        self.task_module_manager.release_retired_modules(
+            lambda module: any(g is module.__dict__ for g in busy_globals)
+        )
+
+    def _is_task_busy(self, task_name: str) -> bool:
+        """Check whether a task is running, queued to run or waiting for a retry"""
+        return (self.task_tracker.get_running_count(task_name) > 0 or
+                any(self._job_task_name(job) == task_name for job in self.executor.in_flight_jobs()) or
+                self.retry_scheduler.has_pending(task_name))
+
+    def _evict_idle_modules(self, force: bool = False) -> List[str]:
+        """Evict idle task modules; all evictable ones when memory is near the limit"""
+        threshold = self.config['scheduler'].get('lazy_memory_threshold', 0.8)
+        rss_mb = self.memory_manager.get_memory_usage().get("rss_mb", 0)
+        if rss_mb > self.memory_manager.max_memory_mb * threshold:
+            force = True
+        # Evicting a task due within the prefetch lead would only load it again
+        horizon = clock.time() + self._prefetch_lead()
+
+        def is_busy(task_name: str) -> bool:
+            return self._is_task_busy(task_name) or (not force and self._is_task_due_before(task_name, horizon))
+
+        evicted = self.lazy_loader.evict_idle(is_busy, force=force)
+        if evicted:
+            self._release_retired_modules()
+            gc.collect()
+        return evicted
+
+    def _prefetch_lead(self) -> float:
+        """Seconds before its next run that an evicted module is loaded again"""
+        return self.config['scheduler'].get('module_prefetch_lead', 30)
+
+    def _prefetch_modules(self, current_time: float) -> List[str]:
+        """Load evicted task modules that have a job due within the prefetch lead"""
+        horizon = current_time + self._prefetch_lead()
+        loaded = [task_name for task_name in self.lazy_loader.evicted_tasks()
+                  if self._is_task_due_before(task_name, horizon) and self.lazy_loader.ensure_loaded(task_name)]
+        if loaded:
+            logger.debug(f"Prefetched {len(loaded)} evicted task module(s): {', '.join(loaded)}")
+        return loaded
+
+    def _is_task_due_before(self, task_name: str, horizon: float) -> bool:
+        """Check whether any job of a task comes due at or before ``horizon`` (epoch seconds)"""
+        for job in self.job_registry.get_jobs(task_name):
+            deadline = job_deadline(job)
+            if deadline is not None and deadline <= horizon:
+                return True
+        return False
+
+    def _clear_caches(self):
+        """Free retired modules and in-memory caches, then collect garbage"""
+        self._release_retired_modules()
+        self.task_parser.clear_cache()
+        self.task_module_manager.bytecode_cache.clear()
+        self.memory_manager.cleanup_memory()
+
+    def _check_for_module_leaks(self):
+        """Warn about torn-down task modules that are still referenced (run after a GC)"""
+        leaked = self.task_module_manager.find_leaked_modules(min_age=60)
+        if leaked:
+            logger.warning(f"Task modules still referenced after unload: {', '.join(leaked)}")
     
     def _install_task_dependencies(self, task_file: TaskFile) -> bool:
         """Install dependencies for a task"""
@@ -453,7 +1183,7 @@ class TaskScheduler:
     def _scan_and_install_helper_dependencies(self):
         """Scan helpers directory and install dependencies from helper modules"""
         try:
-            helpers_dir = Path("helpers")
+            helpers_dir = self.helpers_dir
             if not helpers_dir.exists():
                 logger.debug("Helpers directory does not exist, skipping helper dependency scan")
                 return
@@ -508,50 +1238,11 @@ class TaskScheduler:
     def _ensure_initial_schedule_recorded(self, task_name: str):
         """Ensure the initial schedule for a task is recorded in the database"""
         try:
-            # Find the corresponding schedule job using our registry
-            from .decorators import _job_task_registry, CronLikeJob
-            matching_job = None
-
-            # First check CronLikeJob objects (stored separately)
-            cron_jobs = getattr(schedule, '_cron_like_jobs', [])
-            for job in cron_jobs:
-                if isinstance(job, CronLikeJob):
-                    if job.job_func in _job_task_registry:
-                        job_task_name = _job_task_registry[job.job_func]
-                        if job_task_name == task_name:
-                            matching_job = job
-                            break
-                    elif hasattr(job.job_func, '_task_name'):
-                        job_task_name = job.job_func._task_name
-                        if '.' in job_task_name:
-                            job_task_name = job_task_name.split('.')[-1]
-
-                        if job_task_name == task_name:
-                            matching_job = job
-                            break
-
-            # If not found in cron jobs, check regular schedule jobs
-            if not matching_job:
-                for job in schedule.jobs:
-                    # Handle regular schedule jobs
-                    if hasattr(job, 'job_func'):
-                        if job.job_func in _job_task_registry:
-                            job_task_name = _job_task_registry[job.job_func]
-                            if job_task_name == task_name:
-                                matching_job = job
-                                break
-                        elif hasattr(job.job_func, '_task_name'):
-                            job_task_name = job.job_func._task_name
-                            if '.' in job_task_name:
-                                job_task_name = job_task_name.split('.')[-1]
-
-                            if job_task_name == task_name:
-                                matching_job = job
-                                break
+            matching_job = self.job_registry.get_job(task_name)
 
             if matching_job and matching_job.next_run:
                 # Check if we already have a schedule record
-                existing_schedule = self.db_manager.get_task_schedule(task_name)
+                existing_schedule = self.schedule_store.get_task_schedule(task_name)
 
                 if not existing_schedule:
                     # Create initial schedule record
@@ -566,10 +1257,10 @@ class TaskScheduler:
                         task_name=task_name,
                         next_run_time=next_run_time,
                         schedule_config=str(matching_job),  # Store job description
-                        last_updated=datetime.now(),
+                        last_updated=clock.now(),
                         is_active=True
                     )
-                    self.db_manager.update_task_schedule(initial_schedule)
+                    self.schedule_store.update_task_schedule(initial_schedule)
                     logger.info(f"Initial schedule recorded for task {task_name}: next run at {matching_job.next_run}")
                 else:
                     logger.debug(f"Schedule already exists for task {task_name}")
@@ -579,13 +1270,42 @@ class TaskScheduler:
         except Exception as e:
             logger.error(f"Error recording initial schedule for task {task_name}: {e}")
 
+    def _get_lag_stats(self) -> Dict[str, float]:
+        """Dispatch lag of recent jobs in milliseconds"""
+        lags = list(self._dispatch_lags)
+        if not lags:
+            return {"samples": 0}
+        return {
+            "samples": len(lags),
+            "last_ms": round(lags[-1] * 1000, 1),
+            "avg_ms": round(sum(lags) / len(lags) * 1000, 1),
+            "max_ms": round(max(lags) * 1000, 1)
+        }
+
     def get_status(self) -> Dict:
         """Get scheduler status information"""
+        system_stats = self.resource_monitor.get_system_stats()  # Latest background sample
         return {
             "running": self.running,
             "loaded_tasks": len(self._loaded_tasks),
             "scheduled_jobs": len(schedule.jobs),
-            "memory_usage": self.memory_manager.get_memory_usage(),
-            "system_stats": self.resource_monitor.get_system_stats(),
+            "queued_jobs": len(self.timer_queue),
+            "running_tasks": self.task_tracker.get_running_tasks(),
+            "paused_tasks": sorted(self._paused_tasks),
+            "scheduling_lag": self._get_lag_stats(),
+            "retries": self.retry_scheduler.get_stats(),
+            "journal": self.journal.get_stats(),
+            "schedule_store": self.schedule_store.get_stats(),
+            "task_parser": dict(self.task_parser.stats),
+            "bytecode_cache": self.task_module_manager.bytecode_cache.get_stats(),
+            "task_modules": self.task_module_manager.get_stats(),
+            "lazy_loading": self.lazy_loader.get_stats(),
+            "memory_pressure": self.memory_pressure.get_stats(),
+            "tick_profile": self.tick_profiler.get_stats(),
+            "startup": self.startup_profiler.get_stats(),
+            "executor": self.executor.get_stats(),
+            "process_pool": self.process_pool.get_stats(),
+            "memory_usage": system_stats.get("process_memory", {}),
+            "system_stats": system_stats,
             "venv_info": self.venv_manager.get_environment_info()
         }
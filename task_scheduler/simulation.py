@@ -0,0 +1,190 @@
+"""
+Replay task schedules in virtual time to estimate scheduler load
+"""
+
+import heapq
+import itertools
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import schedule
+from loguru import logger
+
+from . import clock, decorators
+from .database import DatabaseManager, TaskSchedule
+from .decorators import TaskTracker, CronLikeJob, get_job_registry, set_task_tracker
+from .journal import ExecutionJournal
+from .memory_manager import TaskModuleManager
+from .schedule_store import ScheduleStore
+from .task_parser import TaskParser
+from .timer_queue import TimerQueue, job_deadline
+
+
+def _stub_task(*args, **kwargs):
+    """Stands in for a task body during simulation"""
+    return None
+
+
+class Simulation:
+    """
+    Runs the real task modules' schedules against a virtual clock
+
+    Task files are parsed and executed as usual so every ``@repeat`` schedule
+    registers, then each task body is replaced by a stub. Time then jumps
+    from one event (a job deadline or a run finishing) to the next, so a day
+    of schedules replays in seconds. Every run still goes through the tracking
+    wrapper and the write-behind journal into a scratch database, which gives
+    the database write volume. Each run occupies one of ``max_workers`` slots
+    for ``task_duration`` virtual seconds; jobs due while all slots are busy
+    wait in FIFO order, and the wait shows up as lag.
+    """
+
+    def __init__(self, tasks_dir: Path, hours: float = 24, max_workers: int = 4,
+                 task_duration: float = 1.0, include_example_tasks: bool = True,
+                 start: Optional[float] = None):
+        self.tasks_dir = Path(tasks_dir)
+        self.hours = hours
+        self.max_workers = max(1, int(max_workers))
+        self.task_duration = max(0.0, task_duration)
+        self.include_example_tasks = include_example_tasks
+        self.start = start
+
+    def run(self) -> Dict[str, Any]:
+        """Run the simulation and return its report"""
+        previous_tracker = decorators._task_tracker
+        registry = get_job_registry()
+        with tempfile.TemporaryDirectory(prefix="task-simulation-") as scratch, \
+                clock.use_clock(clock.VirtualClock(self.start)) as virtual_clock:
+            db_manager = DatabaseManager(Path(scratch) / "simulation.db")
+            journal = ExecutionJournal(db_manager)
+            tracker = TaskTracker(db_manager)
+            tracker.journal = journal
+            tracker.schedule_store = ScheduleStore(db_manager, writer=journal)
+            set_task_tracker(tracker)
+            registry.clear()
+            schedule.clear()
+            schedule._cron_like_jobs = {}
+            try:
+                loaded, failed = self._load_tasks()
+                report = self._replay(virtual_clock, tracker)
+                journal.close()
+                report["tasks"] = {"loaded": loaded, "failed": failed}
+                report["database"] = {
+                    **{key: journal.get_stats()[key] for key in ("written", "batches", "dropped", "coalesced_schedules")},
+                    "size_bytes": sum(path.stat().st_size for path in Path(scratch).glob("simulation.db*"))
+                }
+                return report
+            finally:
+                journal.close()
+                db_manager.close()
+                registry.clear()
+                schedule.clear()
+                schedule._cron_like_jobs = {}
+                set_task_tracker(previous_tracker)
+
+    def _load_tasks(self) -> Tuple[int, List[str]]:
+        """Execute every enabled task file and stub out the task bodies"""
+        module_manager = TaskModuleManager()
+        registry = get_job_registry()
+        loaded, failed = 0, []
+        for task_file in TaskParser().scan_tasks_directory(self.tasks_dir, self.include_example_tasks):
+            task_name = task_file.path.stem
+            module = module_manager.load_task_module(task_file.path, task_file.content,
+                                                     first_line=task_file.body_line)
+            jobs = registry.get_jobs(task_name)
+            if not module or not jobs:
+                failed.append(task_name)
+                continue
+            for job in jobs:
+                wrapper = getattr(job.job_func, 'func', job.job_func)
+                wrapper._original_func = _stub_task
+            loaded += 1
+        return loaded, failed
+
+    def _replay(self, virtual_clock: clock.VirtualClock, tracker: TaskTracker) -> Dict[str, Any]:
+        """Advance virtual time event by event until the simulated period ends"""
+        registry = get_job_registry()
+        timer_queue = TimerQueue()
+        timer_queue.sync_jobs(list(schedule.jobs) + list(schedule._cron_like_jobs.values()))
+
+        begin = virtual_clock.time()
+        end = begin + self.hours * 3600
+        running: List[Tuple[float, int, Any]] = []  # (finish time, seq, job)
+        waiting: Deque[Tuple[Any, float]] = deque()  # (job, deadline)
+        sequence = itertools.count()
+        lags: List[float] = []
+        runs_per_task: Dict[str, int] = {}
+        peak_running = peak_waiting = 0
+        wall_start = time.perf_counter()
+
+        while True:
+            next_due = timer_queue.next_deadline()
+            events = [t for t in (next_due, running[0][0] if running else None) if t is not None]
+            if not events or min(events) > end:
+                break
+            virtual_clock.advance_to(min(events))
+            now = virtual_clock.time()
+
+            # Finished runs free their slot and go back on the timer queue
+            while running and running[0][0] <= now:
+                _, _, job = heapq.heappop(running)
+                self._reschedule(job, tracker, registry)
+                timer_queue.push(job)
+
+            for job in timer_queue.pop_due(now):
+                waiting.append((job, job_deadline(job)))
+            peak_waiting = max(peak_waiting, len(waiting))
+
+            while waiting and len(running) < self.max_workers:
+                job, deadline = waiting.popleft()
+                lags.append(max(0.0, now - deadline))
+                task_name = registry.get_task_name_for_job(job)
+                runs_per_task[task_name] = runs_per_task.get(task_name, 0) + 1
+                try:
+                    job.run()
+                except Exception as e:
+                    logger.error(f"Simulated run of {task_name} failed: {e}")
+                heapq.heappush(running, (now + self.task_duration, next(sequence), job))
+                peak_running = max(peak_running, len(running))
+
+        wall_seconds = time.perf_counter() - wall_start
+        total_runs = len(lags)
+        lags.sort()
+        return {
+            "simulated_hours": self.hours,
+            "wall_seconds": round(wall_seconds, 3),
+            "speedup": round(self.hours * 3600 / wall_seconds) if wall_seconds else None,
+            "max_workers": self.max_workers,
+            "task_duration_seconds": self.task_duration,
+            "runs": total_runs,
+            "runs_per_hour": round(total_runs / self.hours, 1) if self.hours else 0,
+            "runs_per_wall_second": round(total_runs / wall_seconds, 1) if wall_seconds else None,
+            "busiest_tasks": dict(sorted(runs_per_task.items(), key=lambda item: item[1], reverse=True)[:10]),
+            "peak_concurrency": peak_running,
+            "peak_waiting": peak_waiting,
+            "lag_seconds": {
+                "avg": round(sum(lags) / total_runs, 3) if total_runs else 0,
+                "p95": round(lags[min(total_runs - 1, int(0.95 * total_runs))], 3) if total_runs else 0,
+                "max": round(lags[-1], 3) if total_runs else 0
+            }
+        }
+
+    @staticmethod
+    def _reschedule(job: Any, tracker: TaskTracker, registry) -> None:
+        """Compute a finished job's next run from the completion time and record it"""
+        # The scheduler computes the next run once the task returns, so a run
+        # longer than the interval pushes the next one back
+        if isinstance(job, CronLikeJob):
+            job.next_run = job._calculate_next_run()
+        else:
+            job._schedule_next_run()
+        task_name = registry.get_task_name_for_job(job)
+        if task_name and job.next_run:
+            tracker.schedule_store.update_task_schedule(TaskSchedule(
+                task_name=task_name,
+                next_run_time=job.next_run.replace(microsecond=0),
+                schedule_config="",
+                last_updated=clock.now()
+            ))
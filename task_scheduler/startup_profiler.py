@@ -0,0 +1,73 @@
+"""
+Per-phase timing of scheduler startup
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class StartupProfiler:
+    """
+    Records when each startup phase began and how long it took
+
+    Phases may overlap (some run concurrently), so each is kept with its
+    offset from the start of the profile and the thread it ran on. Only the
+    standard library is imported, so ``main.py`` can create one before the
+    scheduler's own imports and time those too.
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.finished_at: Optional[float] = None
+        self._phases: List[Tuple[str, float, float, str]] = []  # (name, start, duration, thread)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as phase ``name``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def timed(self, name: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call ``func`` timed as phase ``name`` (for running phases on other threads)"""
+        with self.phase(name):
+            return func(*args, **kwargs)
+
+    def record(self, name: str, start: float, end: float):
+        """Add a phase measured elsewhere, from ``perf_counter`` readings"""
+        with self._lock:
+            self._phases.append((name, start - self.origin, end - start, threading.current_thread().name))
+
+    def finish(self):
+        """Mark startup as complete"""
+        self.finished_at = time.perf_counter()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Total startup time and the phases in the order they started"""
+        with self._lock:
+            phases = sorted(self._phases, key=lambda phase: phase[1])
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return {
+            "total_ms": round((end - self.origin) * 1000, 1),
+            "complete": self.finished_at is not None,
+            "phases": [
+                {"name": name, "start_ms": round(start * 1000, 1), "duration_ms": round(duration * 1000, 1),
+                 "thread": thread}
+                for name, start, duration, thread in phases
+            ]
+        }
+
+    def format_report(self) -> str:
+        """Table of phases for ``main.py --profile-startup``"""
+        stats = self.get_stats()
+        lines = [f"{'phase':24} {'start':>10} {'duration':>10}  thread"]
+        for phase in stats["phases"]:
+            lines.append(f"{phase['name']:24} {phase['start_ms']:>8.1f}ms {phase['duration_ms']:>8.1f}ms  "
+                         f"{phase['thread']}")
+        lines.append(f"{'total':24} {'':>10} {stats['total_ms']:>8.1f}ms")
+        return "\n".join(lines)
@@ -0,0 +1,164 @@
+"""
+Status snapshot shared between the running scheduler and status readers
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+STATUS_FILE_NAME = "status.mmap"
+
+# magic, writer pid, sequence (odd while a write is in progress), published at, payload length
+_HEADER = struct.Struct('<4sIQdI')
+_MAGIC = b'TSST'
+_DATA_OFFSET = 32
+_MIN_CAPACITY = 64 * 1024
+
+
+class StatusPublisher:
+    """
+    Publishes scheduler status as JSON into a memory-mapped file
+
+    Writes follow a seqlock: the sequence number in the header is odd while
+    the payload is being replaced, so a reader that sees the same even
+    sequence before and after copying the payload has a consistent
+    snapshot. Readers never block the scheduler and need nothing beyond the
+    standard library, which is what keeps ``main.py --status`` fast.
+    """
+
+    def __init__(self, path: Path, interval: float = 1.0):
+        self.path = Path(path)
+        self.interval = interval
+        self._mmap: Optional[mmap.mmap] = None
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"published": 0, "errors": 0}
+
+    def _open(self, capacity: int):
+        """Create (or take over) the snapshot file and map it"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, capacity)
+            self._mmap = mmap.mmap(fd, capacity)
+        finally:
+            os.close(fd)
+
+    def publish(self, status: Dict[str, Any]):
+        """Replace the published snapshot"""
+        payload = json.dumps(status, default=str).encode()
+        with self._lock:
+            needed = _DATA_OFFSET + len(payload)
+            if self._mmap is None:
+                self._open(max(_MIN_CAPACITY, 1 << (needed - 1).bit_length()))
+            elif needed > len(self._mmap):
+                self._mmap.resize(1 << (needed - 1).bit_length())  # Readers remap on a length mismatch
+
+            pid = os.getpid()
+            _, _, _, published_at, length = _HEADER.unpack_from(self._mmap, 0)
+            self._sequence += 1
+            _HEADER.pack_into(self._mmap, 0, _MAGIC, pid, self._sequence, published_at, length)
+            self._mmap[_DATA_OFFSET:needed] = payload
+            self._sequence += 1
+            _HEADER.pack_into(self._mmap, 0, _MAGIC, pid, self._sequence, time.time(), len(payload))
+            self._stats["published"] += 1
+
+    def start(self, collect: Callable[[], Dict[str, Any]]):
+        """Publish ``collect()`` every ``interval`` seconds on a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._publish_loop, args=(collect,),
+                                        name="status-publisher", daemon=True)
+        self._thread.start()
+
+    def _publish_loop(self, collect: Callable[[], Dict[str, Any]]):
+        """Background publishing loop"""
+        while not self._stop_event.is_set():
+            try:
+                self.publish(collect())
+            except Exception as e:
+                self._stats["errors"] += 1
+                from loguru import logger
+                logger.error(f"Failed to publish scheduler status: {e}")
+            self._stop_event.wait(self.interval)
+
+    def stop(self, final_status: Optional[Dict[str, Any]] = None):
+        """Stop publishing, leaving ``final_status`` (if given) as the last snapshot"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if final_status is not None:
+            try:
+                self.publish(final_status)
+            except Exception as e:
+                from loguru import logger
+                logger.error(f"Failed to publish final scheduler status: {e}")
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get publishing statistics"""
+        return dict(self._stats)
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process exists"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_status(path: Path, attempts: int = 100) -> Optional[Dict[str, Any]]:
+    """
+    Read the snapshot published by a running scheduler
+
+    Returns:
+        The published status plus ``pid``, ``published_at`` and ``age_seconds``,
+        or None if there is no (readable) snapshot. ``running`` is False if
+        the publishing process no longer exists.
+    """
+    for _ in range(attempts):
+        try:
+            with open(path, 'rb') as f:
+                snapshot = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None  # Missing or empty file
+
+        try:
+            for _ in range(attempts):
+                magic, pid, sequence, published_at, length = _HEADER.unpack_from(snapshot, 0)
+                if magic != _MAGIC or sequence == 0:
+                    return None
+                if sequence % 2:
+                    time.sleep(0)  # A write is in progress
+                    continue
+                if _DATA_OFFSET + length > len(snapshot):
+                    break  # The file grew since it was mapped
+                payload = snapshot[_DATA_OFFSET:_DATA_OFFSET + length]
+                if _HEADER.unpack_from(snapshot, 0)[2] != sequence:
+                    continue  # Torn read
+                status = json.loads(payload)
+                alive = _pid_alive(pid)
+                status["running"] = bool(status.get("running")) and alive
+                status["pid"] = pid
+                status["published_at"] = published_at
+                status["age_seconds"] = round(time.time() - published_at, 3)
+                return status
+        finally:
+            snapshot.close()
+    return None
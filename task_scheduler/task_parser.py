@@ -3,13 +3,31 @@ Task file parser for extracting frontmatter and task metadata
 """
 
 import re
+import os
+import json
+import stat as stat_module
 import yaml
 import hashlib
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
 
+# Bumped whenever the on-disk parse cache format or the parsing rules change
+PARSE_CACHE_VERSION = 1
+
+# Frontmatter keys read by TaskParser._parse_metadata
+METADATA_KEYS = ("title", "description", "dependencies", "python_version", "enabled",
+                 "timeout", "retry_count", "retry_delay", "max_concurrency", "execution")
+
+
+# libyaml's loader is many times faster when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Supported values for the frontmatter 'execution' field
+EXECUTION_MODES = ("thread", "process")
+
+
 @dataclass
 class TaskMetadata:
     """Metadata extracted from task file frontmatter"""
@@ -21,10 +39,14 @@ class TaskMetadata:
     timeout: int = 300  # seconds
     retry_count: int = 0
     retry_delay: int = 60  # seconds
+    max_concurrency: int = 1  # overlapping runs allowed
+    execution: str = "thread"  # 'thread' (in-process) or 'process' (venv worker)
     
     def __post_init__(self):
         if self.dependencies is None:
             self.dependencies = []
+        if self.execution not in EXECUTION_MODES:
+            raise ValueError(f"Invalid execution mode '{self.execution}', expected one of {EXECUTION_MODES}")
 
 
 @dataclass
@@ -35,6 +57,7 @@ class TaskFile:
     content: str
     file_hash: str
     last_modified: float
+    body_line: int = 1  # Line of the file that ``content`` starts on
     
     
 class TaskParser:
@@ -52,58 +75,81 @@ class TaskParser:
         re.DOTALL | re.MULTILINE
     )
     
-    def __init__(self):
+    def __init__(self, cache_path: Optional[Path] = None):
+        """
+        Args:
+            cache_path: JSON file that keeps parsed frontmatter across restarts
+                (keyed by content hash); no persistent cache if None
+        """
         self._file_cache: Dict[str, TaskFile] = {}
-    
+        # (st_ino, st_size, st_mtime_ns) each cached file had when it was hashed
+        self._stat_keys: Dict[str, Tuple[int, int, int]] = {}
+        self.cache_path = cache_path
+        # content hash -> [frontmatter (None if absent), offset of the task body]
+        self._parse_cache: Dict[str, list] = {}
+        self._parse_cache_dirty = False
+        self.stats = {"stat_hits": 0, "hash_hits": 0, "parse_cache_hits": 0, "parses": 0}
+        self._load_parse_cache()
+
     def parse_file(self, file_path: Path) -> Optional[TaskFile]:
-        """Parse a task file and extract metadata and content"""
+        """Parse a task file and extract metadata and content
+
+        A file whose inode, size and mtime are unchanged is returned from the
+        in-memory cache without being read. Otherwise it is read and hashed,
+        and the YAML frontmatter is only parsed if the persistent cache has
+        no entry for that content.
+        """
         try:
-            if not file_path.exists() or not file_path.is_file():
+            try:
+                stat = file_path.stat()
+            except OSError:
+                return None
+            if not stat_module.S_ISREG(stat.st_mode):
                 return None
-                
-            # Check if file has changed
-            stat = file_path.stat()
             last_modified = stat.st_mtime
-            
-            # Calculate file hash for change detection
-            with open(file_path, 'rb') as f:
-                file_hash = hashlib.md5(f.read()).hexdigest()
-            
-            # Check cache
+            stat_key = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+            # Level 1: unchanged stat, skip reading and hashing
             cache_key = str(file_path)
-            if (cache_key in self._file_cache and 
+            if cache_key in self._file_cache and self._stat_keys.get(cache_key) == stat_key:
+                self.stats["stat_hits"] += 1
+                return self._file_cache[cache_key]
+
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            file_hash = hashlib.md5(raw).hexdigest()
+
+            if (cache_key in self._file_cache and
                 self._file_cache[cache_key].file_hash == file_hash):
+                self.stats["hash_hits"] += 1
+                self._stat_keys[cache_key] = stat_key
                 return self._file_cache[cache_key]
-            
-            # Read and parse file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Extract frontmatter - try both patterns
-            match = self.FRONTMATTER_PATTERN.match(content)
-            docstring_match = self.DOCSTRING_FRONTMATTER_PATTERN.match(content)
-
-            if match:
-                # Original YAML frontmatter format
-                frontmatter_str, task_content = match.groups()
-            elif docstring_match:
-                # Python-syntax-correct format (YAML in docstring)
-                frontmatter_str, task_content = docstring_match.groups()
+
+            # Same newline translation as reading in text mode
+            content = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+            # Level 2: frontmatter already parsed for this content
+            cached = self._parse_cache.get(file_hash)
+            if cached is not None:
+                self.stats["parse_cache_hits"] += 1
+                frontmatter_data, body_offset = cached
+                task_content = content[body_offset:]
             else:
+                self.stats["parses"] += 1
+                frontmatter_data, task_content = self._split_frontmatter(content)
+                body_offset = len(content) - len(task_content)
+
+            if frontmatter_data is None:
                 # No frontmatter, create default metadata
                 metadata = TaskMetadata(
                     title=file_path.stem,
                     description=f"Task from {file_path.name}"
                 )
-                task_content = content
-                frontmatter_str = None
+            else:
+                metadata = self._parse_metadata(frontmatter_data, file_path.stem)
 
-            if frontmatter_str:
-                try:
-                    frontmatter_data = yaml.safe_load(frontmatter_str)
-                    metadata = self._parse_metadata(frontmatter_data, file_path.stem)
-                except yaml.YAMLError as e:
-                    raise ValueError(f"Invalid YAML in frontmatter: {e}")
+            if cached is None:
+                self._remember_parse(file_hash, frontmatter_data, body_offset)
 
             # Validate task content has start() function or @repeat decorators (except for helper files)
             is_helper = 'helpers' in str(file_path)
@@ -118,15 +164,87 @@ class TaskParser:
                 metadata=metadata,
                 content=task_content,
                 file_hash=file_hash,
-                last_modified=last_modified
+                last_modified=last_modified,
+                body_line=content.count('\n', 0, body_offset) + 1
             )
 
             # Cache the parsed file
             self._file_cache[cache_key] = task_file
+            self._stat_keys[cache_key] = stat_key
 
             return task_file
         except Exception as e:
             raise ValueError(f"Error parsing task file {file_path}: {e}")
+
+    def _split_frontmatter(self, content: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Split file content into parsed frontmatter (None if absent) and task body"""
+        # Extract frontmatter - try both patterns
+        match = self.FRONTMATTER_PATTERN.match(content)
+        docstring_match = self.DOCSTRING_FRONTMATTER_PATTERN.match(content)
+
+        if match:
+            # Original YAML frontmatter format
+            frontmatter_str, task_content = match.groups()
+        elif docstring_match:
+            # Python-syntax-correct format (YAML in docstring)
+            frontmatter_str, task_content = docstring_match.groups()
+        else:
+            return None, content
+
+        try:
+            frontmatter_data = yaml.load(frontmatter_str, Loader=YAML_LOADER)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML in frontmatter: {e}")
+        if not isinstance(frontmatter_data, dict):
+            raise ValueError("Frontmatter must be a YAML mapping")
+        return frontmatter_data, task_content
+
+    def _remember_parse(self, file_hash: str, frontmatter_data: Optional[Dict[str, Any]], body_offset: int):
+        """Add a parse result to the persistent cache"""
+        if self.cache_path is None:
+            return
+        if frontmatter_data is not None:
+            frontmatter_data = {key: frontmatter_data[key] for key in METADATA_KEYS if key in frontmatter_data}
+            try:
+                json.dumps(frontmatter_data)
+            except (TypeError, ValueError):
+                return  # YAML types without a JSON form are simply parsed each time
+        self._parse_cache[file_hash] = [frontmatter_data, body_offset]
+        self._parse_cache_dirty = True
+
+    def _load_parse_cache(self):
+        """Load the persistent parse cache, ignoring a missing or stale file"""
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == PARSE_CACHE_VERSION:
+                self._parse_cache = data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            self._parse_cache = {}
+
+    def save_cache(self):
+        """Write the persistent parse cache if it changed
+
+        Only entries for files currently in the in-memory cache are kept, so
+        edited and deleted files do not accumulate.
+        """
+        if self.cache_path is None:
+            return
+        live_hashes = {task_file.file_hash for task_file in self._file_cache.values()}
+        if not self._parse_cache_dirty and live_hashes >= self._parse_cache.keys():
+            return
+        self._parse_cache = {h: entry for h, entry in self._parse_cache.items() if h in live_hashes}
+        tmp_path = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": PARSE_CACHE_VERSION, "entries": self._parse_cache}, f)
+            os.replace(tmp_path, self.cache_path)
+            self._parse_cache_dirty = False
+        except OSError as e:
+            from loguru import logger
+            logger.warning(f"Could not write parse cache {self.cache_path}: {e}")
     
     def _parse_metadata(self, data: Dict[str, Any], default_title: str) -> TaskMetadata:
         """Parse frontmatter data into TaskMetadata"""
@@ -138,7 +256,9 @@ class TaskParser:
             enabled=data.get('enabled', True),
             timeout=data.get('timeout', 300),
             retry_count=data.get('retry_count', 0),
-            retry_delay=data.get('retry_delay', 60)
+            retry_delay=data.get('retry_delay', 60),
+            max_concurrency=data.get('max_concurrency', 1),
+            execution=data.get('execution', 'thread')
         )
     
     def scan_tasks_directory(self, tasks_dir: Path, include_example_tasks: bool = True) -> List[TaskFile]:
@@ -175,9 +295,11 @@ class TaskParser:
     def clear_cache(self):
         """Clear the file cache"""
         self._file_cache.clear()
+        self._stat_keys.clear()
     
     def remove_from_cache(self, file_path: Path):
         """Remove a specific file from cache"""
         cache_key = str(file_path)
         if cache_key in self._file_cache:
             del self._file_cache[cache_key]
+        self._stat_keys.pop(cache_key, None)
@@ -0,0 +1,106 @@
+"""
+Per-phase timing of scheduler main loop iterations
+"""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from loguru import logger
+
+from .metrics import Histogram
+
+TICK_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+
+
+class TickProfiler:
+    """
+    Times each phase of a main loop iteration (tick)
+
+    The loop calls ``start_tick()``, then ``mark(phase)`` after each phase and
+    ``end_tick()`` before it sleeps; a phase's time is the time since the
+    previous mark, so instrumenting costs one ``perf_counter_ns`` call and an
+    append per phase. The last ``window`` timings of every phase are kept
+    for percentiles, and a tick slower than ``slow_threshold_ms`` is logged
+    with its per-phase breakdown.
+    """
+
+    def __init__(self, slow_threshold_ms: float = 100, window: int = 1024,
+                 histogram: Optional[Histogram] = None):
+        self.slow_threshold_ns = int(slow_threshold_ms * 1_000_000)
+        self.window = window
+        self.histogram = histogram  # Cumulative per-phase histogram, labelled by phase
+        self._phases: Dict[str, Deque[int]] = {}
+        self._ticks: Deque[int] = deque(maxlen=window)
+        self._current: List[Tuple[str, int]] = []
+        self._tick_start = 0
+        self._last_mark = 0
+        self.tick_count = 0
+        self.slow_ticks = 0
+        self.last_slow_tick: Optional[Dict[str, Any]] = None
+
+    def start_tick(self):
+        """Begin timing an iteration"""
+        self._tick_start = self._last_mark = time.perf_counter_ns()
+        self._current = []
+
+    def mark(self, phase: str):
+        """Attribute the time since the previous mark to ``phase``"""
+        now = time.perf_counter_ns()
+        self._current.append((phase, now - self._last_mark))
+        self._last_mark = now
+
+    def end_tick(self):
+        """Record the iteration and log it if it was slow"""
+        total = time.perf_counter_ns() - self._tick_start
+        self.tick_count += 1
+        self._ticks.append(total)
+        for phase, elapsed in self._current:
+            samples = self._phases.get(phase)
+            if samples is None:
+                samples = self._phases[phase] = deque(maxlen=self.window)
+            samples.append(elapsed)
+            if self.histogram is not None:
+                self.histogram.observe(elapsed / 1e9, phase=phase)
+
+        if total >= self.slow_threshold_ns:
+            self.slow_ticks += 1
+            breakdown = sorted(self._current, key=lambda item: item[1], reverse=True)
+            self.last_slow_tick = {
+                "at": time.time(),
+                "total_ms": round(total / 1e6, 3),
+                "phases_ms": {phase: round(elapsed / 1e6, 3) for phase, elapsed in breakdown}
+            }
+            details = ", ".join(f"{phase} {elapsed / 1e6:.1f} ms" for phase, elapsed in breakdown
+                                if elapsed >= 100_000)
+            logger.warning(f"Slow scheduler tick: {total / 1e6:.1f} ms ({details})")
+
+    @staticmethod
+    def _summarize(samples: List[int]) -> Dict[str, float]:
+        """Percentiles of a list of nanosecond timings, in milliseconds"""
+        samples = sorted(samples)
+        count = len(samples)
+
+        def percentile(fraction: float) -> float:
+            return round(samples[min(count - 1, int(fraction * count))] / 1e6, 3)
+
+        return {
+            "count": count,
+            "avg_ms": round(sum(samples) / count / 1e6, 3),
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(samples[-1] / 1e6, 3)
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-phase and whole-tick percentiles over the recent window"""
+        ticks = list(self._ticks)
+        phases = {phase: self._summarize(list(samples)) for phase, samples in list(self._phases.items()) if samples}
+        return {
+            "ticks": self.tick_count,
+            "slow_ticks": self.slow_ticks,
+            "slow_threshold_ms": self.slow_threshold_ns / 1e6,
+            "tick": self._summarize(ticks) if ticks else {"count": 0},
+            "phases": phases,
+            "last_slow_tick": self.last_slow_tick
+        }
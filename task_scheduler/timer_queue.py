@@ -0,0 +1,138 @@
+"""
+Deadline-ordered timer queue driving the scheduler main loop
+"""
+
+import heapq
+import itertools
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def job_deadline(job: Any) -> Optional[float]:
+    """Return the job's next run time as an epoch timestamp, or None if unscheduled"""
+    next_run = getattr(job, 'next_run', None)
+    if next_run is None:
+        return None
+    if isinstance(next_run, datetime):
+        return next_run.timestamp()
+    return float(next_run)
+
+
+class TimerQueue:
+    """
+    Min-heap of jobs keyed on their next run time
+
+    Holds both schedule library jobs and cron-like jobs. The main loop sleeps
+    until the earliest deadline (or until woken early) instead of polling every
+    job on a fixed interval. Entries are invalidated lazily: rescheduling or
+    discarding a job leaves its old heap entry in place and it is skipped when
+    it reaches the top.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._entries: Dict[int, Tuple[int, float, Any]] = {}  # id(job) -> (seq, deadline, job)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def push(self, job: Any) -> bool:
+        """Schedule (or reschedule) a job at its current next_run time"""
+        deadline = job_deadline(job)
+        with self._lock:
+            if deadline is None:
+                self._entries.pop(id(job), None)
+                return False
+            seq = next(self._counter)
+            self._entries[id(job)] = (seq, deadline, job)
+            heapq.heappush(self._heap, (deadline, seq, job))
+            earliest = self._heap[0][1] == seq
+        if earliest:
+            self.wake()
+        return True
+
+    def discard(self, job: Any):
+        """Remove a job from the queue"""
+        with self._lock:
+            self._entries.pop(id(job), None)
+            self._compact()
+
+    def contains(self, job: Any) -> bool:
+        """Check whether a job currently has a live entry"""
+        with self._lock:
+            return id(job) in self._entries
+
+    def sync_jobs(self, jobs: Iterable[Any]):
+        """
+        Reconcile the queue with the authoritative job lists
+
+        Jobs that are not queued (or whose next_run moved) are pushed, and
+        queued jobs missing from ``jobs`` are discarded. This is O(N) and is
+        meant to run after tasks are loaded or unloaded, not on every tick.
+        """
+        current = {id(job): job for job in jobs}
+        with self._lock:
+            stale = [job_id for job_id in self._entries if job_id not in current]
+            for job_id in stale:
+                del self._entries[job_id]
+            to_push = [
+                job for job_id, job in current.items()
+                if job_id not in self._entries or self._entries[job_id][1] != job_deadline(job)
+            ]
+        for job in to_push:
+            self.push(job)
+        with self._lock:
+            self._compact()
+
+    def pop_due(self, now: float) -> List[Any]:
+        """Remove and return all jobs whose deadline is at or before ``now``"""
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, seq, job = heapq.heappop(self._heap)
+                entry = self._entries.get(id(job))
+                if entry is None or entry[0] != seq:
+                    continue  # Stale entry
+                del self._entries[id(job)]
+                due.append(job)
+        return due
+
+    def next_deadline(self) -> Optional[float]:
+        """Return the earliest live deadline, or None if the queue is empty"""
+        with self._lock:
+            while self._heap:
+                deadline, seq, job = self._heap[0]
+                entry = self._entries.get(id(job))
+                if entry is not None and entry[0] == seq:
+                    return deadline
+                heapq.heappop(self._heap)
+            return None
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Sleep until ``timeout`` elapses or the queue is woken; returns True if woken"""
+        woken = self._wakeup.wait(timeout if timeout is None else max(0.0, timeout))
+        self._wakeup.clear()
+        return woken
+
+    def wake(self):
+        """Wake a thread blocked in wait()"""
+        self._wakeup.set()
+
+    def clear(self):
+        """Drop all queued jobs"""
+        with self._lock:
+            self._heap.clear()
+            self._entries.clear()
+
+    def _compact(self):
+        """Rebuild the heap when stale entries dominate it (caller holds the lock)"""
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._entries):
+            self._heap = [
+                (deadline, seq, job) for seq, deadline, job in self._entries.values()
+            ]
+            heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -9,9 +9,11 @@ import json
 import hashlib
 from pathlib import Path
 from typing import List, Dict, Set, Optional
-import venv
 from loguru import logger
 
+# Fingerprint of the venv executables when pip was last upgraded
+PIP_UPGRADE_MARKER = ".pip-upgraded"
+
 
 class VirtualEnvironmentManager:
     """Manages virtual environments and package installations"""
@@ -28,10 +30,18 @@ class VirtualEnvironmentManager:
             self.python_venv_executable = self.venv_path / "Scripts" / "python.exe"
         
         self._installed_packages: Optional[Dict[str, str]] = None
+        self._installed_packages_key: Optional[tuple] = None
         self._requirements_hash: Optional[str] = None
+        self._environment_info: Optional[Dict[str, str]] = None
+        self._environment_info_key: Optional[tuple] = None
     
-    def ensure_virtual_environment(self) -> bool:
-        """Ensure virtual environment exists and is properly configured"""
+    def ensure_virtual_environment(self, upgrade_pip: bool = False) -> bool:
+        """Ensure virtual environment exists and is properly configured
+
+        pip is only upgraded when ``upgrade_pip`` is set or the environment
+        changed since the last upgrade (created, recreated, or its python or
+        pip executable replaced), so a normal start spawns no pip process.
+        """
         try:
             if not self.venv_path.exists():
                 logger.info(f"Creating virtual environment at {self.venv_path}")
@@ -41,8 +51,8 @@ class VirtualEnvironmentManager:
                 logger.warning("Virtual environment is invalid, recreating...")
                 self._recreate_virtual_environment()
             
-            # Ensure pip is up to date
-            self._upgrade_pip()
+            if upgrade_pip or self._pip_upgrade_due():
+                self._upgrade_pip()
             
             return True
             
@@ -52,6 +62,7 @@ class VirtualEnvironmentManager:
     
     def _create_virtual_environment(self):
         """Create a new virtual environment"""
+        import venv
         self.venv_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Create virtual environment
@@ -81,35 +92,116 @@ class VirtualEnvironmentManager:
             self.pip_executable.exists()
         )
     
+    def _pip_upgrade_due(self) -> bool:
+        """Check whether the venv executables changed since pip was last upgraded"""
+        try:
+            recorded = (self.venv_path / PIP_UPGRADE_MARKER).read_text()
+        except OSError:
+            return True
+        return recorded != json.dumps(self._executables_fingerprint())
+
     def _upgrade_pip(self):
         """Upgrade pip in virtual environment"""
+        logger.info("Upgrading pip in the virtual environment")
         try:
             subprocess.run([
                 str(self.python_venv_executable), "-m", "pip", "install", "--upgrade", "pip"
             ], check=True, capture_output=True, text=True)
             logger.debug("Pip upgraded successfully")
         except subprocess.CalledProcessError as e:
-            logger.warning(f"Failed to upgrade pip: {e}")
+            logger.warning(f"Failed to upgrade pip (retried when requested or the venv changes): {e}")
+
+        # Recorded after failures too: an offline start should not retry on every restart
+        try:
+            (self.venv_path / PIP_UPGRADE_MARKER).write_text(json.dumps(self._executables_fingerprint()))
+        except OSError as e:
+            logger.debug(f"Could not record the pip upgrade: {e}")
     
     def get_installed_packages(self, force_refresh: bool = False) -> Dict[str, str]:
-        """Get list of installed packages and their versions"""
-        if self._installed_packages is None or force_refresh:
-            try:
-                result = subprocess.run([
-                    str(self.pip_executable), "list", "--format=json"
-                ], check=True, capture_output=True, text=True)
-                
-                packages_list = json.loads(result.stdout)
-                self._installed_packages = {
-                    pkg["name"].lower(): pkg["version"] 
-                    for pkg in packages_list
-                }
-                
-            except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
-                logger.error(f"Failed to get installed packages: {e}")
-                self._installed_packages = {}
-        
+        """Get installed packages and their versions
+
+        Read from the ``*.dist-info`` metadata in the venv's site-packages
+        rather than ``pip list``, and cached until a site-packages directory
+        changes (installing, upgrading or removing a package adds or removes
+        a metadata directory, which updates its modification time).
+        """
+        site_dirs = self._site_packages_dirs()
+        key = self._site_packages_key(site_dirs)
+        if self._installed_packages is None or force_refresh or key != self._installed_packages_key:
+            if site_dirs:
+                packages = {}
+                for site_dir in site_dirs:
+                    packages.update(self._read_site_packages(site_dir))
+                self._installed_packages = packages
+            else:
+                self._installed_packages = self._list_packages_with_pip()
+            self._installed_packages_key = key
+
         return self._installed_packages.copy()
+
+    def _site_packages_dirs(self) -> List[Path]:
+        """The venv's site-packages directories"""
+        if os.name == 'nt':
+            candidates = [self.venv_path / "Lib" / "site-packages"]
+        else:
+            candidates = sorted(self.venv_path.glob("lib/python*/site-packages"))
+        return [path for path in candidates if path.is_dir()]
+
+    @staticmethod
+    def _site_packages_key(site_dirs: List[Path]) -> tuple:
+        """Modification times of the site-packages directories"""
+        key = []
+        for site_dir in site_dirs:
+            try:
+                key.append((str(site_dir), site_dir.stat().st_mtime_ns))
+            except OSError:
+                key.append((str(site_dir), None))
+        return tuple(key)
+
+    @staticmethod
+    def _read_metadata_headers(path: Path) -> Dict[str, str]:
+        """Header fields of a METADATA or PKG-INFO file (the lines before the description)"""
+        headers = {}
+        with open(path, encoding='utf-8', errors='replace') as metadata:
+            for line in metadata:
+                if not line.strip():
+                    break
+                name, sep, value = line.partition(':')
+                if sep and not line[0].isspace():
+                    headers.setdefault(name.strip().lower(), value.strip())
+        return headers
+
+    def _read_site_packages(self, site_dir: Path) -> Dict[str, str]:
+        """Package names (lowercased) and versions installed in ``site_dir``"""
+        packages = {}
+        for entry in os.scandir(site_dir):
+            if entry.name.endswith('.dist-info'):
+                metadata = Path(entry.path) / "METADATA"
+            elif entry.name.endswith('.egg-info'):
+                metadata = Path(entry.path) / "PKG-INFO" if entry.is_dir() else Path(entry.path)
+            else:
+                continue
+            try:
+                headers = self._read_metadata_headers(metadata)
+            except OSError as e:
+                logger.debug(f"Skipping unreadable package metadata {metadata}: {e}")
+                continue
+            if headers.get('name') and headers.get('version'):
+                packages[headers['name'].lower()] = headers['version']
+        return packages
+
+    def _list_packages_with_pip(self) -> Dict[str, str]:
+        """Installed packages from ``pip list``, for venvs without a site-packages directory we recognise"""
+        try:
+            result = subprocess.run([
+                str(self.pip_executable), "list", "--format=json"
+            ], check=True, capture_output=True, text=True)
+
+            return {pkg["name"].lower(): pkg["version"] for pkg in json.loads(result.stdout)}
+
+        except (OSError, subprocess.CalledProcessError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to get installed packages: {e}")
+            return {}
     
     def parse_requirements(self, requirements: List[str]) -> Dict[str, str]:
         """Parse requirements list into package name and version mapping"""
@@ -231,40 +323,86 @@ class VirtualEnvironmentManager:
             logger.error(f"Failed to uninstall package {package_name}: {e}")
             return False
     
+    def _executables_fingerprint(self) -> tuple:
+        """Identity of the venv python and pip executables, changes when either is replaced"""
+        fingerprint = []
+        for executable in (self.python_venv_executable, self.pip_executable):
+            try:
+                stat = executable.stat()
+                fingerprint.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                fingerprint.append(None)
+        return tuple(fingerprint)
+
+    def _pyvenv_python_version(self) -> Optional[str]:
+        """Interpreter version recorded in pyvenv.cfg when the venv was created"""
+        try:
+            with open(self.venv_path / "pyvenv.cfg", encoding='utf-8') as config:
+                for line in config:
+                    name, sep, value = line.partition('=')
+                    if sep and name.strip() in ('version', 'version_info'):
+                        return value.strip()
+        except OSError:
+            pass
+        return None
+
     def get_environment_info(self) -> Dict[str, str]:
-        """Get virtual environment information"""
+        """Get virtual environment information (cached until the executables change)
+
+        Versions come from pyvenv.cfg and pip's package metadata, so no
+        process is spawned unless pyvenv.cfg has no version.
+        """
+        key = self._executables_fingerprint()
+        if self._environment_info is not None and key == self._environment_info_key:
+            return self._environment_info
+
         try:
-            # Get Python version
-            python_version_result = subprocess.run([
-                str(self.python_venv_executable), "--version"
-            ], capture_output=True, text=True)
-            
-            # Get pip version
-            pip_version_result = subprocess.run([
-                str(self.pip_executable), "--version"
-            ], capture_output=True, text=True)
+            python_version = self._pyvenv_python_version()
+            if python_version:
+                python_version = f"Python {python_version}"
+            else:
+                python_version = subprocess.run([
+                    str(self.python_venv_executable), "--version"
+                ], capture_output=True, text=True).stdout.strip()
+
+            pip_version = self.get_installed_packages().get("pip")
             
-            return {
+            self._environment_info = {
                 "venv_path": str(self.venv_path),
-                "python_version": python_version_result.stdout.strip(),
-                "pip_version": pip_version_result.stdout.strip(),
+                "python_version": python_version,
+                "pip_version": f"pip {pip_version}" if pip_version else "",
                 "python_executable": str(self.python_venv_executable),
                 "pip_executable": str(self.pip_executable)
             }
             
         except Exception as e:
             logger.error(f"Failed to get environment info: {e}")
-            return {}
+            self._environment_info = {}
+
+        self._environment_info_key = key
+        return self._environment_info
     
-    def execute_in_venv(self, command: List[str], **kwargs) -> subprocess.CompletedProcess:
-        """Execute a command in the virtual environment"""
-        # Prepare environment variables
+    def get_venv_environment(self) -> Dict[str, str]:
+        """Get environment variables that activate the virtual environment"""
         env = os.environ.copy()
         env["VIRTUAL_ENV"] = str(self.venv_path)
         env["PATH"] = f"{self.venv_path / 'bin'}:{env.get('PATH', '')}"
         
         if os.name == 'nt':
             env["PATH"] = f"{self.venv_path / 'Scripts'};{env.get('PATH', '')}"
+
+        return env
+
+    def get_python_executable(self) -> str:
+        """Get the interpreter tasks should run with (venv python if available)"""
+        if self.python_venv_executable.exists():
+            return str(self.python_venv_executable)
+        return sys.executable
+
+    def execute_in_venv(self, command: List[str], **kwargs) -> subprocess.CompletedProcess:
+        """Execute a command in the virtual environment"""
+        # Prepare environment variables
+        env = self.get_venv_environment()
         
         # Execute command
         return subprocess.run(command, env=env, **kwargs)
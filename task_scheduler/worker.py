@@ -0,0 +1,128 @@
+"""
+Worker process for running tasks outside the scheduler process
+
+Started by ProcessWorkerPool as ``<venv>/bin/python -m task_scheduler.worker``.
+Reads one JSON request per line from stdin and writes one JSON response per
+line to the original stdout. Anything the task prints goes to stderr so it
+cannot corrupt the protocol stream.
+"""
+
+import json
+import os
+import sys
+import time
+import traceback
+import importlib.util
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def get_peak_rss_mb() -> float:
+    """Peak resident set size of this worker process in MB"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    if sys.platform == 'darwin':
+        return peak / 1024 / 1024
+    return peak / 1024
+
+
+class TaskModuleCache:
+    """Loads task modules once and reloads them when the file changes"""
+
+    def __init__(self):
+        from task_scheduler.bytecode_cache import BytecodeCache
+
+        self._modules: Dict[str, Tuple[float, Any]] = {}
+        # Shared with the scheduler, which passes the directory in the environment
+        self.bytecode_cache = BytecodeCache(os.environ.get("TASK_SCHEDULER_BYTECODE_DIR"))
+
+    def get_module(self, task_path: Path):
+        """Get the loaded module for a task file, (re)loading it if needed"""
+        from task_scheduler.task_parser import TaskParser
+
+        mtime = task_path.stat().st_mtime
+        cached = self._modules.get(str(task_path))
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        task_file = TaskParser().parse_file(task_path)
+        module_name = f"task_{task_path.stem}_{int(time.time())}"
+        spec = importlib.util.spec_from_loader(module_name, loader=None)
+        module = importlib.util.module_from_spec(spec)
+        module.__file__ = str(task_path)
+        exec(self.bytecode_cache.get_code(task_file.content, str(task_path), task_file.body_line), module.__dict__)
+
+        self._modules[str(task_path)] = (mtime, module)
+        return module
+
+
+def run_request(request: Dict[str, Any], cache: TaskModuleCache) -> Dict[str, Any]:
+    """Execute a single task invocation and describe the outcome"""
+    start_time = time.time()
+    response = {"id": request.get("id"), "status": "success", "error": None, "traceback": None}
+
+    try:
+        module = cache.get_module(Path(request["path"]))
+        func = getattr(module, request["function"])
+        # Run the undecorated function; tracking happens in the scheduler process
+        func = getattr(func, '_original_func', func)
+        func()
+    except SystemExit as e:
+        # A task calling sys.exit() must not take the worker down with it
+        if e.code not in (0, None):
+            response["status"] = "failed"
+            response["error"] = f"SystemExit: {e.code}"
+    except Exception as e:
+        response["status"] = "failed"
+        response["error"] = f"{e.__class__.__name__}: {e}"
+        response["traceback"] = traceback.format_exc()
+
+    response["duration"] = time.time() - start_time
+    response["peak_rss_mb"] = get_peak_rss_mb()
+    response["pid"] = os.getpid()
+    return response
+
+
+def main() -> int:
+    """Serve task invocations until stdin is closed"""
+    # Keep a private handle on stdout for the protocol and send prints to stderr
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), 'w', buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    def send(message: Dict[str, Any]):
+        protocol_out.write(json.dumps(message) + "\n")
+        protocol_out.flush()
+
+    # Pre-import the shared code so individual runs do not pay for it
+    for module_name in ("task_scheduler.decorators", "task_scheduler.task_parser", "helpers"):
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            print(f"Worker could not pre-import {module_name}: {e}", file=sys.stderr)
+
+    cache = TaskModuleCache()
+    send({"ready": True, "pid": os.getpid()})
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            send({"id": None, "status": "failed", "error": f"Invalid request: {e}"})
+            continue
+        send(run_request(request, cache))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
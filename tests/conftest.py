@@ -33,3 +33,74 @@ def tasks_dir(project_root):
 def config_path(project_root):
     """Fixture providing the config file path"""
     return project_root / "config" / "config.yaml"
+
+
+SCHEDULER_CONFIG = """
+scheduler:
+  max_workers: 4
+  max_memory_usage: 4096
+  control_socket: false
+database:
+  path: "scheduler.db"
+virtual_env:
+  path: "venv"
+  python_executable: "python3"
+tasks:
+  directory: "tasks"
+  include_example_tasks: true
+  watch_mode: "off"
+"""
+
+
+@pytest.fixture
+def scheduler(tmp_path, monkeypatch):
+    """Fixture providing a TaskScheduler for an empty scratch project (not started)"""
+    import signal
+    import schedule
+    from task_scheduler import decorators
+    from task_scheduler.scheduler import TaskScheduler
+
+    (tmp_path / "config").mkdir()
+    config_path = tmp_path / "config" / "config.yaml"
+    config_path.write_text(SCHEDULER_CONFIG)
+    monkeypatch.chdir(tmp_path)  # No helpers directory to install from
+    previous_tracker = decorators._task_tracker
+    previous_handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGTERM, signal.SIGINT)}
+    decorators.get_job_registry().clear()
+    schedule.clear()
+
+    task_scheduler = TaskScheduler(config_path)
+    yield task_scheduler
+
+    task_scheduler.executor.shutdown(wait=True)
+    task_scheduler.timeout_supervisor.stop()
+    task_scheduler.journal.close()
+    task_scheduler.db_manager.close()
+    decorators.get_job_registry().clear()
+    schedule.clear()
+    schedule._cron_like_jobs = {}
+    decorators.set_task_tracker(previous_tracker)
+    for signum, handler in previous_handlers.items():
+        signal.signal(signum, handler)
+
+
+@pytest.fixture
+def subprocess_calls(monkeypatch):
+    """Fixture recording the commands venv_manager would run instead of running them"""
+    from task_scheduler import venv_manager
+
+    calls = []
+    monkeypatch.setattr(venv_manager.subprocess, "run", lambda cmd, **kwargs: calls.append(cmd))
+    return calls
+
+
+@pytest.fixture
+def fake_venv(tmp_path, subprocess_calls):
+    """Fixture providing a venv directory that passes the validity check, with an empty site-packages"""
+    path = tmp_path / "venv"
+    (path / "bin").mkdir(parents=True)
+    for name in ("python", "pip"):
+        (path / "bin" / name).write_text("")
+    (path / "lib" / "python3.11" / "site-packages").mkdir(parents=True)
+    (path / "pyvenv.cfg").write_text("home = /usr/bin\nversion = 3.11.7\n")
+    return path
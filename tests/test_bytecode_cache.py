@@ -0,0 +1,97 @@
+"""
+Test the compiled code cache used to load task modules
+"""
+
+import importlib.util
+import tempfile
+import traceback
+from pathlib import Path
+from task_scheduler.bytecode_cache import CACHE_SUFFIX, BytecodeCache
+from task_scheduler.memory_manager import TaskModuleManager
+from task_scheduler.task_parser import TaskParser
+
+
+TASK = '''"""
+---
+title: "Failing task"
+description: "Raises on line 10 of the file"
+---
+"""
+
+
+def start():
+    raise RuntimeError("{message}")
+'''
+
+
+class TestBytecodeCache:
+    """Test memory and disk hits, invalidation and traceback line numbers"""
+
+    def setup_method(self):
+        """Create a task file and a cache directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.temp_dir.name) / "bytecode"
+        self.task_path = Path(self.temp_dir.name) / "failing.py"
+        self.task_path.write_text(TASK.format(message="v1"))
+
+    def teardown_method(self):
+        """Remove the temporary directory"""
+        self.temp_dir.cleanup()
+
+    def test_compiles_once_per_content(self):
+        """Test that reloads and restarts reuse the compiled code"""
+        cache = BytecodeCache(self.cache_dir)
+        source = "x = 1\n"
+        first = cache.get_code(source, str(self.task_path))
+        assert cache.get_code(source, str(self.task_path)) is first
+
+        restarted = BytecodeCache(self.cache_dir)
+        restarted.get_code(source, str(self.task_path))
+        assert cache.stats["compiles"] == 1 and cache.stats["memory_hits"] == 1
+        assert restarted.stats["disk_hits"] == 1 and restarted.stats["compiles"] == 0
+
+    def test_changed_source_replaces_entry(self):
+        """Test that new content is compiled and the old disk entry removed"""
+        cache = BytecodeCache(self.cache_dir)
+        namespace = {}
+        cache.get_code("x = 1\n", str(self.task_path))
+        exec(cache.get_code("x = 2\n", str(self.task_path)), namespace)
+        assert namespace["x"] == 2
+        assert len(list(self.cache_dir.glob(f"*{CACHE_SUFFIX}"))) == 1
+
+    def test_restart_replaces_entry_of_previous_run(self):
+        """Test that an entry written before a restart is removed when the file changes"""
+        BytecodeCache(self.cache_dir).get_code("x = 1\n", str(self.task_path))
+        other = str(self.task_path.with_name("other.py"))
+        BytecodeCache(self.cache_dir).get_code("y = 1\n", other)
+
+        restarted = BytecodeCache(self.cache_dir)
+        restarted.get_code("x = 2\n", str(self.task_path))
+        names = sorted(entry.name.split(".")[0] for entry in self.cache_dir.glob(f"*{CACHE_SUFFIX}"))
+        assert names == ["failing", "other"]
+        assert restarted._read(str(self.task_path), restarted.make_key("x = 2\n", str(self.task_path)))
+
+    def test_foreign_magic_is_ignored(self):
+        """Test that an entry written by another interpreter version is recompiled"""
+        cache = BytecodeCache(self.cache_dir)
+        cache.get_code("x = 1\n", str(self.task_path))
+        entry = next(self.cache_dir.glob(f"*{CACHE_SUFFIX}"))
+        entry.write_bytes(b"\0\0\0\0" + entry.read_bytes()[len(importlib.util.MAGIC_NUMBER):])
+
+        restarted = BytecodeCache(self.cache_dir)
+        restarted.get_code("x = 1\n", str(self.task_path))
+        assert restarted.stats["compiles"] == 1
+
+    def test_tracebacks_point_at_task_file(self):
+        """Test that a loaded task reports its real filename and line number"""
+        task_file = TaskParser().parse_file(self.task_path)
+        manager = TaskModuleManager(BytecodeCache(self.cache_dir))
+        module = manager.load_task_module(task_file.path, task_file.content, first_line=task_file.body_line)
+
+        try:
+            module.start()
+        except RuntimeError as e:
+            frame = traceback.extract_tb(e.__traceback__)[-1]
+        assert frame.filename == str(self.task_path)
+        assert frame.lineno == 10
+        assert frame.line == 'raise RuntimeError("v1")'
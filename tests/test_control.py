@@ -0,0 +1,95 @@
+"""
+Test the control socket of a running scheduler
+"""
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+import pytest
+from task_scheduler.control import ControlError, ControlServer, read_pid_file, send_command
+
+
+class TestControlServer:
+    """Test commands, errors and discovery through the PID file"""
+
+    def setup_method(self):
+        """Start a server with a few handlers"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        data_dir = Path(self.temp_dir.name)
+        self.socket_path = data_dir / "control.sock"
+        self.pid_path = data_dir / "scheduler.pid"
+        self.paused = set()
+
+        def pause(task):
+            if task == "missing":
+                raise ControlError(f"Task {task} is not loaded")
+            self.paused.add(task)
+            return {"task": task, "paused": True}
+
+        self.server = ControlServer(self.socket_path, self.pid_path, {
+            "ping": lambda: {"pid": os.getpid()},
+            "pause": pause,
+        })
+        assert self.server.start()
+
+    def teardown_method(self):
+        """Stop the server"""
+        self.server.stop()
+        self.temp_dir.cleanup()
+
+    def test_command_round_trip(self):
+        """Test that commands reach their handler with their arguments"""
+        assert send_command(self.socket_path, "ping") == {"pid": os.getpid()}
+        assert send_command(self.socket_path, "pause", task="backup") == {"task": "backup", "paused": True}
+        assert self.paused == {"backup"}
+
+    def test_errors_are_reported(self):
+        """Test that unknown commands and failing handlers come back as ControlError"""
+        with pytest.raises(ControlError, match="Unknown command"):
+            send_command(self.socket_path, "explode")
+        with pytest.raises(ControlError, match="not loaded"):
+            send_command(self.socket_path, "pause", task="missing")
+        with pytest.raises(ControlError):
+            send_command(self.socket_path, "pause")  # Missing argument
+        assert send_command(self.socket_path, "ping")  # Still serving
+
+    def test_concurrent_clients(self):
+        """Test that several clients are served at once"""
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(send_command(self.socket_path, "ping")))
+                   for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(results) == 20
+
+    def test_pid_file_discovery(self):
+        """Test that the PID file points at this process and goes away on stop"""
+        pid_file = read_pid_file(self.pid_path)
+        assert pid_file["pid"] == os.getpid()
+        assert Path(pid_file["socket"]) == self.socket_path
+
+        self.server.stop()
+        assert read_pid_file(self.pid_path) is None
+        assert not self.socket_path.exists()
+        with pytest.raises(ConnectionError):
+            send_command(self.socket_path, "ping")
+
+    def test_socket_in_use_is_not_taken_over(self):
+        """Test that a second scheduler does not steal a live socket"""
+        second = ControlServer(self.socket_path, self.pid_path, {})
+        assert second.start() is False
+        assert send_command(self.socket_path, "ping")
+
+    def test_stale_socket_is_replaced(self):
+        """Test that a socket file left by a crashed scheduler is reused"""
+        self.server.stop()
+        self.socket_path.touch()
+        replacement = ControlServer(self.socket_path, self.pid_path, {"ping": lambda: "pong"})
+        try:
+            assert replacement.start()
+            assert send_command(self.socket_path, "ping") == "pong"
+        finally:
+            replacement.stop()
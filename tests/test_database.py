@@ -0,0 +1,133 @@
+"""
+Test persistent per-thread database connections and the epoch schema
+"""
+
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from task_scheduler.database import DatabaseManager, TaskSchedule, SCHEMA_VERSION, to_epoch
+
+
+LEGACY_SCHEMA = """
+    CREATE TABLE task_executions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_name TEXT NOT NULL,
+        execution_time TIMESTAMP NOT NULL,
+        next_run_time TIMESTAMP,
+        status TEXT NOT NULL,
+        duration REAL NOT NULL,
+        error_message TEXT,
+        retry_count INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE task_schedules (
+        task_name TEXT PRIMARY KEY,
+        next_run_time TIMESTAMP NOT NULL,
+        schedule_config TEXT NOT NULL,
+        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        is_active BOOLEAN DEFAULT 1
+    );
+    CREATE TABLE scheduler_state (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX idx_task_executions_name ON task_executions(task_name);
+    CREATE INDEX idx_task_executions_time ON task_executions(execution_time);
+    CREATE INDEX idx_task_schedules_next_run ON task_schedules(next_run_time);
+"""
+
+
+class TestDatabaseConnections:
+    """Test connection reuse and concurrent access"""
+
+    def setup_method(self):
+        """Create a database in a temporary directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(Path(self.temp_dir.name) / "test.db")
+
+    def teardown_method(self):
+        """Close connections and remove the database"""
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def test_connection_is_reused_per_thread(self):
+        """Test that a thread keeps one connection and other threads get their own"""
+        conn = self.db._get_connection()
+        assert self.db._get_connection() is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(self.db._get_connection()))
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+
+    def test_reads_do_not_wait_for_writer(self):
+        """Test that a read completes while another thread holds the write lock"""
+        now = datetime.now().replace(microsecond=0)
+        self.db.update_task_schedule(TaskSchedule("reader_test", now, "", now))
+
+        result = []
+        with self.db._write_lock:
+            thread = threading.Thread(target=lambda: result.append(self.db.get_task_schedule("reader_test")))
+            thread.start()
+            thread.join(timeout=5)
+        assert result and result[0].next_run_time == now
+
+    def test_close_reopens_on_next_use(self):
+        """Test that the manager stays usable after close()"""
+        self.db.set_scheduler_state("key", "value")
+        self.db.close()
+        assert self.db.get_scheduler_state("key") == "value"
+
+
+class TestEpochSchema:
+    """Test integer epoch storage and migration from ISO text"""
+
+    def setup_method(self):
+        """Create a temporary directory for databases"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / "test.db"
+
+    def teardown_method(self):
+        """Remove the temporary directory"""
+        self.temp_dir.cleanup()
+
+    def test_legacy_iso_database_is_migrated(self):
+        """Test that ISO text times written by older versions become epoch microseconds"""
+        next_run = datetime(2025, 7, 1, 12, 30)
+        executed = datetime(2025, 7, 1, 12, 25, 3, 500000)
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(LEGACY_SCHEMA)
+        conn.execute("INSERT INTO task_schedules VALUES (?, ?, ?, ?, ?)",
+                     ("legacy", next_run.isoformat(), "Every 5 minutes", str(executed), 1))
+        conn.execute("""INSERT INTO task_executions
+                        (task_name, execution_time, next_run_time, status, duration)
+                        VALUES (?, ?, ?, ?, ?)""", ("legacy", str(executed), str(next_run), "success", 1.5))
+        conn.commit()
+        conn.close()
+
+        db = DatabaseManager(self.db_path)
+        schedule = db.get_task_schedule("legacy")
+        assert schedule.next_run_time == next_run
+        assert schedule.schedule_config == "Every 5 minutes"
+        execution = db.get_last_execution("legacy")
+        assert execution.execution_time == executed
+        assert execution.next_run_time == next_run
+        assert [s.task_name for s in db.get_overdue_tasks(next_run + timedelta(seconds=1))] == ["legacy"]
+
+        raw = db._get_connection().execute("SELECT next_run_time FROM task_schedules").fetchone()[0]
+        assert raw == to_epoch(next_run)
+        assert db._get_connection().execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        db.close()
+
+    def test_overdue_query_uses_index(self):
+        """Test that the overdue query is an index range search, not a table scan"""
+        db = DatabaseManager(self.db_path)
+        details = " ".join(db.explain_overdue_query(datetime.now()))
+        assert "idx_task_schedules_due" in details
+        assert "TEMP B-TREE" not in details
+        db.close()
@@ -0,0 +1,224 @@
+"""
+Test dispatching task runs from the scheduler to the worker pool
+"""
+
+import time
+from datetime import datetime, timedelta
+import pytest
+import schedule
+from task_scheduler.control import ControlError
+
+TASK_TEMPLATE = '''"""
+---
+title: "{name}"
+dependencies: []
+enabled: true
+max_concurrency: {max_concurrency}
+---
+"""
+import time
+from task_scheduler.decorators import repeat, every
+
+
+@repeat(every(10).minutes)
+def start():
+    time.sleep({seconds})
+'''
+
+GLOBALS_TASK = '''"""
+---
+title: "Uses its globals after a delay"
+dependencies: []
+enabled: true
+---
+"""
+import time
+from pathlib import Path
+from task_scheduler.decorators import repeat, every
+
+RESULT = "finished"
+
+
+@repeat(every(10).minutes)
+def start():
+    time.sleep(0.5)
+    Path(__file__).with_suffix(".out").write_text(RESULT)
+'''
+
+RETRIED_TASK = '''"""
+---
+title: "Fails once, then uses its globals after a delay"
+dependencies: []
+enabled: true
+retry_count: 1
+retry_delay: 0
+---
+"""
+import time
+from pathlib import Path
+from task_scheduler.decorators import repeat, every
+
+RESULT = "finished"
+
+
+@repeat(every(10).minutes)
+def start():
+    marker = Path(__file__).with_suffix(".failed")
+    if not marker.exists():
+        marker.write_text("")
+        raise RuntimeError("first attempt fails")
+    time.sleep(0.5)
+    Path(__file__).with_suffix(".out").write_text(RESULT)
+'''
+
+
+def load_source(scheduler, name, source, force=False):
+    """Write a task file and load it; returns its job"""
+    path = scheduler.tasks_dir / f"{name}.py"
+    path.write_text(source)
+    assert scheduler._load_task(scheduler.task_parser.parse_file(path), force=force)
+    job, = scheduler.job_registry.get_jobs(name)
+    return job
+
+
+def load_task(scheduler, name, max_concurrency=1, seconds=0.5):
+    """Write a task that sleeps for ``seconds`` and load it; returns its job"""
+    return load_source(scheduler, name,
+                       TASK_TEMPLATE.format(name=name, max_concurrency=max_concurrency, seconds=seconds))
+
+
+def make_due(job):
+    """Move a job's next run into the past"""
+    job.next_run = datetime.now() - timedelta(seconds=1)
+
+
+def wait_until_running(scheduler, task_name, count=1, timeout=5):
+    """Wait until ``count`` runs of a task have started"""
+    deadline = time.monotonic() + timeout
+    while scheduler.task_tracker.get_running_count(task_name) < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def wait_until_idle(scheduler, timeout=5):
+    """Wait for every run on the worker pool to finish"""
+    deadline = time.monotonic() + timeout
+    while scheduler.executor.get_stats()["active"] or scheduler.executor.get_stats()["queued"]:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+class TestOverlappingRuns:
+    """Test that max_concurrency lets a task's scheduled runs overlap"""
+
+    def test_single_run_at_a_time_by_default(self, scheduler):
+        """Test that a job is requeued only when its run finishes"""
+        job = load_task(scheduler, "single")
+        make_due(job)
+        assert scheduler._dispatch_job(job)
+        assert not scheduler.timer_queue.contains(job)
+        assert not scheduler._dispatch_job(job)
+
+        wait_until_idle(scheduler)
+        assert scheduler.timer_queue.contains(job)
+        assert job.next_run > datetime.now()
+
+    def test_runs_overlap_up_to_the_limit(self, scheduler):
+        """Test that runs overlap up to max_concurrency and a run over the limit is skipped"""
+        job = load_task(scheduler, "parallel", max_concurrency=2)
+        for _ in range(2):
+            make_due(job)
+            assert scheduler._dispatch_job(job)
+            # Requeued for its next run while the first run is still going
+            assert scheduler.timer_queue.contains(job)
+            assert job.next_run > datetime.now()
+        assert scheduler.executor.running_count(job) == 2
+
+        make_due(job)
+        assert not scheduler._dispatch_job(job)
+        assert scheduler.timer_queue.contains(job)
+        assert job.next_run > datetime.now()
+
+        wait_until_running(scheduler, "parallel", count=2)
+        wait_until_idle(scheduler)
+        assert scheduler.executor.running_count(job) == 0
+
+
+class TestUnscheduling:
+    """Test that completed runs only requeue jobs that are still registered"""
+
+    def test_unloaded_job_is_not_requeued(self, scheduler):
+        """Test that a run finishing after its task was removed leaves the job out of the queue"""
+        job = load_task(scheduler, "removed")
+        make_due(job)
+        assert scheduler._dispatch_job(job)
+        scheduler._remove_task_from_schedule("removed")
+        assert id(job) not in schedule._cron_like_jobs
+
+        wait_until_idle(scheduler)
+        assert not scheduler.timer_queue.contains(job)
+
+
+class TestRetiredModules:
+    """Test that a replaced module is kept until its runs have finished"""
+
+    def test_reload_while_run_in_flight(self, scheduler):
+        """Test that a run of the previous version can still use its globals"""
+        job = load_source(scheduler, "slow", GLOBALS_TASK)
+        make_due(job)
+        assert scheduler._dispatch_job(job)
+        wait_until_running(scheduler, "slow")
+
+        load_source(scheduler, "slow", GLOBALS_TASK, force=True)
+        scheduler._release_retired_modules()
+        assert scheduler.task_module_manager.get_stats()["retiring"] == 1
+
+        wait_until_idle(scheduler)
+        assert (scheduler.tasks_dir / "slow.out").read_text() == "finished"
+        scheduler._release_retired_modules()
+        assert scheduler.task_module_manager.get_stats()["retiring"] == 0
+
+    def test_reload_while_retry_in_flight(self, scheduler):
+        """Test that a retry of the previous version can still use its globals"""
+        job = load_source(scheduler, "flaky", RETRIED_TASK)
+        make_due(job)
+        assert scheduler._dispatch_job(job)
+        wait_until_idle(scheduler)
+        retry, = scheduler.timer_queue.pop_due(time.time() + 1)
+        assert scheduler._dispatch_job(retry)
+        wait_until_running(scheduler, "flaky")
+
+        load_source(scheduler, "flaky", RETRIED_TASK, force=True)
+        scheduler._release_retired_modules()
+        assert scheduler.task_module_manager.get_stats()["retiring"] == 1
+
+        wait_until_idle(scheduler)
+        assert (scheduler.tasks_dir / "flaky.out").read_text() == "finished"
+
+
+class TestTriggers:
+    """Test that runs triggered through the control socket are dispatched like due jobs"""
+
+    def test_reload_while_trigger_in_flight(self, scheduler):
+        """Test that a triggered run of the previous version can still use its globals"""
+        load_source(scheduler, "slow", GLOBALS_TASK)
+        assert scheduler._run_task_now("slow") == {"task": "slow", "dispatched": True}
+        assert scheduler._is_task_busy("slow")
+        with pytest.raises(ControlError):
+            scheduler._run_task_now("slow")
+        wait_until_running(scheduler, "slow")
+
+        scheduler._reload_task("slow")
+        assert scheduler.task_module_manager.get_stats()["retiring"] == 1
+
+        wait_until_idle(scheduler)
+        assert (scheduler.tasks_dir / "slow.out").read_text() == "finished"
+        assert not scheduler._is_task_busy("slow")
+
+    def test_paused_task_is_not_triggered(self, scheduler):
+        """Test that a trigger is rejected while its task is paused"""
+        load_source(scheduler, "slow", GLOBALS_TASK)
+        scheduler._pause_task("slow")
+        with pytest.raises(ControlError, match="paused"):
+            scheduler._run_task_now("slow")
+        assert scheduler.executor.in_flight_jobs() == []
@@ -0,0 +1,80 @@
+"""
+Test the worker pool and thread-safe task tracking
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from task_scheduler.executor import TaskExecutor
+from task_scheduler.decorators import TaskTracker
+
+
+class TestTaskExecutor:
+    """Test dispatching jobs to the worker pool"""
+
+    def test_slow_job_does_not_block_dispatch(self):
+        """Test that submit returns immediately while the job runs on a worker"""
+        release = threading.Event()
+        finished = threading.Event()
+        executor = TaskExecutor(max_workers=2)
+        job = object()
+
+        start = time.monotonic()
+        assert executor.submit(job, lambda j: release.wait(5), lambda result: finished.set())
+        assert time.monotonic() - start < 0.5
+
+        # The same job cannot be dispatched twice while in flight
+        assert executor.submit(job, lambda j: None) is False
+        assert executor.is_running(job)
+
+        release.set()
+        assert finished.wait(5)
+        assert not executor.is_running(job)
+        executor.shutdown()
+
+    def test_limit_allows_overlapping_runs(self):
+        """Test that a job may be in flight up to ``limit`` times"""
+        release = threading.Event()
+        executor = TaskExecutor(max_workers=4)
+        job = object()
+
+        assert executor.submit(job, lambda j: release.wait(5), limit=2)
+        assert executor.submit(job, lambda j: release.wait(5), limit=2)
+        assert executor.submit(job, lambda j: None, limit=2) is False
+        assert executor.running_count(job) == 2
+        assert executor.in_flight_jobs() == [job, job]
+
+        release.set()
+        executor.shutdown(wait=True)
+        assert executor.running_count(job) == 0
+
+    def test_shutdown_rejects_new_jobs(self):
+        """Test that no jobs are accepted after shutdown"""
+        executor = TaskExecutor(max_workers=1)
+        executor.shutdown()
+        assert executor.submit(object(), lambda j: None) is False
+
+
+class TestTaskTrackerConcurrency:
+    """Test per-task concurrency limits"""
+
+    def test_max_concurrency_limit(self):
+        """Test that try_start_task honours max_concurrency from metadata"""
+        tracker = TaskTracker(db_manager=None)
+        tracker.set_task_settings("parallel", SimpleNamespace(max_concurrency=2))
+
+        assert tracker.try_start_task("parallel")
+        assert tracker.try_start_task("parallel")
+        assert not tracker.try_start_task("parallel")
+
+        tracker.set_task_running("parallel", False)
+        assert tracker.get_running_count("parallel") == 1
+        assert tracker.try_start_task("parallel")
+
+    def test_default_limit_is_one(self):
+        """Test that tasks without settings allow a single run at a time"""
+        tracker = TaskTracker(db_manager=None)
+
+        assert tracker.try_start_task("single")
+        assert tracker.is_task_running("single")
+        assert not tracker.try_start_task("single")
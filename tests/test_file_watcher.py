@@ -0,0 +1,90 @@
+"""
+Test change detection for task and helper files
+"""
+
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+import pytest
+from task_scheduler.file_watcher import InotifyWatcher, PollingWatcher, _load_libc
+
+
+class ChangeCollector:
+    """Collects reported paths and lets a test wait for them"""
+
+    def __init__(self):
+        self.paths = []
+        self.changed = threading.Condition()
+
+    def __call__(self, path):
+        with self.changed:
+            self.paths.append(path)
+            self.changed.notify_all()
+
+    def wait_for(self, path, timeout=5.0) -> bool:
+        with self.changed:
+            return self.changed.wait_for(lambda: path in self.paths, timeout)
+
+
+def make_inotify_watcher(directory, callback):
+    """The inotify backend"""
+    return InotifyWatcher([directory], callback)
+
+
+def make_polling_watcher(directory, callback):
+    """The stat polling backend, polling quickly"""
+    return PollingWatcher([directory], callback, interval=0.05)
+
+
+@pytest.mark.parametrize("make_watcher", [
+    pytest.param(make_inotify_watcher, id="inotify",
+                 marks=pytest.mark.skipif(_load_libc() is None, reason="inotify not available")),
+    pytest.param(make_polling_watcher, id="polling"),
+])
+class TestFileWatcher:
+    """Behaviour shared by all watcher backends"""
+
+    @pytest.fixture(autouse=True)
+    def watch_directory(self, make_watcher):
+        """Watch an empty temporary directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.temp_dir.name)
+        self.changes = ChangeCollector()
+        self.watcher = make_watcher(self.directory, self.changes)
+        self.watcher.start()
+        yield
+        self.watcher.stop()
+        self.temp_dir.cleanup()
+
+    def test_create_modify_delete(self):
+        """Test that each kind of change to a .py file is reported"""
+        task = self.directory / "task.py"
+        task.write_text("v1")
+        assert self.changes.wait_for(task)
+
+        self.changes.paths.clear()
+        time.sleep(0.01)  # Make sure the mtime moves on for the polling backend
+        task.write_text("version 2")
+        assert self.changes.wait_for(task)
+
+        self.changes.paths.clear()
+        task.unlink()
+        assert self.changes.wait_for(task)
+
+    def test_atomic_rename_is_reported(self):
+        """Test that an editor-style save (write then rename) reports the target"""
+        task = self.directory / "task.py"
+        tmp = self.directory / ".task.py.swp"
+        tmp.write_text("content")
+        os.replace(tmp, task)
+        assert self.changes.wait_for(task)
+
+    def test_other_files_are_ignored(self):
+        """Test that files without the watched suffix are not reported"""
+        (self.directory / "notes.txt").write_text("x")
+        (self.directory / "task.py").write_text("x")
+        assert self.changes.wait_for(self.directory / "task.py")
+        assert self.directory / "notes.txt" not in self.changes.paths
+
@@ -0,0 +1,67 @@
+"""
+Test reading installed packages from the venv's package metadata
+"""
+
+import os
+import pytest
+from task_scheduler.venv_manager import VirtualEnvironmentManager
+
+
+def add_package(site_packages, name, version, bump=0):
+    """Write a package's dist-info metadata and move the directory mtime forward"""
+    dist_info = site_packages / f"{name}-{version}.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+        f"Summary: A package\n\nName: not a header\n"
+    )
+    # Directory mtimes can be coarser than the time between two test steps
+    stat = site_packages.stat()
+    os.utime(site_packages, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump))
+
+
+class TestInstalledPackages:
+    """Test that installed packages are read in-process and cached by directory mtime"""
+
+    @pytest.fixture
+    def site_packages(self, fake_venv):
+        """The fake venv's site-packages directory"""
+        return fake_venv / "lib" / "python3.11" / "site-packages"
+
+    def test_packages_read_from_metadata(self, fake_venv, site_packages, subprocess_calls):
+        """Test names are lowercased, egg-info is read and no process is spawned"""
+        manager = VirtualEnvironmentManager(fake_venv)
+        add_package(site_packages, "PyYAML", "6.0.1")
+        (site_packages / "legacy-1.0.egg-info").write_text("Metadata-Version: 1.0\nName: legacy\nVersion: 1.0\n")
+        (site_packages / "broken-1.0.dist-info").mkdir()
+
+        assert manager.get_installed_packages() == {"pyyaml": "6.0.1", "legacy": "1.0"}
+        assert subprocess_calls == []
+
+    def test_cache_follows_directory_mtime(self, fake_venv, site_packages):
+        """Test a newly installed package is seen once site-packages changes"""
+        manager = VirtualEnvironmentManager(fake_venv)
+        add_package(site_packages, "requests", "2.31.0")
+        assert manager.get_installed_packages() == {"requests": "2.31.0"}
+
+        (site_packages / "requests-2.31.0.dist-info" / "METADATA").unlink()
+        assert manager.get_installed_packages() == {"requests": "2.31.0"}
+
+        add_package(site_packages, "psutil", "5.9.0", bump=1_000_000_000)
+        assert manager.get_installed_packages() == {"psutil": "5.9.0"}
+
+    def test_install_skips_installed_requirements(self, fake_venv, site_packages, subprocess_calls):
+        """Test that satisfied requirements spawn no pip process"""
+        manager = VirtualEnvironmentManager(fake_venv)
+        add_package(site_packages, "requests", "2.31.0")
+        assert manager.install_requirements(["requests", "requests==2.31.0"])
+        assert subprocess_calls == []
+
+    def test_environment_info_without_processes(self, fake_venv, site_packages, subprocess_calls):
+        """Test that versions come from pyvenv.cfg and pip's metadata"""
+        manager = VirtualEnvironmentManager(fake_venv)
+        add_package(site_packages, "pip", "24.0")
+        info = manager.get_environment_info()
+        assert info["python_version"] == "Python 3.11.7"
+        assert info["pip_version"] == "pip 24.0"
+        assert subprocess_calls == []
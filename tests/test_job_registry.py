@@ -0,0 +1,77 @@
+"""
+Test the job registry used for task name and wrapper lookups
+"""
+
+import schedule
+from task_scheduler.decorators import CronLikeJob, every, get_job_registry, repeat
+
+
+def make_task(module_name: str):
+    """Define a task start function as if loaded from a task module"""
+    def start():
+        pass
+    start.__module__ = module_name
+    return start
+
+
+class TestJobRegistry:
+    """Test registration, lookup and unregistration of jobs"""
+
+    def setup_method(self):
+        """Start from an empty schedule"""
+        self.registry = get_job_registry()
+        self.registry.clear()
+        schedule.clear()
+        schedule._cron_like_jobs = {}
+
+    def teardown_method(self):
+        """Leave no jobs behind for other tests"""
+        self.registry.clear()
+        schedule.clear()
+        schedule._cron_like_jobs = {}
+
+    def test_decorators_register_jobs(self):
+        """Test that both job kinds are found by task name and by wrapper"""
+        interval_wrapper = repeat(every(30).seconds)(make_task("task_interval_demo_1700000000"))
+        cron_wrapper = repeat(every(5).minutes)(make_task("task_cron_demo_1700000000"))
+
+        interval_job = self.registry.get_job("interval_demo")
+        cron_job = self.registry.get_job("cron_demo")
+        assert interval_job is schedule.jobs[0]
+        assert isinstance(cron_job, CronLikeJob)
+        assert self.registry.get_job_for_wrapper(interval_wrapper) is interval_job
+        assert self.registry.get_job_for_wrapper(cron_wrapper) is cron_job
+        assert self.registry.get_task_name_for_job(interval_job) == "interval_demo"
+        assert self.registry.get_task_name_for_job(cron_job) == "cron_demo"
+
+    def test_names_are_matched_exactly(self):
+        """Test that a task whose name ends with another's is not confused with it"""
+        repeat(every(5).minutes)(make_task("task_report_1700000000"))
+        repeat(every(5).minutes)(make_task("task_daily_report_1700000000"))
+
+        removed = self.registry.unregister("report")
+        assert len(removed) == 1
+        assert self.registry.get_job("report") is None
+        assert self.registry.get_job("daily_report") is not None
+
+    def test_unregister_selected_jobs_keeps_new_version(self):
+        """Test that a reload can drop the old version's jobs but keep the new ones"""
+        repeat(every(10).seconds)(make_task("task_reloaded_1700000000"))
+        old_jobs = self.registry.get_jobs("reloaded")
+        repeat(every(20).seconds)(make_task("task_reloaded_1700000001"))
+
+        assert self.registry.unregister("reloaded", old_jobs) == old_jobs
+        remaining = self.registry.get_jobs("reloaded")
+        assert len(remaining) == 1 and remaining[0].interval == 20
+
+    def test_jobs_are_tracked_by_identity(self):
+        """Test that is_registered matches the job itself, not an equal cron-like job"""
+        repeat(every(5).minutes)(make_task("task_first_1700000000"))
+        repeat(every(5).minutes)(make_task("task_second_1700000000"))
+        first, second = self.registry.get_job("first"), self.registry.get_job("second")
+        assert first == second  # Same next run
+
+        self.registry.unregister("first")
+        assert not self.registry.is_registered(first)
+        assert self.registry.is_registered(second)
+        assert len(self.registry) == 1
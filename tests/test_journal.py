@@ -0,0 +1,107 @@
+"""
+Test the write-behind execution journal
+"""
+
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from task_scheduler.database import DatabaseManager, TaskExecution, TaskSchedule
+from task_scheduler.journal import ExecutionJournal
+
+
+def make_execution(task_name: str) -> TaskExecution:
+    """Build a successful execution record"""
+    return TaskExecution(task_name, datetime.now(), None, "success", 0.01)
+
+
+class TestExecutionJournal:
+    """Test group commit, flushing and backpressure"""
+
+    def setup_method(self):
+        """Create a database in a temporary directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(Path(self.temp_dir.name) / "test.db")
+
+    def teardown_method(self):
+        """Close connections and remove the database"""
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def count_executions(self) -> int:
+        return self.db._get_connection().execute("SELECT COUNT(*) FROM task_executions").fetchone()[0]
+
+    def test_records_are_group_committed(self):
+        """Test that many records land in few transactions"""
+        journal = ExecutionJournal(self.db, flush_interval=0.5, batch_size=1000)
+        for i in range(200):
+            journal.record_execution(make_execution(f"task_{i}"))
+        now = datetime.now().replace(microsecond=0)
+        journal.update_task_schedule(TaskSchedule("task_0", now, "", now))
+
+        assert journal.flush(timeout=5)
+        assert self.count_executions() == 200
+        assert self.db.get_task_schedule("task_0").next_run_time == now
+        assert journal.get_stats()["batches"] <= 2
+        journal.close()
+
+    def test_close_flushes_pending_records(self):
+        """Test that nothing queued is lost on shutdown"""
+        journal = ExecutionJournal(self.db, flush_interval=60, batch_size=1000)
+        for i in range(10):
+            journal.record_execution(make_execution("shutdown"))
+        journal.close()
+        assert self.count_executions() == 10
+
+    def test_full_queue_blocks_producers(self):
+        """Test that producers wait while the writer is stalled"""
+        journal = ExecutionJournal(self.db, flush_interval=0.01, batch_size=1, max_queue=2)
+        produced = threading.Event()
+
+        def produce():
+            for i in range(10):
+                journal.record_execution(make_execution("pressure"))
+            produced.set()
+
+        # Holding the write lock stalls the writer thread
+        with self.db._write_lock:
+            producer = threading.Thread(target=produce)
+            producer.start()
+            time.sleep(0.3)
+            assert not produced.is_set()
+        assert produced.wait(5)
+        journal.close()
+        assert self.count_executions() == 10
+        assert journal.get_stats()["backpressure_waits"] > 0
+
+    def test_schedule_updates_never_block(self):
+        """Test that schedule updates are coalesced instead of waiting for a full queue"""
+        journal = ExecutionJournal(self.db, flush_interval=0.01, batch_size=1, max_queue=1)
+        now = datetime.now().replace(microsecond=0)
+        updated = threading.Event()
+
+        def update():
+            for minute in range(10):
+                journal.update_task_schedule(TaskSchedule("busy", now.replace(minute=minute), "", now))
+            updated.set()
+
+        with self.db._write_lock:
+            filler = threading.Thread(target=lambda: [journal.record_execution(make_execution("fill"))
+                                                      for _ in range(3)])
+            filler.start()
+            deadline = time.monotonic() + 5
+            # The writer is stalled and a task thread waits for room in the queue
+            while not journal.get_stats()["backpressure_waits"]:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+            threading.Thread(target=update).start()
+            assert updated.wait(1)
+            assert journal.get_stats()["coalesced_schedules"]
+
+        filler.join(5)
+        assert journal.flush(timeout=5)
+        assert self.db.get_task_schedule("busy").next_run_time == now.replace(minute=9)
+        assert self.count_executions() == 3
+        journal.close()
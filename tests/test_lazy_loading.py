@@ -0,0 +1,153 @@
+"""
+Test lazy loading and idle eviction of task modules
+"""
+
+import tempfile
+import time
+import weakref
+from datetime import datetime, timedelta
+from pathlib import Path
+import schedule
+from task_scheduler.decorators import TaskTracker, get_job_registry, set_task_tracker
+from task_scheduler.lazy_loader import LazyModuleLoader
+from task_scheduler.memory_manager import TaskModuleManager
+
+
+TASK = '''from task_scheduler.decorators import repeat, every
+
+PAYLOAD = bytearray(64 * 1024)
+
+
+@repeat(every(10).seconds)
+def start():
+    return len(PAYLOAD)
+'''
+
+SCHEDULED_TASK = '''"""
+---
+title: "{name}"
+dependencies: []
+enabled: true
+---
+"""
+from task_scheduler.decorators import repeat, every
+
+
+@repeat(every(10).minutes)
+def start():
+    pass
+'''
+
+
+class RecordingDatabase:
+    """Collects execution records instead of writing them to SQLite"""
+
+    def __init__(self):
+        self.executions = []
+
+    def record_execution(self, execution):
+        self.executions.append(execution)
+
+    def update_task_schedule(self, schedule):
+        pass
+
+
+class TestLazyLoading:
+    """Test eviction, on-demand loading and LRU limits"""
+
+    def setup_method(self):
+        """Create task files and start from an empty schedule"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = TaskModuleManager()
+        self.registry = get_job_registry()
+        self.registry.clear()
+        schedule.clear()
+        self.loader = LazyModuleLoader(self.manager, self.registry, idle_timeout=3600)
+        self.tracker = TaskTracker(RecordingDatabase())
+        self.tracker.lazy_loader = self.loader
+        set_task_tracker(self.tracker)
+
+    def teardown_method(self):
+        """Leave no jobs behind for other tests"""
+        self.registry.clear()
+        schedule.clear()
+        self.temp_dir.cleanup()
+
+    def load(self, task_name: str):
+        """Load a task the way the scheduler does"""
+        path = Path(self.temp_dir.name) / f"{task_name}.py"
+        path.write_text(TASK)
+        module = self.manager.load_task_module(path, TASK)
+        self.loader.track(task_name, path, TASK)
+        return module
+
+    def test_evicted_task_stays_scheduled_and_reloads_on_run(self):
+        """Test that eviction frees the module but the next run still works"""
+        module = weakref.ref(self.load("nightly"))
+        job = schedule.jobs[0]
+
+        assert self.loader.evict_idle(lambda name: False, force=True) == ["nightly"]
+        self.manager.release_retired_modules()
+        assert module() is None
+        assert schedule.jobs == [job]
+        assert self.loader.is_resident("nightly") is False
+
+        assert job.job_func() == 64 * 1024
+        assert self.loader.is_resident("nightly") is True
+        assert schedule.jobs == [job]  # Reloading did not register another job
+        assert self.tracker.db_manager.executions[-1].status == "success"
+
+    def test_only_idle_tasks_are_evicted(self):
+        """Test that recently used and busy tasks stay loaded"""
+        self.loader.idle_timeout = 0
+        self.load("idle")
+        self.load("busy")
+        assert self.loader.evict_idle(lambda name: name == "busy") == ["idle"]
+
+        self.loader.idle_timeout = 3600
+        self.loader.ensure_loaded("idle")
+        assert self.loader.evict_idle(lambda name: False) == []
+
+    def test_least_recently_used_beyond_limit_are_evicted(self):
+        """Test that max_resident evicts the least recently used tasks first"""
+        self.loader.max_resident = 1
+        for task_name in ("a", "b", "c"):
+            self.load(task_name)
+        self.loader.ensure_loaded("a")
+
+        assert self.loader.evict_idle(lambda name: False) == ["b", "c"]
+        assert self.loader.get_stats()["resident"] == 1
+
+
+class TestPrefetch:
+    """Test that the scheduler loads evicted modules before their next run"""
+
+    def load_evicted(self, scheduler, name, next_run):
+        """Load a task, evict its module and move its next run; returns its job"""
+        path = scheduler.tasks_dir / f"{name}.py"
+        path.write_text(SCHEDULED_TASK.format(name=name))
+        assert scheduler._load_task(scheduler.task_parser.parse_file(path))
+        assert scheduler._evict_idle_modules(force=True) == [name]
+        job, = scheduler.job_registry.get_jobs(name)
+        job.next_run = next_run
+        return job
+
+    def test_modules_due_within_lead_are_loaded(self, scheduler):
+        """Test that only the task due within module_prefetch_lead is loaded ahead of its run"""
+        self.load_evicted(scheduler, "soon", datetime.now() + timedelta(seconds=10))
+        self.load_evicted(scheduler, "later", datetime.now() + timedelta(hours=1))
+
+        assert scheduler._prefetch_modules(time.time()) == ["soon"]
+        assert scheduler.lazy_loader.is_resident("soon") is True
+        assert scheduler.lazy_loader.is_resident("later") is False
+        assert scheduler.lazy_loader.evicted_tasks() == ["later"]
+
+    def test_task_due_within_lead_is_not_evicted(self, scheduler):
+        """Test that idle eviction keeps a module that would be prefetched again straight away"""
+        soon = self.load_evicted(scheduler, "soon", datetime.now() + timedelta(seconds=10))
+        self.load_evicted(scheduler, "later", datetime.now() + timedelta(hours=1))
+        scheduler._prefetch_modules(time.time() + 3600)
+        soon.next_run = datetime.now() + timedelta(seconds=10)
+
+        scheduler.lazy_loader.idle_timeout = 0
+        assert scheduler._evict_idle_modules() == ["later"]
@@ -0,0 +1,73 @@
+"""
+Test the tiered response to high memory usage
+"""
+
+import psutil
+from task_scheduler.memory_pressure import MemoryPressureResponder, PressureTier
+
+
+class FakeMemoryManager:
+    """Reports high usage until a tier relieves it"""
+
+    def __init__(self):
+        self.process = psutil.Process()
+        self.high = True
+
+    def is_memory_usage_high(self) -> bool:
+        return self.high
+
+
+class TestMemoryPressureResponder:
+    """Test tier ordering, escalation to restart and the cooldown"""
+
+    def setup_method(self):
+        """Create three tiers that record when they run"""
+        self.memory_manager = FakeMemoryManager()
+        self.ran = []
+
+        def tier(name, relieves=False):
+            def action():
+                self.ran.append(name)
+                if relieves:
+                    self.memory_manager.high = False
+            return PressureTier(name, action)
+
+        self.tier = tier
+
+    def test_stops_at_first_tier_that_helps(self):
+        """Test that more disruptive tiers are skipped once usage is under the limit"""
+        responder = MemoryPressureResponder(self.memory_manager, [
+            self.tier("caches"), self.tier("evict", relieves=True), self.tier("recycle")
+        ])
+        assert responder.respond(now=1000) is False
+        assert self.ran == ["caches", "evict"]
+        assert [entry["tier"] for entry in responder.last_report] == ["caches", "evict"]
+        assert all("reclaimed_mb" in entry for entry in responder.last_report)
+
+    def test_restart_is_last_resort(self):
+        """Test that a restart is requested only after every tier ran"""
+        responder = MemoryPressureResponder(self.memory_manager, [self.tier("caches"), self.tier("recycle")])
+        assert responder.respond(now=1000) is True
+        assert self.ran == ["caches", "recycle"]
+        assert responder.get_stats()["restarts_requested"] == 1
+
+    def test_failing_tier_does_not_stop_escalation(self):
+        """Test that an error in one tier moves on to the next"""
+        def broken():
+            raise RuntimeError("boom")
+
+        responder = MemoryPressureResponder(self.memory_manager, [
+            PressureTier("broken", broken), self.tier("recycle", relieves=True)
+        ])
+        assert responder.respond(now=1000) is False
+        assert self.ran == ["recycle"]
+
+    def test_cooldown_between_responses(self):
+        """Test that usage hovering at the limit is not handled on every loop"""
+        responder = MemoryPressureResponder(self.memory_manager, [self.tier("caches", relieves=True)], cooldown=60)
+        responder.respond(now=1000)
+        self.memory_manager.high = True
+        assert responder.respond(now=1030) is False
+        assert self.ran == ["caches"]
+        responder.respond(now=1061)
+        assert self.ran == ["caches", "caches"]
@@ -0,0 +1,82 @@
+"""
+Test the metrics registry and its Prometheus text output
+"""
+
+import urllib.request
+import pytest
+from task_scheduler.metrics import MetricsHTTPServer, MetricsRegistry, SchedulerMetrics
+
+
+class TestMetricsRegistry:
+    """Test counters, gauges, histograms and the exposition format"""
+
+    def setup_method(self):
+        """Create an empty registry"""
+        self.registry = MetricsRegistry()
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that observations land in the first bucket whose bound they do not exceed"""
+        histogram = self.registry.histogram("lag_seconds", "Lag", ["task"], buckets=(0.1, 1, 10))
+        for value in (0.05, 0.1, 0.5, 20):
+            histogram.observe(value, task="backup")
+
+        lines = self.registry.render().splitlines()
+        assert '# TYPE lag_seconds histogram' in lines
+        assert 'lag_seconds_bucket{task="backup",le="0.1"} 2' in lines
+        assert 'lag_seconds_bucket{task="backup",le="1"} 3' in lines
+        assert 'lag_seconds_bucket{task="backup",le="10"} 3' in lines
+        assert 'lag_seconds_bucket{task="backup",le="+Inf"} 4' in lines
+        assert 'lag_seconds_count{task="backup"} 4' in lines
+        assert histogram.get(task="backup")["sum"] == pytest.approx(20.65)
+
+    def test_counters_and_gauges(self):
+        """Test labelled counters and gauges read from a callback"""
+        runs = self.registry.counter("runs_total", "Runs", ["task", "status"])
+        runs.inc(task="backup", status="success")
+        runs.inc(2, task="backup", status="failed")
+        depth = [3]
+        self.registry.gauge("queue_depth", "Depth", function=lambda: depth[0])
+        depth[0] = 7
+
+        lines = self.registry.render().splitlines()
+        assert 'runs_total{task="backup",status="failed"} 2' in lines
+        assert 'runs_total{task="backup",status="success"} 1' in lines
+        assert 'queue_depth 7' in lines
+
+    def test_label_values_are_escaped(self):
+        """Test that quotes and backslashes cannot break the format"""
+        self.registry.counter("runs_total", "Runs", ["task"]).inc(task='we"ird\\')
+        assert 'runs_total{task="we\\"ird\\\\"} 1' in self.registry.render()
+
+    def test_wrong_labels_are_rejected(self):
+        """Test that a missing label is an error rather than a silent new series"""
+        counter = self.registry.counter("runs_total", "Runs", ["task", "status"])
+        with pytest.raises(ValueError):
+            counter.inc(task="backup")
+        with pytest.raises(ValueError):
+            self.registry.gauge("runs_total", "Clash")
+
+    def test_unloaded_task_series_are_dropped(self):
+        """Test that forgetting a task removes its series from every family"""
+        metrics = SchedulerMetrics(self.registry)
+        metrics.dispatch_lag.observe(0.01, task="old")
+        metrics.task_runs.inc(task="old", status="success")
+        metrics.task_runs.inc(task="kept", status="success")
+        self.registry.gauge("task_memory_bytes", "Memory", ["task"]).set(1024, task="old")
+        metrics.forget_task("old")
+
+        text = metrics.render()
+        assert 'task="old"' not in text
+        assert 'task="kept"' in text
+
+    def test_http_endpoint(self):
+        """Test that /metrics serves the rendered registry"""
+        self.registry.counter("runs_total", "Runs").inc()
+        server = MetricsHTTPServer(self.registry.render, port=0)
+        server.start()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+                assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+                assert "runs_total 1" in response.read().decode()
+        finally:
+            server.stop()
@@ -0,0 +1,102 @@
+"""
+Test that reloading a task tears down and frees the previous module
+"""
+
+import gc
+import tempfile
+import weakref
+from pathlib import Path
+import psutil
+import schedule
+from task_scheduler.decorators import get_job_registry
+from task_scheduler.memory_manager import TaskModuleManager
+
+
+TASK = '''from task_scheduler.decorators import repeat, every
+
+PAYLOAD = bytearray(256 * 1024)
+
+
+@repeat(every(10).seconds)
+def start():
+    return len(PAYLOAD)
+'''
+
+
+class TestModuleLifecycle:
+    """Test retirement, teardown and leak detection of task modules"""
+
+    def setup_method(self):
+        """Create a task file and start from an empty schedule"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.task_path = Path(self.temp_dir.name) / "reloaded.py"
+        self.task_path.write_text(TASK)
+        self.manager = TaskModuleManager()
+        self.registry = get_job_registry()
+        self.registry.clear()
+        schedule.clear()
+
+    def teardown_method(self):
+        """Leave no jobs behind for other tests"""
+        self.registry.clear()
+        schedule.clear()
+        self.temp_dir.cleanup()
+
+    def reload(self):
+        """Reload the task the way the scheduler does and return the new module"""
+        old_jobs = self.registry.get_jobs("reloaded")
+        module = self.manager.load_task_module(self.task_path, TASK, force_reload=True)
+        for job in self.registry.unregister("reloaded", old_jobs):
+            schedule.cancel_job(job)
+        self.manager.release_retired_modules()
+        return module
+
+    def test_module_names_are_unique(self):
+        """Test that two loads within the same second get different names"""
+        first = self.reload().__name__
+        second = self.reload().__name__
+        assert first != second
+        assert first.startswith("task_reloaded_") and second.startswith("task_reloaded_")
+
+    def test_previous_version_is_collected(self):
+        """Test that the replaced module is freed without waiting for a GC"""
+        old = weakref.ref(self.reload())
+        self.reload()
+        assert old() is None
+        assert len(schedule.jobs) == 1
+        assert self.manager.find_leaked_modules() == []
+        assert self.manager.get_stats()["collected"] == 1
+
+    def test_module_in_use_is_kept(self):
+        """Test that a module still running is only torn down later"""
+        old_module = self.reload()
+        self.manager.load_task_module(self.task_path, TASK, force_reload=True)
+        assert self.manager.release_retired_modules(lambda module: module is old_module) == 0
+        assert old_module.start._original_func() == 256 * 1024
+        assert self.manager.release_retired_modules() == 1
+        assert not hasattr(old_module, "start")
+
+    def test_leak_is_detected(self):
+        """Test that a torn-down module that is still referenced is reported"""
+        held = self.reload()
+        name = held.__name__
+        self.reload()
+        gc.collect()
+        assert self.manager.find_leaked_modules() == [name]
+
+    def test_rss_stays_flat_across_reloads(self):
+        """Test that 1,000 reloads do not grow memory (each version holds 256 KB)"""
+        process = psutil.Process()
+        for _ in range(100):
+            self.reload()
+        gc.collect()
+        baseline = process.memory_info().rss
+
+        for _ in range(1000):
+            self.reload()
+        gc.collect()
+        growth_mb = (process.memory_info().rss - baseline) / 1024 / 1024
+
+        # A leak would keep about 250 MB of payloads alive
+        assert growth_mb < 20
+        assert self.manager.find_leaked_modules() == []
@@ -0,0 +1,73 @@
+"""
+Test running tasks in worker processes
+"""
+
+import os
+import sys
+import pytest
+from pathlib import Path
+from task_scheduler.process_pool import ProcessWorkerPool, TaskExecutionError
+
+
+TASK_SOURCE = '''"""
+---
+title: "Worker Test Task"
+execution: process
+---
+"""
+
+import os
+
+def start():
+    print("running in", os.getpid())
+
+def fail():
+    raise RuntimeError("boom")
+'''
+
+
+class TestProcessWorkerPool:
+    """Test the process pool protocol and worker lifecycle"""
+
+    @pytest.fixture
+    def pool(self, project_root):
+        """Create a small pool using the current interpreter"""
+        env = os.environ.copy()
+        env["PYTHONPATH"] = str(project_root)
+        pool = ProcessWorkerPool(sys.executable, project_root, size=1, max_tasks_per_worker=2, env=env)
+        yield pool
+        pool.shutdown()
+
+    @pytest.fixture
+    def task_path(self, tmp_path):
+        """Write a throwaway task file"""
+        path = tmp_path / "worker_task.py"
+        path.write_text(TASK_SOURCE)
+        return path
+
+    def test_runs_task_in_separate_process(self, pool, task_path):
+        """Test that the task runs in a worker and reports its outcome"""
+        outcome = pool.run("worker_task", str(task_path), "start")
+
+        assert outcome["status"] == "success"
+        assert outcome["pid"] != os.getpid()
+        assert outcome["peak_rss_mb"] > 0
+        assert outcome["duration"] >= 0
+
+    def test_failure_raises_with_remote_traceback(self, pool, task_path):
+        """Test that task exceptions are reported back to the caller"""
+        with pytest.raises(TaskExecutionError) as exc_info:
+            pool.run("worker_task", str(task_path), "fail")
+
+        assert "boom" in str(exc_info.value)
+        assert "RuntimeError" in exc_info.value.remote_traceback
+
+    def test_worker_is_reused_then_recycled(self, pool, task_path):
+        """Test that workers are reused up to max_tasks_per_worker"""
+        first = pool.run("worker_task", str(task_path), "start")["pid"]
+        second = pool.run("worker_task", str(task_path), "start")["pid"]
+        third = pool.run("worker_task", str(task_path), "start")["pid"]
+
+        assert first == second
+        assert third != first
+        assert pool.get_stats()["workers_recycled"] == 1
@@ -0,0 +1,80 @@
+"""
+Test background resource sampling
+"""
+
+import time
+from task_scheduler import memory_manager
+from task_scheduler.memory_manager import MemoryManager, ResourceMonitor, ResourceSample
+
+
+class TestResourceMonitor:
+    """Test the ring buffer, windowed aggregates and non-blocking reads"""
+
+    def setup_method(self):
+        """Create a monitor that is sampled by hand"""
+        self.monitor = ResourceMonitor(MemoryManager(), sample_interval=5)
+
+    def add_sample(self, timestamp: float, cpu_percent: float, rss_mb: float = 100.0):
+        """Append a synthetic sample to the ring buffer"""
+        self.monitor._samples.append(ResourceSample(
+            timestamp=timestamp, cpu_percent=cpu_percent, memory_percent=50.0,
+            memory_available_mb=1000.0, memory_used_mb=1000.0, disk_percent=40.0,
+            disk_free_gb=10.0, process_rss_mb=rss_mb, process_vms_mb=200.0,
+            process_cpu_percent=1.0, process_threads=4
+        ))
+
+    def test_ring_buffer_keeps_fifteen_minutes(self):
+        """Test that the oldest samples are dropped once the buffer is full"""
+        assert self.monitor._samples.maxlen == 180
+        for second in range(0, 1000, 5):
+            self.add_sample(second, 10.0)
+        samples = self.monitor.get_samples()
+        assert len(samples) == 180
+        assert samples[0].timestamp == 100
+
+    def test_window_aggregates(self):
+        """Test that each window only covers its own samples"""
+        for second in range(0, 900, 5):
+            self.add_sample(second, 90.0 if second >= 840 else 10.0, rss_mb=second / 5)
+
+        last_minute = self.monitor.get_window_stats(60)
+        assert last_minute["samples"] == 12
+        assert last_minute["cpu_percent"] == {"avg": 90.0, "max": 90.0}
+
+        fifteen = self.monitor.get_window_stats(900)
+        assert fifteen["samples"] == 180
+        assert fifteen["cpu_percent"]["max"] == 90.0
+        assert fifteen["cpu_percent"]["avg"] < 20
+        assert fifteen["process_rss_mb"]["max"] == 179.0
+
+    def test_stats_are_served_without_blocking(self, monkeypatch):
+        """Test that reading stats returns the cached snapshot without calling psutil"""
+        first = self.monitor.sample()
+        assert first is not None and first.cpu_percent == 0.0  # No previous sample to compare with
+        sum(range(200000))
+        self.monitor.sample()
+
+        def not_called(*args, **kwargs):
+            raise AssertionError("psutil was called while reading stats")
+
+        for name in ("cpu_times", "virtual_memory", "disk_usage"):
+            monkeypatch.setattr(memory_manager.psutil, name, not_called)
+        monkeypatch.setattr(self.monitor.memory_manager, "process", None)
+
+        stats = self.monitor.get_system_stats()
+        assert self.monitor.get_system_stats() is stats
+        assert set(stats["windows"]) == {"1m", "5m", "15m"}
+        assert stats["process_memory"]["rss_mb"] > 0
+        assert stats["monitor"]["samples"] == 2
+
+    def test_background_thread_samples_and_stops(self):
+        """Test that the monitor thread fills the buffer and stops promptly"""
+        self.monitor.sample_interval = 0.01
+        self.monitor.start_monitoring()
+        deadline = time.time() + 5
+        while len(self.monitor.get_samples()) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        start = time.perf_counter()
+        self.monitor.stop_monitoring()
+        assert len(self.monitor.get_samples()) >= 3
+        assert time.perf_counter() - start < 1
@@ -0,0 +1,109 @@
+"""
+Test retries of failed task runs on the timer queue
+"""
+
+import time
+from types import SimpleNamespace
+import pytest
+from task_scheduler.decorators import TaskTracker, _execute_tracked, set_task_tracker
+from task_scheduler.retry import RetryJob, RetryScheduler
+from task_scheduler.timer_queue import TimerQueue
+
+
+class RecordingDatabase:
+    """Collects execution records instead of writing them to SQLite"""
+
+    def __init__(self):
+        self.executions = []
+
+    def record_execution(self, execution):
+        self.executions.append(execution)
+
+    def update_task_schedule(self, schedule):
+        pass
+
+
+class TestRetryDelay:
+    """Test the backoff schedule"""
+
+    def test_exponential_backoff_with_cap(self):
+        """Test that delays double per attempt and stop at max_delay"""
+        retries = RetryScheduler(TimerQueue(), backoff_factor=2, max_delay=100, jitter=0)
+        assert [retries.compute_delay(10, n) for n in (1, 2, 3, 4, 5)] == [10, 20, 40, 80, 100]
+
+    def test_jitter_stays_within_bounds(self):
+        """Test that jitter spreads delays by at most the configured fraction"""
+        retries = RetryScheduler(TimerQueue(), jitter=0.2)
+        delays = {retries.compute_delay(10, 1) for _ in range(50)}
+        assert all(8 <= d <= 12 for d in delays)
+        assert len(delays) > 1
+
+
+class TestRetryScheduling:
+    """Test that failed runs are re-enqueued as one-shot timers"""
+
+    def test_failed_run_is_retried_until_retry_count(self):
+        """Test that each attempt is queued, recorded with its retry_count, and then stops"""
+        db = RecordingDatabase()
+        tracker = TaskTracker(db)
+        queue = TimerQueue()
+        tracker.retry_scheduler = RetryScheduler(queue, jitter=0)
+        tracker.set_task_settings("flaky", SimpleNamespace(retry_count=2, retry_delay=0))
+        set_task_tracker(tracker)
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            _execute_tracked("flaky", fail, (), {})
+
+        # The retry waits in the queue; nothing is sleeping on it
+        assert len(tracker.retry_scheduler) == 1
+        for expected_attempt in (1, 2):
+            due = queue.pop_due(time.time() + 1)
+            assert len(due) == 1 and isinstance(due[0], RetryJob)
+            assert due[0].attempt == expected_attempt
+            tracker.retry_scheduler.complete(due[0])
+            due[0].run()
+
+        assert len(queue) == 0
+        assert [e.retry_count for e in db.executions] == [0, 1, 2]
+        assert all(e.status == "failed" for e in db.executions)
+
+    def test_retry_is_queued_after_run_is_released(self):
+        """Test that a retry dispatched as soon as it is queued is not skipped as a concurrent run"""
+        db = RecordingDatabase()
+        tracker = TaskTracker(db)
+        dispatched = []
+
+        class DispatchingQueue(TimerQueue):
+            """Runs each retry the moment it is queued, like a zero delay on an idle worker pool"""
+
+            def push(self, job):
+                dispatched.append(tracker.get_running_count("flaky"))
+                if len(dispatched) == 1:
+                    job.run()
+
+        tracker.retry_scheduler = RetryScheduler(DispatchingQueue(), jitter=0)
+        tracker.set_task_settings("flaky", SimpleNamespace(retry_count=1, retry_delay=0))
+        set_task_tracker(tracker)
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            _execute_tracked("flaky", fail, (), {})
+
+        assert dispatched == [0]
+        assert [e.retry_count for e in db.executions] == [0, 1]
+
+    def test_cancel_task_drops_pending_retries(self):
+        """Test that reloading a task discards its queued retries"""
+        queue = TimerQueue()
+        retries = RetryScheduler(queue, jitter=0)
+        retries.schedule("reloaded", 1, 60, lambda: None)
+        retries.schedule("other", 1, 60, lambda: None)
+
+        assert retries.cancel_task("reloaded") == 1
+        assert [job.task_name for job in retries.pending_jobs()] == ["other"]
+        assert len(queue) == 1
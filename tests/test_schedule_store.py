@@ -0,0 +1,68 @@
+"""
+Test the in-memory schedule store
+"""
+
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from task_scheduler.database import DatabaseManager, TaskSchedule
+from task_scheduler.schedule_store import ScheduleStore
+
+
+class CountingWriter:
+    """Forwards schedule writes to the database and counts them"""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.writes = 0
+
+    def update_task_schedule(self, schedule):
+        self.writes += 1
+        self.db_manager.update_task_schedule(schedule)
+
+
+class TestScheduleStore:
+    """Test overdue queries, write-through and restart recovery"""
+
+    def setup_method(self):
+        """Create a database in a temporary directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(Path(self.temp_dir.name) / "test.db")
+        self.writer = CountingWriter(self.db)
+        self.store = ScheduleStore(self.db, writer=self.writer)
+        self.now = datetime.now().replace(microsecond=0)
+
+    def teardown_method(self):
+        """Close connections and remove the database"""
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def schedule(self, task_name: str, minutes: int, config: str = "cfg") -> TaskSchedule:
+        return TaskSchedule(task_name, self.now + timedelta(minutes=minutes), config, self.now)
+
+    def test_overdue_tasks_are_answered_in_order(self):
+        """Test that only due, active schedules are returned, oldest first"""
+        for task_name, minutes in [("b", -10), ("a", -30), ("future", 10), ("c", -20)]:
+            self.store.update_task_schedule(self.schedule(task_name, minutes))
+        self.store.deactivate_task("c")
+
+        assert [s.task_name for s in self.store.get_overdue_tasks(self.now)] == ["a", "b"]
+
+    def test_unchanged_schedule_is_not_written(self):
+        """Test that write-through happens only when a persisted field changes"""
+        assert self.store.update_task_schedule(self.schedule("task", 5))
+        assert not self.store.update_task_schedule(self.schedule("task", 5))
+        # An empty config keeps the recorded one
+        assert not self.store.update_task_schedule(self.schedule("task", 5, config=""))
+        assert self.store.update_task_schedule(self.schedule("task", 10))
+        assert self.writer.writes == 2
+
+    def test_state_survives_restart(self):
+        """Test that a new store recovers schedules from the database"""
+        self.store.update_task_schedule(self.schedule("kept", -1))
+        self.store.update_task_schedule(self.schedule("gone", -1))
+        self.store.deactivate_task("gone")
+
+        recovered = ScheduleStore(self.db)
+        assert [s.task_name for s in recovered.get_overdue_tasks(self.now)] == ["kept"]
+        assert recovered.get_task_schedule("gone").is_active is False
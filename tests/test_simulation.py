@@ -0,0 +1,101 @@
+"""
+Test the injectable clock and virtual-time schedule simulation
+"""
+
+from datetime import datetime
+import schedule
+from task_scheduler import clock
+from task_scheduler.decorators import CronLikeJob
+from task_scheduler.simulation import Simulation
+
+TASK_TEMPLATE = '''"""
+---
+title: "{name}"
+dependencies: []
+enabled: true
+---
+"""
+from task_scheduler.decorators import repeat, every
+
+
+@repeat({interval})
+def start():
+    raise RuntimeError("the task body must not run in a simulation")
+'''
+
+START = datetime(2030, 1, 1, 0, 0, 0).timestamp()
+
+
+class TestClock:
+    """Test switching between the system clock and a virtual clock"""
+
+    def test_virtual_clock_drives_schedule_library(self):
+        """Test that schedule jobs compute next runs from the installed clock"""
+        virtual_clock = clock.VirtualClock(START)
+        with clock.use_clock(virtual_clock):
+            job = schedule.every(10).seconds.do(lambda: None)
+            try:
+                assert job.next_run == datetime(2030, 1, 1, 0, 0, 10)
+                virtual_clock.advance(3600)
+                assert clock.now() == datetime(2030, 1, 1, 1, 0, 0)
+                job.run()
+                assert job.next_run == datetime(2030, 1, 1, 1, 0, 10)
+            finally:
+                schedule.cancel_job(job)
+        assert isinstance(clock.get_clock(), clock.SystemClock)
+        assert abs(clock.now() - datetime.now()).total_seconds() < 5
+
+    def test_cron_like_jobs_align_in_virtual_time(self):
+        """Test that clock-aligned jobs use the virtual time"""
+        with clock.use_clock(clock.VirtualClock(datetime(2030, 1, 1, 0, 7, 30).timestamp())):
+            job = CronLikeJob(5, 'minutes', lambda: None)
+            assert job.next_run == datetime(2030, 1, 1, 0, 10, 0)
+
+    def test_virtual_clock_never_goes_backwards(self):
+        """Test that advancing to an earlier time is ignored"""
+        virtual_clock = clock.VirtualClock(START)
+        virtual_clock.advance_to(START - 60)
+        virtual_clock.advance(-5)
+        assert virtual_clock.time() == START
+
+
+class TestSimulation:
+    """Test replaying task schedules in virtual time"""
+
+    def write_task(self, tasks_dir, name, interval):
+        """Write a task file scheduled with the given repeat() interval"""
+        (tasks_dir / f"{name}.py").write_text(TASK_TEMPLATE.format(name=name, interval=interval))
+
+    def test_day_of_runs_is_replayed(self, tmp_path):
+        """Test run counts, database volume and that task bodies are stubbed"""
+        self.write_task(tmp_path, "every_five", "every(5).minutes")
+        self.write_task(tmp_path, "hourly", "every(1).hours")
+        self.write_task(tmp_path, "every_ten_seconds", "every(10).seconds")
+
+        report = Simulation(tmp_path, hours=24, start=START).run()
+
+        assert report["tasks"] == {"loaded": 3, "failed": []}
+        assert report["busiest_tasks"]["every_five"] == 288
+        assert report["busiest_tasks"]["hourly"] == 24
+        # 1 s runs push each next run back by a second: one run every 11 s
+        assert 7800 <= report["busiest_tasks"]["every_ten_seconds"] <= 7860
+        assert report["runs"] == sum(report["busiest_tasks"].values())
+        # One execution record and one schedule record per run, unless a newer schedule replaced it
+        database = report["database"]
+        assert database["written"] + database["coalesced_schedules"] >= 2 * report["runs"]
+        assert report["database"]["dropped"] == 0
+        assert isinstance(clock.get_clock(), clock.SystemClock)
+        assert not schedule.jobs
+
+    def test_saturated_workers_show_lag(self, tmp_path):
+        """Test that more due runs than workers queue up and report lag"""
+        for i in range(4):
+            self.write_task(tmp_path, f"task_{i}", "every(1).minutes")
+
+        report = Simulation(tmp_path, hours=1, max_workers=2, task_duration=20, start=START).run()
+
+        assert report["peak_concurrency"] == 2
+        assert report["peak_waiting"] >= 2
+        assert report["lag_seconds"]["max"] >= 20
+        # Runs still waiting for a worker when the hour ends are not counted
+        assert 4 * 59 <= report["runs"] <= 4 * 60
@@ -0,0 +1,69 @@
+"""
+Test startup phase timing and skipping redundant pip upgrades
+"""
+
+import json
+import threading
+import time
+from task_scheduler.startup_profiler import StartupProfiler
+from task_scheduler.venv_manager import PIP_UPGRADE_MARKER, VirtualEnvironmentManager
+
+
+class TestStartupProfiler:
+    """Test recording sequential and concurrent phases"""
+
+    def test_phases_are_ordered_by_start(self):
+        """Test that phases keep their offsets, durations and threads"""
+        profiler = StartupProfiler()
+        with profiler.phase("config"):
+            time.sleep(0.01)
+        worker = threading.Thread(target=profiler.timed, args=("venv", time.sleep, 0.02), name="startup_0")
+        worker.start()
+        with profiler.phase("task_parse"):
+            time.sleep(0.005)
+        worker.join()
+        profiler.finish()
+
+        stats = profiler.get_stats()
+        assert stats["complete"]
+        assert [phase["name"] for phase in stats["phases"]][0] == "config"
+        phases = {phase["name"]: phase for phase in stats["phases"]}
+        assert phases["config"]["duration_ms"] >= 10
+        assert phases["venv"]["thread"] == "startup_0"
+        # The concurrent phases overlap, so the total is less than their sum
+        assert stats["total_ms"] < sum(phase["duration_ms"] for phase in stats["phases"]) + 10
+        assert "venv" in profiler.format_report()
+
+    def test_timed_returns_result(self):
+        """Test that timed() passes arguments through and returns the result"""
+        profiler = StartupProfiler()
+        assert profiler.timed("add", lambda a, b: a + b, 2, b=3) == 5
+        assert profiler.get_stats()["phases"][0]["name"] == "add"
+
+
+class TestPipUpgrade:
+    """Test that pip is only upgraded when requested or the venv changed"""
+
+    def test_upgrade_skipped_until_venv_changes(self, fake_venv, subprocess_calls):
+        """Test the first start upgrades, later starts do not, a replaced pip does"""
+        manager = VirtualEnvironmentManager(fake_venv)
+        assert manager.ensure_virtual_environment()
+        assert len(subprocess_calls) == 1
+        assert json.loads((fake_venv / PIP_UPGRADE_MARKER).read_text())
+
+        assert manager.ensure_virtual_environment()
+        assert len(subprocess_calls) == 1
+
+        pip = fake_venv / "bin" / "pip"
+        pip.unlink()
+        pip.write_text("new pip")
+        assert manager.ensure_virtual_environment()
+        assert len(subprocess_calls) == 2
+
+    def test_explicit_upgrade(self, fake_venv, subprocess_calls):
+        """Test that upgrade_pip always upgrades"""
+        manager = VirtualEnvironmentManager(fake_venv)
+        manager.ensure_virtual_environment()
+        manager.ensure_virtual_environment(upgrade_pip=True)
+        assert len(subprocess_calls) == 2
+        assert subprocess_calls[-1][-3:] == ["install", "--upgrade", "pip"]
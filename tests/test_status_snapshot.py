@@ -0,0 +1,79 @@
+"""
+Test the status snapshot shared with `main.py --status`
+"""
+
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from task_scheduler.status_snapshot import StatusPublisher, read_status
+
+
+class TestStatusSnapshot:
+    """Test publishing, growing and consistently reading the snapshot"""
+
+    def setup_method(self):
+        """Create a snapshot file in a temporary data directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "data" / "status.mmap"
+        self.publisher = StatusPublisher(self.path)
+
+    def teardown_method(self):
+        """Close the snapshot"""
+        self.publisher.stop()
+        self.temp_dir.cleanup()
+
+    def test_missing_snapshot(self):
+        """Test that no snapshot reads as None"""
+        assert read_status(self.path) is None
+
+    def test_round_trip(self):
+        """Test that a published status is read back with the publisher's pid"""
+        self.publisher.publish({"running": True, "loaded_tasks": 3})
+        status = read_status(self.path)
+        assert status["running"] is True
+        assert status["loaded_tasks"] == 3
+        assert status["age_seconds"] < 5
+
+    def test_snapshot_grows(self):
+        """Test that a status larger than the initial mapping is published whole"""
+        self.publisher.publish({"running": True, "tasks": ["small"]})
+        big = {"running": True, "tasks": [f"task_{i:06d}" for i in range(20000)]}
+        self.publisher.publish(big)
+        assert read_status(self.path)["tasks"] == big["tasks"]
+
+    def test_exited_publisher_is_not_running(self):
+        """Test that the snapshot of a process that has exited reports running False"""
+        code = (
+            "import sys; from pathlib import Path\n"
+            "from task_scheduler.status_snapshot import StatusPublisher\n"
+            "StatusPublisher(Path(sys.argv[1])).publish({'running': True, 'loaded_tasks': 1})\n"
+        )
+        subprocess.run([sys.executable, "-c", code, str(self.path)], check=True,
+                       cwd=Path(__file__).parent.parent)
+        status = read_status(self.path)
+        assert status["loaded_tasks"] == 1
+        assert status["running"] is False
+
+    def test_reads_are_consistent_during_writes(self):
+        """Test that a reader never sees a half-written snapshot"""
+        stop = threading.Event()
+
+        def writer():
+            i = 0
+            while not stop.is_set():
+                i += 1
+                self.publisher.publish({"running": True, "n": i, "echo": [i] * (i % 500)})
+
+        thread = threading.Thread(target=writer)
+        self.publisher.publish({"running": True, "n": 0, "echo": []})
+        thread.start()
+        try:
+            for _ in range(500):
+                status = read_status(self.path)
+                assert status is not None
+                assert status["echo"] == [status["n"]] * (status["n"] % 500)
+        finally:
+            stop.set()
+            thread.join()
@@ -0,0 +1,93 @@
+"""
+Test the stat fast path and persistent parse cache of TaskParser
+"""
+
+import os
+import tempfile
+from pathlib import Path
+import pytest
+from task_scheduler.task_parser import TaskParser
+
+
+TASK = '''"""
+---
+title: "Cached task"
+description: "Parsed once"
+dependencies:
+  - requests
+timeout: 30
+---
+"""
+
+def start():
+    return {value}
+'''
+
+
+class TestTaskParserCache:
+    """Test both cache levels and that changes are still picked up"""
+
+    def setup_method(self):
+        """Create a tasks directory with one task"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.tasks_dir = Path(self.temp_dir.name) / "tasks"
+        self.tasks_dir.mkdir()
+        self.cache_path = Path(self.temp_dir.name) / "parse_cache.json"
+        self.task_path = self.tasks_dir / "cached.py"
+        self.task_path.write_text(TASK.format(value=1))
+
+    def teardown_method(self):
+        """Remove the temporary directory"""
+        self.temp_dir.cleanup()
+
+    def test_unchanged_file_is_not_read(self):
+        """Test that a rescan of an unchanged file only stats it"""
+        parser = TaskParser()
+        first = parser.parse_file(self.task_path)
+        assert parser.parse_file(self.task_path) is first
+        assert parser.stats["stat_hits"] == 1 and parser.stats["parses"] == 1
+
+    def test_changed_file_is_reparsed(self):
+        """Test that edits are detected, including a replace that keeps size and mtime"""
+        parser = TaskParser()
+        parser.parse_file(self.task_path)
+        self.task_path.write_text(TASK.format(value=22))
+        assert "return 22" in parser.parse_file(self.task_path).content
+
+        # An editor-style save creates a new inode, which changes the stat key
+        mtime = self.task_path.stat().st_mtime_ns
+        replacement = self.tasks_dir / "cached.tmp"
+        replacement.write_text(TASK.format(value=33))
+        os.utime(replacement, ns=(mtime, mtime))
+        os.replace(replacement, self.task_path)
+        assert "return 33" in parser.parse_file(self.task_path).content
+
+    def test_restart_uses_persistent_cache(self):
+        """Test that a new parser reuses frontmatter parsed by a previous one"""
+        parser = TaskParser(cache_path=self.cache_path)
+        expected = parser.parse_file(self.task_path)
+        parser.save_cache()
+
+        restarted = TaskParser(cache_path=self.cache_path)
+        task_file = restarted.parse_file(self.task_path)
+        assert restarted.stats["parse_cache_hits"] == 1 and restarted.stats["parses"] == 0
+        assert task_file.metadata == expected.metadata
+        assert task_file.content == expected.content
+
+    def test_cache_drops_deleted_files(self):
+        """Test that entries for files no longer parsed are not written back"""
+        parser = TaskParser(cache_path=self.cache_path)
+        parser.parse_file(self.task_path)
+        parser.save_cache()
+        self.task_path.write_text(TASK.format(value=2))
+        parser.parse_file(self.task_path)
+        parser.save_cache()
+
+        restarted = TaskParser(cache_path=self.cache_path)
+        assert len(restarted._parse_cache) == 1
+
+    def test_invalid_frontmatter_still_fails(self):
+        """Test that a frontmatter block that is not a mapping is rejected"""
+        self.task_path.write_text('---\njust a string\n---\ndef start():\n    pass\n')
+        with pytest.raises(ValueError):
+            TaskParser(cache_path=self.cache_path).parse_file(self.task_path)
@@ -0,0 +1,64 @@
+"""
+Test per-phase timing of main loop iterations
+"""
+
+import time
+from task_scheduler.metrics import MetricsRegistry
+from task_scheduler.tick_profiler import TickProfiler
+
+
+class TestTickProfiler:
+    """Test phase attribution, percentiles and slow tick reporting"""
+
+    def run_tick(self, profiler: TickProfiler, dispatch_seconds: float = 0.0):
+        """Simulate one main loop iteration with a dispatch phase of the given length"""
+        profiler.start_tick()
+        profiler.mark("config_check")
+        time.sleep(dispatch_seconds)
+        profiler.mark("dispatch")
+        profiler.end_tick()
+
+    def test_time_is_attributed_to_phases(self):
+        """Test that each phase gets the time since the previous mark"""
+        profiler = TickProfiler(slow_threshold_ms=1000)
+        for _ in range(5):
+            self.run_tick(profiler, 0.01)
+
+        stats = profiler.get_stats()
+        assert stats["ticks"] == 5
+        assert stats["phases"]["dispatch"]["count"] == 5
+        assert stats["phases"]["dispatch"]["p50_ms"] >= 10
+        assert stats["phases"]["config_check"]["max_ms"] < 5
+        assert stats["tick"]["p50_ms"] >= stats["phases"]["dispatch"]["p50_ms"]
+        assert stats["slow_ticks"] == 0
+
+    def test_window_is_rolling(self):
+        """Test that only the last ``window`` timings are kept per phase"""
+        profiler = TickProfiler(window=10)
+        for _ in range(25):
+            self.run_tick(profiler)
+        stats = profiler.get_stats()
+        assert stats["ticks"] == 25
+        assert stats["phases"]["dispatch"]["count"] == 10
+
+    def test_slow_tick_breakdown(self):
+        """Test that a tick over the threshold is recorded with its slowest phase first"""
+        profiler = TickProfiler(slow_threshold_ms=20)
+        self.run_tick(profiler)
+        self.run_tick(profiler, 0.03)
+
+        stats = profiler.get_stats()
+        assert stats["slow_ticks"] == 1
+        slow = stats["last_slow_tick"]
+        assert slow["total_ms"] >= 20
+        assert list(slow["phases_ms"]) == ["dispatch", "config_check"]
+
+    def test_phases_feed_metrics_histogram(self):
+        """Test that phase timings are exported per phase"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("tick_phase_seconds", "Phases", ["phase"])
+        profiler = TickProfiler(histogram=histogram)
+        for _ in range(3):
+            self.run_tick(profiler)
+        assert histogram.get(phase="dispatch")["count"] == 3
+        assert 'tick_phase_seconds_count{phase="config_check"} 3' in registry.render()
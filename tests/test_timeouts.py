@@ -0,0 +1,171 @@
+"""
+Test timeout enforcement for in-process and worker-process task runs
+"""
+
+import os
+import sys
+import time
+import threading
+import psutil
+import pytest
+from task_scheduler.cancellation import (
+    CancellationToken, TaskTimeoutError, TimeoutSupervisor,
+    get_cancellation_token, set_cancellation_token
+)
+from task_scheduler.process_pool import ProcessWorkerPool
+
+
+HANGING_TASK = '''"""
+---
+title: "Hanging Task"
+execution: process
+---
+"""
+
+import subprocess
+import time
+from pathlib import Path
+
+def start():
+    child = subprocess.Popen(["sleep", "60"])
+    Path(__file__).with_suffix(".pid").write_text(str(child.pid))
+    time.sleep(60)
+'''
+
+
+class TestCancellation:
+    """Test cooperative and hard cancellation of in-process runs"""
+
+    def test_token_is_cancelled_at_deadline(self):
+        """Test that a cooperative task sees its token cancelled"""
+        supervisor = TimeoutSupervisor(grace_period=5)
+        token = CancellationToken()
+        watch = supervisor.watch(token, 0.1, "cooperative")
+
+        start = time.monotonic()
+        assert token.wait(5) is True
+        assert time.monotonic() - start < 2
+        with pytest.raises(TaskTimeoutError):
+            token.raise_if_cancelled()
+
+        supervisor.unwatch(watch)
+        supervisor.stop()
+
+    def test_uncooperative_thread_is_interrupted(self):
+        """Test that a busy loop ignoring its token is stopped after the grace period"""
+        supervisor = TimeoutSupervisor(grace_period=0.1)
+        outcome = {}
+
+        def busy():
+            watch = supervisor.watch(CancellationToken(), 0.1, "busy")
+            try:
+                deadline = time.monotonic() + 10
+                while time.monotonic() < deadline:
+                    pass
+                outcome["result"] = "finished"
+            except TaskTimeoutError:
+                outcome["result"] = "interrupted"
+            finally:
+                supervisor.unwatch(watch)
+
+        thread = threading.Thread(target=busy)
+        thread.start()
+        thread.join(5)
+
+        assert outcome.get("result") == "interrupted"
+        supervisor.stop()
+
+    def test_default_token_outside_tasks(self):
+        """Test that code outside a task gets a token that is never cancelled"""
+        set_cancellation_token(None)
+        assert get_cancellation_token().cancelled is False
+
+
+class TestProcessTimeout:
+    """Test that timed-out worker processes are killed with their children"""
+
+    def test_worker_tree_is_killed(self, project_root, tmp_path):
+        """Test that a hanging worker and its subprocess are both killed"""
+        task_path = tmp_path / "hanging_task.py"
+        task_path.write_text(HANGING_TASK)
+
+        env = os.environ.copy()
+        env["PYTHONPATH"] = str(project_root)
+        pool = ProcessWorkerPool(sys.executable, project_root, size=1, env=env, kill_grace_period=0.5)
+
+        try:
+            with pytest.raises(TaskTimeoutError):
+                pool.run("hanging_task", str(task_path), "start", timeout=1)
+
+            child_pid = int(task_path.with_suffix(".pid").read_text())
+            assert not psutil.pid_exists(child_pid) or \
+                psutil.Process(child_pid).status() == psutil.STATUS_ZOMBIE
+            assert pool.get_stats()["timeouts"] == 1
+            assert pool.get_stats()["workers"] == 0
+        finally:
+            pool.shutdown()
+
+
+class TestSubprocessCancellation:
+    """Test that commands run by in-process tasks are killed when the task is cancelled"""
+
+    def test_command_tree_is_killed_on_cancel(self, tmp_path):
+        """Test that a cancelled task's command and its children die and the task stops"""
+        from helpers.external_execution import execute_cli_command
+
+        pid_file = tmp_path / "child.pid"
+        token = CancellationToken()
+        outcome = {}
+
+        def task():
+            set_cancellation_token(token)
+            try:
+                execute_cli_command(f"sleep 60 & echo $! > {pid_file}; wait", timeout=60)
+                outcome["result"] = "finished"
+            except TaskTimeoutError:
+                outcome["result"] = "cancelled"
+            finally:
+                set_cancellation_token(None)
+
+        thread = threading.Thread(target=task)
+        thread.start()
+        deadline = time.monotonic() + 5
+        while not pid_file.exists() or not pid_file.read_text().strip():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        token.cancel("timed out")
+        thread.join(30)
+        assert outcome.get("result") == "cancelled"
+
+        child_pid = int(pid_file.read_text())
+        assert not psutil.pid_exists(child_pid) or \
+            psutil.Process(child_pid).status() == psutil.STATUS_ZOMBIE
+
+    def test_timeout_kills_command(self, tmp_path):
+        """Test that the helper's own timeout kills the command's process tree"""
+        from helpers.external_execution import execute_cli_command
+
+        pid_file = tmp_path / "child.pid"
+        result = execute_cli_command(f"sleep 60 & echo $! > {pid_file}; wait", timeout=0.5)
+        assert "timed out" in result["error"]
+
+        child_pid = int(pid_file.read_text())
+        assert not psutil.pid_exists(child_pid) or \
+            psutil.Process(child_pid).status() == psutil.STATUS_ZOMBIE
+
+    def test_callbacks_run_once_on_cancel(self):
+        """Test that cancel callbacks run once, and straight away when registered late"""
+        token = CancellationToken()
+        calls = []
+        token.on_cancel(lambda: calls.append("early"))
+        removed = lambda: calls.append("removed")
+        token.on_cancel(removed)
+        token.remove_on_cancel(removed)
+
+        token.cancel("first")
+        token.cancel("second")
+        token.on_cancel(lambda: calls.append("late"))
+
+        assert calls == ["early", "late"]
+        assert token.reason == "first"
@@ -0,0 +1,74 @@
+"""
+Test the deadline-ordered timer queue used by the main loop
+"""
+
+import time
+import threading
+from datetime import datetime, timedelta
+from task_scheduler.timer_queue import TimerQueue
+
+
+class FakeJob:
+    """Minimal job exposing a next_run attribute"""
+
+    def __init__(self, next_run):
+        self.next_run = next_run
+
+
+class TestTimerQueue:
+    """Test timer queue ordering and invalidation"""
+
+    def test_pop_due_returns_only_expired_jobs_in_order(self):
+        """Test that only jobs at or before now are returned, earliest first"""
+        now = datetime.now()
+        late = FakeJob(now - timedelta(seconds=5))
+        early = FakeJob(now - timedelta(seconds=30))
+        future = FakeJob(now + timedelta(minutes=5))
+
+        queue = TimerQueue()
+        for job in (late, future, early):
+            queue.push(job)
+
+        due = queue.pop_due(now.timestamp())
+        assert due == [early, late]
+        assert len(queue) == 1
+        assert queue.next_deadline() == future.next_run.timestamp()
+
+    def test_reschedule_invalidates_old_entry(self):
+        """Test that pushing a job again replaces its previous deadline"""
+        now = datetime.now()
+        job = FakeJob(now - timedelta(seconds=1))
+
+        queue = TimerQueue()
+        queue.push(job)
+        job.next_run = now + timedelta(hours=1)
+        queue.push(job)
+
+        assert queue.pop_due(now.timestamp()) == []
+        assert queue.next_deadline() == job.next_run.timestamp()
+
+    def test_discard_and_sync_jobs(self):
+        """Test that discarded jobs never fire and sync_jobs reconciles membership"""
+        now = datetime.now()
+        kept = FakeJob(now - timedelta(seconds=1))
+        dropped = FakeJob(now - timedelta(seconds=2))
+        added = FakeJob(now - timedelta(seconds=3))
+
+        queue = TimerQueue()
+        queue.push(kept)
+        queue.push(dropped)
+        queue.discard(dropped)
+        assert not queue.contains(dropped)
+
+        queue.sync_jobs([kept, added])
+        assert queue.pop_due(now.timestamp()) == [added, kept]
+        assert queue.next_deadline() is None
+
+    def test_wait_wakes_early(self):
+        """Test that wake() interrupts a long wait"""
+        queue = TimerQueue()
+        threading.Timer(0.05, queue.wake).start()
+
+        start = time.monotonic()
+        assert queue.wait(10) is True
+        assert time.monotonic() - start < 5